@@ -1,3 +1,8 @@
 #!/bin/bash
 
+# start a consumer per named queue (e.g: WORKER_QUEUES="tracking:4,data:2")
+for queue in $(echo "${WORKER_QUEUES}" | tr ',' ' '); do
+    karrio run_queue "${queue%%:*}" &
+done
+
 karrio run_huey -w $BACKGROUND_WORKERS
@@ -32,7 +32,7 @@ class AppInstallationFilter(django_filters.FilterSet):
         return queryset.filter(Q(metadata__has_key=value))
 
     def metadata_value_filter(self, queryset, name, value):
-        return queryset.filter(Q(metadata__values__contains=value))
+        return queryset.filter(Q(metadata__has_value=value))
 
 
 class AppInstallationType(utils.BaseObjectType):
@@ -70,7 +70,7 @@ class AppFilter(django_filters.FilterSet):
         return queryset.filter(Q(metadata__has_key=value))
 
     def metadata_value_filter(self, queryset, name, value):
-        return queryset.filter(Q(metadata__values__contains=value))
+        return queryset.filter(Q(metadata__has_value=value))
 
 
 class AppType(utils.BaseObjectType):
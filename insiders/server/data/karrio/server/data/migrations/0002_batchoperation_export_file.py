@@ -0,0 +1,20 @@
+# Generated by Django 3.2.16 on 2026-10-18 21:12
+
+from django.db import migrations, models
+import karrio.server.core.storage
+import karrio.server.data.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='batchoperation',
+            name='export_file',
+            field=models.FileField(blank=True, max_length=255, null=True, storage=karrio.server.core.storage.documents_storage, upload_to=karrio.server.data.models.export_path),
+        ),
+    ]
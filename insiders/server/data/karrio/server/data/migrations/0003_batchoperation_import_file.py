@@ -0,0 +1,27 @@
+# Generated by Django 3.2.16 on 2026-10-18 22:04
+
+from django.db import migrations, models
+import functools
+import karrio.server.core.storage
+import karrio.server.core.utils
+import karrio.server.data.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data', '0002_batchoperation_export_file'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='batchoperation',
+            name='import_file',
+            field=models.FileField(blank=True, max_length=255, null=True, storage=karrio.server.core.storage.documents_storage, upload_to=karrio.server.data.models.import_path),
+        ),
+        migrations.AddField(
+            model_name='batchoperation',
+            name='meta',
+            field=models.JSONField(blank=True, default=functools.partial(karrio.server.core.utils.identity, *(), **{'value': {}}), null=True),
+        ),
+    ]
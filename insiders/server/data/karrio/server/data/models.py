@@ -1,13 +1,24 @@
+import typing
 from functools import partial
 from django.db import models
+from django.urls import reverse
 from django.core.validators import RegexValidator
 
 import karrio.server.core.utils as utils
+import karrio.server.core.storage as storage
 import karrio.server.orgs.models as orgs
 import karrio.server.core.models as core
 import karrio.server.data.serializers as serializers
 
 
+def export_path(instance, filename: str) -> str:
+    return f"exports/{instance.pk}/{filename}"
+
+
+def import_path(instance, filename: str) -> str:
+    return f"imports/{instance.pk}/{filename}"
+
+
 @core.register_model
 class BatchOperation(core.OwnedEntity):
     class Meta:
@@ -37,6 +48,23 @@ class BatchOperation(core.OwnedEntity):
         blank=True, null=True, default=partial(utils.identity, value=[])
     )
     test_mode = models.BooleanField(null=False)
+    export_file = models.FileField(
+        max_length=255,
+        null=True,
+        blank=True,
+        storage=storage.documents_storage,
+        upload_to=export_path,
+    )
+    import_file = models.FileField(
+        max_length=255,
+        null=True,
+        blank=True,
+        storage=storage.documents_storage,
+        upload_to=import_path,
+    )
+    meta = models.JSONField(
+        blank=True, null=True, default=partial(utils.identity, value={})
+    )
 
     org = models.ManyToManyField(
         orgs.Organization, related_name="batch_operations", through="BatchOperationLink"
@@ -46,6 +74,32 @@ class BatchOperation(core.OwnedEntity):
     def object_type(self):
         return "batch"
 
+    @property
+    def export_url(self):
+        if not self.export_file:
+            return None
+
+        return reverse(
+            "karrio.server.data:data-export-file",
+            kwargs=dict(pk=self.pk),
+        )
+
+    @property
+    def pending_chunks(self) -> typing.List[int]:
+        """The indexes of the import chunks not processed yet."""
+        meta = self.meta or {}
+        processed = meta.get("processed_chunks") or []
+
+        return [i for i in range(meta.get("chunks") or 0) if i not in processed]
+
+    def delete(self, *args, **kwargs):
+        if self.export_file:
+            self.export_file.delete(save=False)
+        if self.import_file:
+            self.import_file.delete(save=False)
+
+        return super().delete(*args, **kwargs)
+
 
 class BatchOperationLink(models.Model):
     org = models.ForeignKey(
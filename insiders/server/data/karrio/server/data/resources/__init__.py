@@ -1,3 +1,10 @@
+import io
+import csv
+import typing
+import tablib
+import itertools
+from django.conf import settings
+from django.db.models import QuerySet
 from django.contrib.auth import get_user_model
 from import_export import resources
 
@@ -25,13 +32,128 @@ def get_resource(
     resource_type: str, params: dict, context, data_fields: dict = None
 ) -> resources.ModelResource:
 
-    if resource_type == "orders":
+    if resource_type in ["orders", "order"]:
         return orders.order_resource(params, context, data_fields=data_fields)
 
     if resource_type == "tracking":
         return tracking.tracking_resource(params, context, data_fields=data_fields)
 
-    if resource_type == "shipments":
+    if resource_type in ["shipments", "shipment"]:
         return shipments.shipment_resource(params, context, data_fields=data_fields)
 
     raise Exception("Unsupported resource")
+
+
+def export_rows(
+    resource: resources.ModelResource, chunk_size: int = None
+) -> typing.Iterator[list]:
+    """Yield the export headers then every exported row of the resource."""
+    chunk_size = chunk_size or getattr(settings, "DATA_EXPORT_CHUNK_SIZE", 500)
+
+    yield resource.get_export_headers()
+
+    for instance in iter_queryset(resource.get_queryset(), chunk_size):
+        yield resource.export_resource(instance)
+
+
+def iter_queryset(queryset: QuerySet, chunk_size: int) -> typing.Iterator:
+    """Walk a queryset by chunks of primary keys.
+
+    Unlike `QuerySet.iterator()`, the prefetched relations are loaded for
+    every chunk.
+    """
+    ids = queryset.values_list("pk", flat=True).iterator(chunk_size=chunk_size)
+
+    while True:
+        chunk = list(itertools.islice(ids, chunk_size))
+
+        if len(chunk) == 0:
+            break
+
+        instances = {instance.pk: instance for instance in queryset.filter(pk__in=chunk)}
+        yield from (instances[pk] for pk in chunk if pk in instances)
+
+
+def write_import_file(
+    dataset: tablib.Dataset, file: typing.BinaryIO, chunk_size: int
+) -> typing.List[int]:
+    """Write an imported dataset to a CSV file and return the byte offset
+    of every chunk of `chunk_size` rows.
+
+    Uploads are loaded with format detection (CSV, TSV, JSON, YAML...) and
+    stored as CSV so that the chunks are read the same way for any format.
+    """
+    rows = itertools.chain(
+        [dataset.headers or []], (dataset[i] for i in range(len(dataset)))
+    )
+    offsets, position = [], 0
+
+    for index, line in enumerate(stream_csv(rows)):
+        if index > 0 and (index - 1) % chunk_size == 0:
+            offsets.append(position)
+
+        content = line.encode("utf-8")
+        file.write(content)
+        position += len(content)
+
+    return offsets
+
+
+def read_chunk(file: typing.BinaryIO, offset: int, size: int) -> tablib.Dataset:
+    """Load `size` data rows from the byte `offset` of an import file
+    (written by `write_import_file`).
+
+    Empty lines are skipped and short rows are padded like tablib does when
+    loading the whole file.
+    """
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    headers = next(csv.reader(text), [])
+    text.detach()
+
+    file.seek(offset)
+    text = io.TextIOWrapper(file, encoding="utf-8", newline="")
+    rows = list(itertools.islice((row for row in csv.reader(text) if row), size))
+    text.detach()
+
+    return tablib.Dataset(
+        *[row + [""] * (len(headers) - len(row)) for row in rows],
+        headers=headers,
+    )
+
+
+def stream_csv(rows: typing.Iterable[list]) -> typing.Iterator[str]:
+    """Render rows as CSV lines, one at a time."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    for row in rows:
+        writer.writerow(row)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+
+
+def write_file(rows: typing.Iterator[list], export_format: str, file: typing.BinaryIO):
+    """Write the exported rows to a binary file in the requested format.
+
+    XLSX files are written row by row (openpyxl write-only mode).
+    """
+    if export_format == "csv":
+        for line in stream_csv(rows):
+            file.write(line.encode("utf-8"))
+
+    elif export_format == "xlsx":
+        import openpyxl
+
+        workbook = openpyxl.Workbook(write_only=True)
+        sheet = workbook.create_sheet()
+
+        for row in rows:
+            sheet.append(row)
+
+        workbook.save(file)
+
+    else:
+        headers = next(rows)
+        content = tablib.Dataset(*rows, headers=headers).export(export_format)
+        file.write(content.encode("utf-8") if isinstance(content, str) else content)
@@ -11,6 +11,7 @@ from karrio.server.data.serializers.base import (
     RESOURCE_TYPE,
     OPERATION_STATUS,
     ImportData,
+    ExportData,
     BatchObject,
     BatchOperation,
     BatchOperationData,
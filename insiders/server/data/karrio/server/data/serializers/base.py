@@ -64,6 +64,12 @@ class ImportData(serializers.Serializer):
     data_file = fields.FileField(required=True)
 
 
+class ExportData(serializers.Serializer):
+    resource_type = fields.ChoiceField(required=True, choices=RESOURCE_TYPE)
+    export_format = fields.CharField(required=True)
+    query_params = serializers.PlainDictField(required=False)
+
+
 class BatchObject(serializers.EntitySerializer):
     status = fields.ChoiceField(
         choices=OPERATION_STATUS, help_text="The batch operation resource status"
@@ -80,3 +86,8 @@ class BatchOperation(serializers.EntitySerializer, BatchOperationData):
     created_at = fields.DateTimeField()
     updated_at = fields.DateTimeField()
     test_mode = fields.BooleanField(required=True)
+    export_url = fields.CharField(
+        required=False,
+        allow_null=True,
+        help_text="The generated file download URL of an export batch operation",
+    )
@@ -1,6 +1,9 @@
+import os
 import tablib
 import logging
+import tempfile
 from django.db import transaction
+from django.core.files import File
 
 from karrio.server.conf import settings
 import karrio.server.events.tasks as tasks
@@ -48,27 +51,88 @@ class ImportDataSerializer(serializers.ImportData):
         validation = resource.import_data(dataset, dry_run=True)
         check_dataset_validation_errors(validation)
 
+        # the upload is stored once as CSV, the chunks are read from it (at the
+        # recorded byte offsets) by the workers.
+        chunk_size = max(settings.DATA_IMPORT_CHUNK_SIZE or 500, 1)
+
+        with tempfile.TemporaryFile() as import_file:
+            chunk_offsets = resources.write_import_file(
+                dataset, import_file, chunk_size
+            )
+            operation = (
+                serializers.SerializerDecorator[batch.BatchOperationModelSerializer](
+                    data=dict(
+                        resource_type=resource_type,
+                        test_mode=context.test_mode,
+                        meta=dict(
+                            data_fields=data_fields,
+                            rows=len(dataset),
+                            chunk_size=chunk_size,
+                            chunks=len(chunk_offsets),
+                            chunk_offsets=chunk_offsets,
+                            processed_chunks=[],
+                        ),
+                    ),
+                    context=context,
+                )
+                .save()
+                .instance
+            )
+
+            import_file.seek(0)
+            operation.import_file.save(
+                f"{os.path.splitext(os.path.basename(data_field.name))[0]}.csv",
+                File(import_file),
+                save=False,
+            )
+            operation.save(update_fields=["import_file"])
+
+        transaction.on_commit(
+            lambda: tasks.queue_batch(
+                operation.id,
+                ctx=dict(
+                    org_id=getattr(context.org, "id", None),
+                    user_id=getattr(context.user, "id", None),
+                    test_mode=context.test_mode,
+                ),
+                schema=settings.schema,
+            )
+        )
+
+        return operation
+
+
+@serializers.owned_model_serializer
+class ExportDataSerializer(serializers.ExportData):
+    def create(
+        self, validated_data: dict, context: serializers.Context, **kwargs
+    ) -> models.BatchOperation:
         operation = (
             serializers.SerializerDecorator[batch.BatchOperationModelSerializer](
-                data=dict(resource_type=resource_type, test_mode=context.test_mode),
+                data=dict(
+                    resource_type=validated_data["resource_type"],
+                    test_mode=context.test_mode,
+                ),
                 context=context,
             )
             .save()
             .instance
         )
 
-        tasks.queue_batch(
-            operation.id,
-            data=dict(
-                dataset=dataset,
-                import_data=validated_data,
-            ),
-            ctx=dict(
-                org_id=getattr(context.org, "id", None),
-                user_id=getattr(context.user, "id", None),
-                test_mode=context.test_mode,
-            ),
-            schema=settings.schema,
+        transaction.on_commit(
+            lambda: tasks.queue_export(
+                operation.id,
+                data=dict(
+                    export_format=validated_data["export_format"],
+                    query_params=validated_data.get("query_params") or {},
+                ),
+                ctx=dict(
+                    org_id=getattr(context.org, "id", None),
+                    user_id=getattr(context.user, "id", None),
+                    test_mode=context.test_mode,
+                ),
+                schema=settings.schema,
+            )
         )
 
         return operation
@@ -1,3 +1,128 @@
+import io
+import tablib
+import openpyxl
+from unittest.mock import patch
 from django.test import TestCase
+from django.contrib.auth import get_user_model
 
-# Create your tests here.
+from karrio.server.core.tests import APITestCase
+from karrio.server.events.task_definitions.data.export import generate_export_file
+import karrio.server.data.resources as resources
+import karrio.server.data.models as models
+
+
+class UserResource:
+    """A minimal export resource over the users."""
+
+    def get_export_headers(self):
+        return ["email", "is_staff"]
+
+    def get_queryset(self):
+        return get_user_model().objects.order_by("email")
+
+    def export_resource(self, user):
+        return [user.email, user.is_staff]
+
+
+class TestDataExport(APITestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        for email in ["b@example.com", "c@example.com"]:
+            get_user_model().objects.create_user(email, "test")
+
+    def test_export_rows_by_chunks(self):
+        rows = list(resources.export_rows(UserResource(), chunk_size=1))
+
+        self.assertListEqual(
+            rows,
+            [
+                ["email", "is_staff"],
+                ["admin@example.com", True],
+                ["b@example.com", False],
+                ["c@example.com", False],
+            ],
+        )
+
+    def test_stream_csv(self):
+        lines = list(resources.stream_csv([["email", "note"], ["a@example.com", "x,y"]]))
+
+        self.assertListEqual(lines, ["email,note\r\n", 'a@example.com,"x,y"\r\n'])
+
+    def test_write_csv_file(self):
+        file = io.BytesIO()
+        resources.write_file(resources.export_rows(UserResource()), "csv", file)
+
+        self.assertEqual(
+            file.getvalue().decode("utf-8"),
+            "email,is_staff\r\n"
+            "admin@example.com,True\r\n"
+            "b@example.com,False\r\n"
+            "c@example.com,False\r\n",
+        )
+
+    def test_write_xlsx_file(self):
+        file = io.BytesIO()
+        resources.write_file(resources.export_rows(UserResource()), "xlsx", file)
+        file.seek(0)
+        sheet = openpyxl.load_workbook(file).active
+
+        self.assertListEqual(
+            [list(row) for row in sheet.iter_rows(values_only=True)],
+            [
+                ["email", "is_staff"],
+                ["admin@example.com", True],
+                ["b@example.com", False],
+                ["c@example.com", False],
+            ],
+        )
+
+    def test_generate_export_file(self):
+        operation = models.BatchOperation.objects.create(
+            resource_type="shipment", test_mode=True, created_by=self.user
+        )
+
+        with patch(
+            "karrio.server.events.task_definitions.data.export.resources.get_resource",
+            return_value=UserResource(),
+        ):
+            generate_export_file(
+                operation.id,
+                data=dict(export_format="csv"),
+                ctx=dict(user_id=self.user.id, test_mode=True),
+            )
+
+        operation.refresh_from_db()
+        with operation.export_file.open("rb") as file:
+            content = file.read().decode("utf-8")
+
+        self.assertEqual(operation.status, "completed")
+        self.assertTrue(operation.export_file.name.endswith("shipment.csv"))
+        self.assertTrue(content.startswith("email,is_staff\r\nadmin@example.com"))
+
+
+class TestImportFile(TestCase):
+    def test_read_import_file_chunks(self):
+        dataset = tablib.Dataset(headers=["order_id", "address"])
+        for index in range(7):
+            dataset.append([f"ORD-{index}", "125 Church St\nMoncton"])
+
+        file = io.BytesIO()
+        offsets = resources.write_import_file(dataset, file, chunk_size=3)
+        rows = []
+        for offset in offsets:
+            file.seek(0)
+            rows += [tuple(row) for row in resources.read_chunk(file, offset, 3)]
+
+        self.assertEqual(len(offsets), 3)
+        self.assertListEqual(rows, [tuple(row) for row in dataset])
+
+    def test_write_import_file_from_json_upload(self):
+        dataset = tablib.Dataset().load('[{"order_id": "ORD-1", "source": "api"}]')
+
+        file = io.BytesIO()
+        offsets = resources.write_import_file(dataset, file, chunk_size=3)
+        file.seek(0)
+        chunk = resources.read_chunk(file, offsets[0], 3)
+
+        self.assertListEqual(chunk.headers, ["order_id", "source"])
+        self.assertListEqual([tuple(row) for row in chunk], [("ORD-1", "api")])
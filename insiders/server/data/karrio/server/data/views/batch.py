@@ -1,5 +1,4 @@
 from django.urls import path
-from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.response import Response
 from rest_framework.request import Request
 from django_filters import rest_framework as filters
@@ -7,6 +6,7 @@ from drf_yasg.utils import swagger_auto_schema
 
 from karrio.server.data.filters import BatchOperationFilter
 import karrio.server.core.views.api as api
+from karrio.server.core.pagination import LimitOffsetPagination
 import karrio.server.data.models as models
 import karrio.server.data.serializers as serializers
 
@@ -41,11 +41,11 @@ class BatchList(api.GenericAPIView):
         """
 
         batches = self.filter_queryset(self.get_queryset())
-        response = self.paginate_queryset(
-            serializers.BatchOperation(batches, many=True).data
-        )
+        response = self.paginate_queryset(batches)
 
-        return self.get_paginated_response(response)
+        return self.get_paginated_response(
+            serializers.BatchOperation(response, many=True).data
+        )
 
 
 class BatchDetails(api.APIView):
@@ -1,5 +1,6 @@
 import io
-from django.http import JsonResponse
+from django.conf import settings
+from django.http import JsonResponse, StreamingHttpResponse
 from django.urls import re_path, path
 from django.views.decorators.csrf import csrf_exempt
 from django.core.files.base import ContentFile
@@ -13,10 +14,15 @@ from drf_yasg import openapi
 
 import karrio.server.core.views.api as api
 import karrio.server.data.serializers as serializers
+import karrio.server.data.models as models
 import karrio.server.data.resources as resources
-from karrio.server.data.serializers.data import ImportDataSerializer
+from karrio.server.data.serializers.data import (
+    ImportDataSerializer,
+    ExportDataSerializer,
+)
 
 ENDPOINT_ID = "&&&&$"  # This endpoint id is used to make operation ids unique make sure not to duplicate
+RESOURCE_TYPES = dict(orders="order", shipments="shipment", tracking="tracking")
 DataImportParameters = [
     openapi.Parameter(
         name="resource_type",
@@ -111,6 +117,7 @@ class DataExport(api.LoginRequiredView, VirtualDownloadView):
         operation_summary="Export data files",
         responses={
             200: openapi.Schema(type=openapi.TYPE_FILE),
+            202: serializers.BatchOperation(),
             409: serializers.ErrorResponse(),
             500: serializers.ErrorResponse(),
         },
@@ -123,16 +130,28 @@ class DataExport(api.LoginRequiredView, VirtualDownloadView):
         export_format: str = "csv",
         **kwargs,
     ):
+        """Generate a file to export.
+
+        CSV files are streamed as the rows are read. XLSX files of more than
+        `DATA_EXPORT_ASYNC_THRESHOLD` rows are generated in the background:
+        a batch operation is returned, its `export_url` is set once the file
+        is ready.
+        """
         try:
-            """Generate a file to export."""
             query_params = request.GET
             self.attachment = "download" in query_params
             self.resource = resource_type
             self.format = export_format
 
-            self.dataset = resources.export(
-                resource_type, query_params, context=request
-            )
+            resource = resources.get_resource(resource_type, query_params, request)
+
+            if export_format == "csv":
+                return self.stream_csv(resource)
+
+            if export_format == "xlsx" and self.is_large_export(resource):
+                return self.queue_export(request, resource_type, export_format)
+
+            self.dataset = resource.export()
 
             response = super(DataExport, self).get(request, **kwargs)
             response["X-Frame-Options"] = "ALLOWALL"
@@ -150,6 +169,66 @@ class DataExport(api.LoginRequiredView, VirtualDownloadView):
 
         return ContentFile(buffer.getvalue(), name=f"{self.resource}.{self.format}")
 
+    def stream_csv(self, resource):
+        response = StreamingHttpResponse(
+            resources.stream_csv(resources.export_rows(resource)),
+            content_type="text/csv",
+        )
+        disposition = "attachment" if self.attachment else "inline"
+        response[
+            "Content-Disposition"
+        ] = f'{disposition}; filename="{self.resource}.{self.format}"'
+        response["X-Frame-Options"] = "ALLOWALL"
+
+        return response
+
+    def is_large_export(self, resource) -> bool:
+        threshold = getattr(settings, "DATA_EXPORT_ASYNC_THRESHOLD", 0)
+
+        return threshold > 0 and resource.get_queryset().count() > threshold
+
+    def queue_export(self, request: Request, resource_type: str, export_format: str):
+        operation = (
+            serializers.SerializerDecorator[ExportDataSerializer](
+                data=dict(
+                    resource_type=RESOURCE_TYPES.get(resource_type, resource_type),
+                    export_format=export_format,
+                    query_params=request.GET.dict(),
+                ),
+                context=request,
+            )
+            .save()
+            .instance
+        )
+
+        return JsonResponse(
+            serializers.BatchOperation(operation).data,
+            status=status.HTTP_202_ACCEPTED,
+        )
+
+
+class DataExportFile(api.LoginRequiredView, VirtualDownloadView):
+    @swagger_auto_schema(
+        tags=["Data"],
+        operation_id=f"{ENDPOINT_ID}export_download",
+        operation_summary="Download a generated export file",
+        responses={
+            200: openapi.Schema(type=openapi.TYPE_FILE),
+            404: serializers.ErrorResponse(),
+        },
+    )
+    def get(self, request: Request, pk: str, **kwargs):
+        """Download the file generated by an export batch operation."""
+        self.operation = models.BatchOperation.access_by(request).get(
+            pk=pk, export_file__gt=""
+        )
+        self.attachment = True
+
+        return super(DataExportFile, self).get(request, **kwargs)
+
+    def get_file(self):
+        return self.operation.export_file
+
 
 urlpatterns = [
     path("data/import", DataImport.as_view(), name="data-import"),
@@ -158,4 +237,9 @@ urlpatterns = [
         csrf_exempt(DataExport.as_view()),
         name="data-export",
     ),
+    path(
+        "data/exports/<str:pk>",
+        DataExportFile.as_view(),
+        name="data-export-file",
+    ),
 ]
@@ -2,16 +2,17 @@ __path__ = __import__("pkgutil").extend_path(__path__, __name__)  # type: ignore
 
 import logging
 from django.conf import settings
-from huey.contrib.djhuey import db_task
+from huey import crontab
 
 import karrio.server.core.utils as utils
+from karrio.server.events.queues import db_task, db_periodic_task
 import karrio.server.data.models as models
 import karrio.server.data.serializers as serializers
 
 logger = logging.getLogger(__name__)
 
 
-@db_task()
+@db_task(queue="data")
 @utils.tenant_aware
 def queue_batch(*args, **kwargs):
     try:
@@ -30,7 +31,49 @@ def queue_batch(*args, **kwargs):
         logger.error("batch processing failed")
 
 
-@db_task()
+@db_task(queue="data")
+@utils.tenant_aware
+def queue_import_chunk(*args, **kwargs):
+    try:
+        from karrio.server.events.task_definitions.data.batch import (
+            process_import_chunk,
+        )
+
+        process_import_chunk(*args, **kwargs)
+    except Exception as e:
+        logger.error(f"batch chunk processing failed: {e}")
+
+
+@db_periodic_task(crontab(minute="*/5"), queue="data")
+def background_batch_imports_resume():
+    from karrio.server.events.task_definitions.data.batch import (
+        resume_batch_imports,
+    )
+
+    @utils.run_on_all_tenants
+    def _run(**kwargs):
+        try:
+            resume_batch_imports(**kwargs)
+        except Exception as e:
+            logger.error(f"failed to resume batch imports: {e}")
+
+    _run()
+
+
+@db_task(queue="data")
+@utils.tenant_aware
+def queue_export(*args, **kwargs):
+    try:
+        from karrio.server.events.task_definitions.data.export import (
+            generate_export_file,
+        )
+
+        generate_export_file(*args, **kwargs)
+    except Exception as e:
+        logger.error(f"export generation failed: {e}")
+
+
+@db_task(queue="data")
 @utils.tenant_aware
 def process_batch_resources(batch_id, **kwargs):
     logger.info(f"> start batch ({batch_id}) resources processing...")
@@ -81,5 +124,8 @@ def _compute_tracker_state(tracker=None) -> serializers.ResourceStatus:
 
 TASK_DEFINITIONS = [
     queue_batch,
+    queue_import_chunk,
+    background_batch_imports_resume,
+    queue_export,
     process_batch_resources,
 ]
@@ -1,7 +1,10 @@
 import typing
 import logging
+import datetime
 import tablib
 from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
 from django.contrib.auth import get_user_model
 from import_export.resources import ModelResource
 
@@ -17,37 +20,91 @@ User = get_user_model()
 @utils.tenant_aware
 def trigger_batch_processing(
     batch_id: str,
-    data: dict,
     ctx: dict,
     **kwargs,
 ):
+    """Queue a task for every import chunk not processed yet."""
     logger.info(f"> starting batch operation processing ({batch_id})")
+    from karrio.server.events import tasks
+
+    context = retrieve_context(ctx)
+    batch_operation = (
+        models.BatchOperation.access_by(context).filter(pk=batch_id).first()
+    )
+
+    if batch_operation is None:
+        logger.info("batch operation not found")
+        return
+
+    pending_chunks = batch_operation.pending_chunks
+
+    if len(pending_chunks) == 0:
+        update_batch_operation_status(batch_operation)
+
+    for index in pending_chunks:
+        tasks.queue_import_chunk(batch_id, index, ctx=ctx, schema=kwargs.get("schema"))
+
+    logger.info(f"> {len(pending_chunks)} chunk(s) queued ({batch_id})")
+
+
+@utils.tenant_aware
+def process_import_chunk(
+    batch_id: str,
+    index: int,
+    ctx: dict,
+    **kwargs,
+):
+    """Import a chunk of the batch operation file in its own transaction.
+
+    The chunk resources and progress are recorded in the same transaction so
+    that a chunk interrupted by a worker crash is simply imported again when
+    the batch is resumed.
+    """
+    logger.info(f"> starting batch operation chunk processing ({batch_id}:{index})")
+    context = retrieve_context(ctx)
+    batch_operation = (
+        models.BatchOperation.access_by(context).filter(pk=batch_id).first()
+    )
+
+    if batch_operation is None or index not in batch_operation.pending_chunks:
+        logger.info("batch operation chunk not found or already processed")
+        return
+
+    meta = batch_operation.meta
+
     try:
-        context = retrieve_context(ctx)
-        batch_operation = (
-            models.BatchOperation.access_by(context).filter(pk=batch_id).first()
-        )
+        with transaction.atomic():
+            with batch_operation.import_file.open("rb") as file:
+                dataset = resources.read_chunk(
+                    file, meta["chunk_offsets"][index], meta["chunk_size"]
+                )
 
-        if batch_operation is not None:
-            import_data = data["import_data"]
-            dataset = data["dataset"]
             resource = resources.get_resource(
                 resource_type=batch_operation.resource_type,
-                params=import_data,
+                params={},
                 context=context,
+                data_fields=meta.get("data_fields"),
             )
-
             batch_resources = process_resources(
                 batch_operation.resource_type, resource, dataset, context
             )
-            update_batch_operation_resources(batch_operation, batch_resources)
-        else:
-            logger.info("batch operation not found")
+            completed = complete_chunk(batch_id, index, batch_resources)
+
+    except ChunkAlreadyProcessed:
+        logger.info(f"batch operation chunk already processed ({batch_id}:{index})")
+        return
 
     except Exception as e:
-        logger.error(e)
+        logger.error(e, exc_info=True)
+        completed = utils.failsafe(
+            lambda: complete_chunk(batch_id, index, [], failed=True),
+            "failed to record the batch operation chunk failure: $error",
+        )
+
+    if completed:
+        update_batch_operation_status(models.BatchOperation.objects.get(pk=batch_id))
 
-    logger.info(f"> ending batch operation processing ({batch_id})")
+    logger.info(f"> ending batch operation chunk processing ({batch_id}:{index})")
 
 
 def process_resources(
@@ -59,14 +116,22 @@ def process_resources(
     result = resource.import_data(dataset, dry_run=False)
 
     _object_model = serializers.ResourceType.get_model(resource_type)
-    _object_ids = [row.object_id for row in result.rows]
-    _objects: list = []
-    for _object in _object_model.objects.filter(id__in=_object_ids):
-        _object.link = _object.__class__.link.related.related_model.objects.create(
-            org=context.org, item=_object
-        )
+    _object_ids = [row.object_id for row in result.rows if row.object_id is not None]
 
-    _object_model.objects.bulk_update(_objects, fields=["updated_at"])
+    if context.org is not None:
+        Link = _object_model.link.related.related_model
+        linked = set(
+            Link.objects.filter(item_id__in=_object_ids).values_list(
+                "item_id", flat=True
+            )
+        )
+        Link.objects.bulk_create(
+            [
+                Link(org=context.org, item_id=_object_id)
+                for _object_id in _object_ids
+                if _object_id not in linked
+            ]
+        )
 
     return [
         dict(id=id, status=serializers.ResourceStatus.queued.value)
@@ -74,16 +139,45 @@ def process_resources(
     ]
 
 
-def update_batch_operation_resources(
-    batch_operation: models.BatchOperation,
+def complete_chunk(
+    batch_id: str,
+    index: int,
     batch_resources: typing.List[dict],
-):
+    failed: bool = False,
+) -> bool:
+    """Record a processed chunk and return whether it was the last one."""
+    with transaction.atomic():
+        batch_operation = models.BatchOperation.objects.select_for_update().get(
+            pk=batch_id
+        )
+        meta = batch_operation.meta
+
+        if index in meta["processed_chunks"]:
+            raise ChunkAlreadyProcessed()
+
+        meta["processed_chunks"].append(index)
+        if failed:
+            meta["failed_chunks"] = [*meta.get("failed_chunks", []), index]
+
+        batch_operation.resources = [*(batch_operation.resources or []), *batch_resources]
+        batch_operation.save(update_fields=["meta", "resources", "updated_at"])
+
+    return len(batch_operation.pending_chunks) == 0
+
+
+def update_batch_operation_status(batch_operation: models.BatchOperation):
+    """Mark an import as running (its resources post processing) or
+    completed when nothing was imported.
+    """
     try:
         logger.debug(f"update batch operation {batch_operation.id}")
 
-        batch_operation.status = serializers.BatchOperationStatus.running.value
-        batch_operation.resources = batch_resources
-        batch_operation.save(update_fields=["resources", "status"])
+        batch_operation.status = (
+            serializers.BatchOperationStatus.running.value
+            if any(batch_operation.resources or [])
+            else serializers.BatchOperationStatus.completed.value
+        )
+        batch_operation.save(update_fields=["status"])
 
         logger.debug(f"batch operation {batch_operation.id} updated successfully")
     except Exception as update_error:
@@ -91,6 +185,39 @@ def update_batch_operation_resources(
         logger.error(update_error, exc_info=True)
 
 
+def resume_batch_imports(schema: str = None):
+    """Resume the imports that haven't progressed for DATA_IMPORT_RESUME_DELAY."""
+    from karrio.server.events import tasks
+
+    delay = datetime.timedelta(
+        seconds=getattr(settings, "DATA_IMPORT_RESUME_DELAY", 900)
+    )
+    stalled = models.BatchOperation.objects.filter(
+        status=serializers.BatchOperationStatus.queued.value,
+        import_file__gt="",
+        updated_at__lt=timezone.now() - delay,
+    )
+
+    for batch_operation in stalled:
+        logger.info(f"> resuming batch operation ({batch_operation.id})")
+        # touch the batch so that it is not resumed again before the delay
+        batch_operation.save(update_fields=["updated_at"])
+
+        tasks.queue_batch(
+            batch_operation.id,
+            ctx=dict(
+                org_id=utils.failsafe(lambda: batch_operation.link.org_id),
+                user_id=batch_operation.created_by_id,
+                test_mode=batch_operation.test_mode,
+            ),
+            schema=schema,
+        )
+
+
+class ChunkAlreadyProcessed(Exception):
+    pass
+
+
 def retrieve_context(info: dict) -> serializers.Context:
     org = None
 
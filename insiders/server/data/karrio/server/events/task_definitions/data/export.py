@@ -0,0 +1,52 @@
+import logging
+import tempfile
+from django.core.files import File
+
+import karrio.server.core.utils as utils
+import karrio.server.data.serializers as serializers
+import karrio.server.data.resources as resources
+import karrio.server.data.models as models
+from karrio.server.events.task_definitions.data.batch import retrieve_context
+
+logger = logging.getLogger(__name__)
+
+
+@utils.tenant_aware
+def generate_export_file(
+    batch_id: str,
+    data: dict,
+    ctx: dict,
+    **kwargs,
+):
+    """Write an export file to the documents storage chunk by chunk."""
+    logger.info(f"> starting export generation ({batch_id})")
+    context = retrieve_context(ctx)
+    batch_operation = models.BatchOperation.access_by(context).filter(pk=batch_id).first()
+
+    if batch_operation is None:
+        logger.info("batch operation not found")
+        return
+
+    try:
+        export_format = data["export_format"]
+        resource = resources.get_resource(
+            batch_operation.resource_type, data.get("query_params") or {}, context
+        )
+
+        with tempfile.TemporaryFile() as file:
+            resources.write_file(resources.export_rows(resource), export_format, file)
+            file.seek(0)
+            batch_operation.export_file.save(
+                f"{batch_operation.resource_type}.{export_format}",
+                File(file),
+                save=False,
+            )
+
+        batch_operation.status = serializers.BatchOperationStatus.completed.value
+        batch_operation.save(update_fields=["export_file", "status"])
+    except Exception as e:
+        logger.error(e, exc_info=True)
+        batch_operation.status = serializers.BatchOperationStatus.failed.value
+        batch_operation.save(update_fields=["status"])
+
+    logger.info(f"> ending export generation ({batch_id})")
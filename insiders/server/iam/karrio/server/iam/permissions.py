@@ -1,5 +1,3 @@
-import functools
-import operator
 import typing
 import logging
 from django.db import models
@@ -8,6 +6,7 @@ from django.contrib.contenttypes import models as contenttypes
 from rest_framework import exceptions
 
 import karrio.server.core.utils as utils
+import karrio.server.core.authentication as auth
 import karrio.server.user.models as users
 import karrio.server.orgs.models as orgs
 import karrio.server.iam.serializers as serializers
@@ -164,23 +163,47 @@ def sync_permissions(org_user):
 def check_context_permissions(context=None, keys: typing.List[str] = [], **kwargs):
     groups = [group for group, _ in serializers.PERMISSION_GROUPS if group in keys]
 
-    if any(groups) and users.Group.objects.exists():
-        user = context.org.organization_users.filter(user__id=context.user.id).first()
-        token = getattr(context, "token", None)
-        group_filters = functools.reduce(
-            operator.and_, (models.Q(groups__name=x) for x in groups)
-        )
-        token_permission = iam.ContextPermission.objects.filter(
-            models.Q(object_pk=getattr(token, "pk", None))
-        )
+    if not any(groups):
+        return
+
+    token = getattr(context, "token", None)
+    granted = auth.resolve_cached(
+        (
+            "permissions",
+            getattr(context.org, "id", None),
+            getattr(context.user, "id", None),
+            getattr(token, "pk", None),
+        ),
+        lambda: get_context_groups(context),
+    )
+
+    if granted is not None and not all(group in granted for group in groups):
+        raise exceptions.PermissionDenied()
 
-        if token_permission.exists():
-            permission_groups = token_permission.filter(group_filters)
-        else:
-            permission_groups = iam.ContextPermission.objects.filter(
-                models.Q(object_pk=user.pk) & group_filters
-            )
 
-        if not permission_groups.exists():
-            raise exceptions.PermissionDenied()
+def get_context_groups(context) -> typing.Optional[typing.Set[str]]:
+    """Return the permission groups granted to the context token (or org user).
 
+    None is returned when no permission group is set up.
+    """
+    if not users.Group.objects.exists():
+        return None
+
+    token_pk = getattr(getattr(context, "token", None), "pk", None)
+    token_permission = iam.ContextPermission.objects.filter(object_pk=token_pk)
+
+    if token_pk is not None and token_permission.exists():
+        object_pk = token_pk
+    else:
+        org_user = (
+            context.org.organization_users.filter(user__id=context.user.id).first()
+            if context.org is not None
+            else None
+        )
+        object_pk = getattr(org_user, "pk", None)
+
+    return set(
+        users.Group.objects.filter(context__object_pk=object_pk).values_list(
+            "name", flat=True
+        )
+    )
@@ -4,6 +4,7 @@ from django.dispatch import receiver
 from django.db.models import signals
 
 import karrio.server.core.utils as utils
+import karrio.server.core.signals as core_signals
 import karrio.server.orgs.models as orgs
 import karrio.server.user.models as user
 import karrio.server.iam.models as models
@@ -18,6 +19,15 @@ def register_all():
     signals.post_delete.connect(context_object_deleted, sender=orgs.OrganizationUser)
     signals.post_delete.connect(context_object_deleted, sender=user.Token)
 
+    # cached context permissions
+    signals.post_save.connect(permissions_updated, sender=models.ContextPermission)
+    signals.post_delete.connect(permissions_updated, sender=models.ContextPermission)
+    signals.post_save.connect(permissions_updated, sender=user.Group)
+    signals.post_delete.connect(permissions_updated, sender=user.Group)
+    signals.m2m_changed.connect(
+        permissions_updated, sender=models.ContextPermission.groups.through
+    )
+
     logger.info("karrio.iam signals registered...")
 
 
@@ -27,6 +37,11 @@ def context_object_deleted(sender, instance, *args, **kwargs):
     models.ContextPermission.objects.filter(object_pk=instance.pk).delete()
 
 
+def permissions_updated(sender, *args, **kwargs):
+    if kwargs.get("action", "post_add") in ("post_add", "post_remove", "post_clear"):
+        core_signals.invalidate_auth_cache()
+
+
 @utils.disable_for_loaddata
 def organization_user_changed(sender, instance, created, *args, **kwargs):
     # sync organization user permissions based on roles updates
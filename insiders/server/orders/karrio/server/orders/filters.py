@@ -1,11 +1,25 @@
 from django.db.models import Q
 from django_filters import rest_framework as filters
 
+from karrio.server.core import search
 from karrio.server.core.filters import CharInFilter
 from karrio.server.orders import serializers
 import karrio.server.orders.models as models
 
 
+# the shipping address fields searched while an order has no search document yet.
+ADDRESS_SEARCH_FIELDS = [
+    "shipping_to__address_line1",
+    "shipping_to__address_line2",
+    "shipping_to__postal_code",
+    "shipping_to__person_name",
+    "shipping_to__company_name",
+    "shipping_to__city",
+    "shipping_to__email",
+    "shipping_to__phone_number",
+]
+
+
 class OrderFilters(filters.FilterSet):
     address = filters.CharFilter(
         method="address_filter",
@@ -71,30 +85,12 @@ class OrderFilters(filters.FilterSet):
         fields: list = []
 
     def keyword_filter(self, queryset, name, value):
-        return queryset.filter(
-            Q(shipping_to__address_line1__icontains=value)
-            | Q(shipping_to__address_line2__icontains=value)
-            | Q(shipping_to__postal_code__icontains=value)
-            | Q(shipping_to__person_name__icontains=value)
-            | Q(shipping_to__company_name__icontains=value)
-            | Q(shipping_to__city__icontains=value)
-            | Q(shipping_to__email__icontains=value)
-            | Q(shipping_to__phone_number__icontains=value)
-            | Q(order_id__icontains=value)
-            | Q(source__icontains=value)
+        return search.keyword_search(
+            queryset, value, *ADDRESS_SEARCH_FIELDS, "order_id", "source"
         )
 
     def address_filter(self, queryset, name, value):
-        return queryset.filter(
-            Q(shipping_to__address_line1__icontains=value)
-            | Q(shipping_to__address_line2__icontains=value)
-            | Q(shipping_to__postal_code__icontains=value)
-            | Q(shipping_to__person_name__icontains=value)
-            | Q(shipping_to__company_name__icontains=value)
-            | Q(shipping_to__city__icontains=value)
-            | Q(shipping_to__email__icontains=value)
-            | Q(shipping_to__phone_number__icontains=value)
-        )
+        return queryset.filter(search.fields_filter(value, *ADDRESS_SEARCH_FIELDS))
 
     def id_filter(self, queryset, name, value):
         return queryset.filter(Q(id__in=value))
@@ -109,22 +105,10 @@ class OrderFilters(filters.FilterSet):
         return queryset.filter(options__has_keys=value)
 
     def option_value_filter(self, queryset, name, value):
-        return queryset.filter(
-            id__in=[
-                o["id"]
-                for o in queryset.values("id", "options")
-                if value in (o.get("options") or {}).values()
-            ]
-        )
+        return queryset.filter(options__has_value=value)
 
     def metadata_key_filter(self, queryset, name, value):
         return queryset.filter(metadata__has_keys=value)
 
     def metadata_value_filter(self, queryset, name, value):
-        return queryset.filter(
-            id__in=[
-                o["id"]
-                for o in queryset.values("id", "metadata")
-                if value in (o.get("metadata") or {}).values()
-            ]
-        )
+        return queryset.filter(metadata__has_value=value)
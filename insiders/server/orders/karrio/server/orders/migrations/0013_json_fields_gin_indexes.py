@@ -0,0 +1,60 @@
+# Generated by Django 3.2.16 on 2026-10-18 12:00
+
+from django.db import migrations
+
+# GIN (jsonb_path_ops) indexes serving the `has_value` and containment
+# lookups on Postgres. They are not declared on the models as the other
+# supported databases have no equivalent index type.
+# The indexes are built concurrently (outside of a transaction) so that the
+# tables stay writable during the build.
+INDEXES = [
+    ("order_options_gin_idx", "order", "options"),
+    ("order_metadata_gin_idx", "order", "metadata"),
+]
+
+
+def create_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    for name, table, column in INDEXES:
+        drop_invalid_index(schema_editor, name)
+        schema_editor.execute(
+            f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{name}" ON "{table}" '
+            f'USING gin ("{column}" jsonb_path_ops)'
+        )
+
+
+def drop_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    for name, *_ in INDEXES:
+        schema_editor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"')
+
+
+def drop_invalid_index(schema_editor, name: str):
+    """Drop the leftover of an interrupted concurrent build of the index."""
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+            "WHERE c.relname = %s AND NOT i.indisvalid "
+            "AND pg_table_is_visible(c.oid)",
+            [name],
+        )
+        invalid = cursor.fetchone() is not None
+
+    if invalid:
+        schema_editor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"')
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('orders', '0012_order_order_id_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
@@ -55,7 +55,10 @@ class OrderManager(models.Manager):
 
 @register_model
 class Order(OwnedEntity):
-    HIDDEN_PROPS = (*(("org",) if settings.MULTI_ORGANIZATIONS else tuple()),)
+    HIDDEN_PROPS = (
+        "search_document",
+        *(("org",) if settings.MULTI_ORGANIZATIONS else tuple()),
+    )
     DIRECT_PROPS = [
         "order_id",
         "order_date",
@@ -66,6 +69,7 @@ class Order(OwnedEntity):
         "test_mode",
         "created_by",
     ]
+    SEARCH_PROPS = ["order_id", "source", "metadata", "shipping_to"]
     objects = OrderManager()
 
     class Meta:
@@ -114,11 +118,21 @@ class Order(OwnedEntity):
         blank=True, null=True, default=partial(identity, value={})
     )
     test_mode = models.BooleanField()
+    search_document = models.TextField(null=True, blank=True, editable=False)
 
     @property
     def object_type(self):
         return "order"
 
+    @property
+    def search_values(self) -> list:
+        return [
+            self.order_id,
+            self.source,
+            self.metadata,
+            *self.shipping_to.search_values,
+        ]
+
     # computed fields
 
     @property
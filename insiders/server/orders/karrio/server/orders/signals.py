@@ -1,7 +1,7 @@
 import logging
 from django.db.models import signals
 
-from karrio.server.core import utils
+from karrio.server.core import utils, search
 from karrio.server.conf import settings
 from karrio.server.core.utils import failsafe
 from karrio.server.events.serializers import EventTypes
@@ -19,6 +19,7 @@ def register_signals():
     signals.post_save.connect(commodity_mutated, sender=manager.Commodity)
     signals.post_save.connect(shipment_updated, sender=manager.Shipment)
     signals.post_save.connect(order_updated, sender=models.Order)
+    signals.post_save.connect(search_document_updated, sender=models.Order)
 
     logger.info("karrio.order signals registered...")
 
@@ -129,3 +130,16 @@ def order_updated(sender, instance, *args, **kwargs):
         return
 
     tasks.notify_webhooks(event, data, event_at, context, schema=settings.schema)
+
+
+@utils.disable_for_loaddata
+def search_document_updated(
+    sender, instance, created, raw, using, update_fields, *args, **kwargs
+):
+    """Refresh the order search document on searchable changes."""
+    changes = update_fields or []
+
+    if any(changes) and not any([change in sender.SEARCH_PROPS for change in changes]):
+        return
+
+    search.update_search_document(instance)
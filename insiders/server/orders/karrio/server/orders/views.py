@@ -1,6 +1,5 @@
 import logging
 
-from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.response import Response
 from rest_framework.request import Request
 from rest_framework import status
@@ -10,6 +9,7 @@ from drf_yasg.utils import swagger_auto_schema
 from django_filters import rest_framework as filters
 
 from karrio.server.core.views.api import GenericAPIView, APIView
+from karrio.server.core.pagination import LimitOffsetPagination
 from karrio.server.serializers import (
     SerializerDecorator,
     PaginatedResult,
@@ -59,8 +59,8 @@ class OrderList(GenericAPIView):
         Retrieve all orders.
         """
         orders = self.filter_queryset(self.get_queryset())
-        response = self.paginate_queryset(Order(orders, many=True).data)
-        return self.get_paginated_response(response)
+        response = self.paginate_queryset(orders)
+        return self.get_paginated_response(Order(response, many=True).data)
 
     @swagger_auto_schema(
         tags=["Orders"],
@@ -4,6 +4,7 @@ from django.contrib.auth import get_user_model
 
 from karrio.server.conf import settings
 import karrio.server.core.utils as utils
+import karrio.server.core.signals as core_signals
 import karrio.server.events.tasks as tasks
 import karrio.server.orgs.models as models
 
@@ -14,6 +15,11 @@ def register_all():
     signals.post_save.connect(user_updated, sender=get_user_model())
     signals.post_delete.connect(owner_deleted, sender=models.OrganizationOwner)
 
+    # the organizations and their users define the authentication contexts
+    for sender in [models.Organization, models.OrganizationUser, models.TokenLink]:
+        signals.post_save.connect(auth_context_updated, sender=sender)
+        signals.post_delete.connect(auth_context_updated, sender=sender)
+
     logger.info("karrio.orgs signals registered...")
 
 
@@ -67,3 +73,7 @@ def user_updated(sender, instance, *args, **kwargs):
 @utils.disable_for_loaddata
 def owner_deleted(sender, instance, **kwargs):
     tasks.cleanup_orgs(schema=settings.schema)
+
+
+def auth_context_updated(sender, *args, **kwargs):
+    core_signals.invalidate_auth_cache()
@@ -11,7 +11,7 @@ from karrio.core import Settings
 from karrio.core.utils import DP, Tracer
 from karrio.core.models import Message
 from karrio.core.errors import ShippingSDKError
-from karrio.references import import_extensions, detect_capabilities
+from karrio.references import import_extension, import_extensions, detect_capabilities
 
 logger = logging.getLogger(__name__)
 
@@ -110,7 +110,7 @@ class GatewayInitializer:
         """
 
         try:
-            provider = self.providers[key]
+            provider = import_extension(key)
 
             def initializer(
                 settings: Union[Settings, dict], tracer: Tracer = None
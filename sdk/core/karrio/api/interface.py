@@ -1,9 +1,12 @@
 """The Fluent API Abstraction and interfaces definitions."""
 
 import attr
+import time
 import typing
+import asyncio
 import logging
 import functools
+import concurrent.futures as futures
 import karrio.lib as lib
 import karrio.core.errors as errors
 import karrio.core.models as models
@@ -13,15 +16,16 @@ logger = logging.getLogger(__name__)
 
 T = typing.TypeVar("T")
 S = typing.TypeVar("S")
+POLL_INTERVAL = 0.05
 
 
 def abort(
-    error: errors.ShippingSDKDetailedError, gateway: gateway.Gateway
+    error: errors.ShippingSDKError, gateway: gateway.Gateway
 ) -> typing.Tuple[None, typing.List[models.Message]]:
     """Process aborting helper
 
     Args:
-        error (errors.ShippingSDKDetailedError): the karrioror raised during the process
+        error (errors.ShippingSDKError): the karrioror raised during the process
         gateway (gateway.Gateway): the gateway in use during on process
 
     Returns:
@@ -72,6 +76,33 @@ def fail_safe(gateway: gateway.Gateway):
     return catcher
 
 
+def fail_safe_async(gateway: gateway.Gateway):
+    """Decorate async operation and requests calls to enrich any failure context
+
+    Args:
+        gateway (gateway.Gateway): The gateway in use
+
+    Returns:
+        Decorator
+    """
+
+    def catcher(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await func(*args, **kwargs)
+            except Exception as error:
+                logger.exception(error)
+
+                return IDeserialize(
+                    functools.partial(abort, gateway=gateway, error=error)
+                )
+
+        return wrapper
+
+    return catcher
+
+
 def check_operation(gateway: gateway.Gateway, request: str, **kwargs):
     errors = gateway.check(request, **kwargs)
 
@@ -100,22 +131,299 @@ class IRequestFrom:
     """A lazy request (from) type class"""
 
     action: typing.Callable[[gateway.Gateway], IDeserialize]
+    async_action: typing.Optional[
+        typing.Callable[[gateway.Gateway], typing.Awaitable[IDeserialize]]
+    ] = None
 
     def from_(self, gateway: gateway.Gateway) -> IDeserialize:
         """Execute the request action from the provided gateway"""
         return fail_safe(gateway)(self.action)(gateway)
 
+    async def from_async(self, gateway: gateway.Gateway) -> IDeserialize:
+        """Execute the request action from the provided gateway without blocking"""
+        if self.async_action is None:
+            return await asyncio.get_running_loop().run_in_executor(
+                None, self.from_, gateway
+            )
+
+        return await fail_safe_async(gateway)(self.async_action)(gateway)
+
 
 @attr.s(auto_attribs=True)
 class IRequestFromMany:
     """A lazy request (from one or many) type class"""
 
     action: typing.Callable[[typing.List[gateway.Gateway]], IDeserialize]
+    async_action: typing.Optional[
+        typing.Callable[[typing.List[gateway.Gateway]], typing.Awaitable[IDeserialize]]
+    ] = None
+
+    stream_action: typing.Optional[
+        typing.Callable[[typing.List[gateway.Gateway]], typing.Iterator[IDeserialize]]
+    ] = None
+    stream_async_action: typing.Optional[
+        typing.Callable[
+            [typing.List[gateway.Gateway]], typing.AsyncIterator[IDeserialize]
+        ]
+    ] = None
 
     def from_(self, *gateways: gateway.Gateway) -> IDeserialize:
         """Execute the request action(s) from the provided gateway(s)"""
         return self.action(list(gateways))
 
+    async def from_async(self, *gateways: gateway.Gateway) -> IDeserialize:
+        """Execute the request action(s) concurrently on the running event loop"""
+        if self.async_action is None:
+            return await asyncio.get_running_loop().run_in_executor(
+                None, self.action, list(gateways)
+            )
+
+        return await self.async_action(list(gateways))
+
+    def stream(self, *gateways: gateway.Gateway) -> typing.Iterator[IDeserialize]:
+        """Execute the request action(s) yielding each gateway response as it completes"""
+        if self.stream_action is None:
+            yield self.from_(*gateways)
+            return
+
+        yield from self.stream_action(list(gateways))
+
+    async def stream_async(
+        self, *gateways: gateway.Gateway
+    ) -> typing.AsyncIterator[IDeserialize]:
+        """Execute the request action(s) on the running event loop yielding
+        each gateway response as it completes"""
+        if self.stream_async_action is None:
+            yield await self.from_async(*gateways)
+            return
+
+        async for response in self.stream_async_action(list(gateways)):
+            yield response
+
+
+def operation(
+    payload: typing.Any,
+    request: str,
+    create_request: str,
+    parse_response: str,
+    **check_kwargs,
+) -> typing.Tuple[
+    typing.Callable[[gateway.Gateway], IDeserialize],
+    typing.Callable[[gateway.Gateway], typing.Awaitable[IDeserialize]],
+]:
+    """Build the sync and async actions of a gateway operation
+
+    Args:
+        payload (Any): the unified request payload
+        request (str): the operation (proxy method) name. e.g: "get_rates"
+        create_request (str): the mapper request creation method name
+        parse_response (str): the mapper response parsing method name
+
+    Returns:
+        Tuple: the (action, async_action) pair
+    """
+
+    def prepare(gateway: gateway.Gateway):
+        is_valid, abortion = check_operation(gateway, request, **check_kwargs)
+        if not is_valid:
+            return abortion, None
+
+        return None, getattr(gateway.mapper, create_request)(payload)
+
+    def deserializer(gateway: gateway.Gateway, response: lib.Deserializable):
+        @fail_safe(gateway)
+        def deserialize():
+            return getattr(gateway.mapper, parse_response)(response)
+
+        return IDeserialize(deserialize)
+
+    def action(gateway: gateway.Gateway) -> IDeserialize:
+        abortion, _request = prepare(gateway)
+        if abortion is not None:
+            return abortion
+
+        response: lib.Deserializable = getattr(gateway.proxy, request)(_request)
+
+        return deserializer(gateway, response)
+
+    async def async_action(gateway: gateway.Gateway) -> IDeserialize:
+        abortion, _request = prepare(gateway)
+        if abortion is not None:
+            return abortion
+
+        send_async = getattr(gateway.proxy, f"{request}_async")
+        response: lib.Deserializable = await send_async(_request)
+
+        return deserializer(gateway, response)
+
+    return action, async_action
+
+
+def timed_out(gateway: gateway.Gateway, timeout: float) -> IDeserialize:
+    return IDeserialize(
+        functools.partial(  # type: ignore
+            abort, gateway=gateway, error=errors.RequestTimeoutError(timeout)
+        )
+    )
+
+
+def carrier_timeout(
+    gateway: gateway.Gateway,
+    timeout: float = None,
+    carrier_timeouts: typing.Dict[str, float] = None,
+) -> typing.Optional[float]:
+    """Return the timeout of a gateway, looked up by carrier_id then carrier_name"""
+    timeouts = carrier_timeouts or {}
+
+    return timeouts.get(
+        gateway.settings.carrier_id,
+        timeouts.get(gateway.settings.carrier_name, timeout),
+    )
+
+
+def fan_out(
+    action: typing.Callable[[gateway.Gateway], IDeserialize],
+    gateways: typing.List[gateway.Gateway],
+    deadline: float = None,
+    timeout: float = None,
+    carrier_timeouts: typing.Dict[str, float] = None,
+    max_concurrency: int = None,
+) -> typing.Iterator[typing.Tuple[int, IDeserialize]]:
+    """Run an operation on many gateways yielding (index, response) as they complete
+
+    Gateways that miss the global deadline (or their own timeout) are not awaited,
+    a timeout abortion is yielded for them instead.
+
+    Args:
+        action (Callable): the gateway operation
+        gateways (List[Gateway]): the gateways to run the operation on
+        deadline (float): the max seconds to wait for all the gateways
+        timeout (float): the max seconds to wait for each gateway
+        carrier_timeouts (Dict[str, float]): timeouts by carrier_id or carrier_name
+        max_concurrency (int): the max number of gateways called at once
+    """
+    if len(gateways) == 0:
+        return
+
+    started_at: typing.Dict[int, float] = {}
+    expires_at = None if deadline is None else time.monotonic() + deadline
+    timeouts = [carrier_timeout(g, timeout, carrier_timeouts) for g in gateways]
+
+    def run(index: int, gateway: gateway.Gateway) -> IDeserialize:
+        started_at[index] = time.monotonic()
+        return fail_safe(gateway)(action)(gateway)
+
+    def expiry(index: int) -> typing.Optional[float]:
+        expiries = [
+            expires_at,
+            (
+                started_at[index] + timeouts[index]
+                if index in started_at and timeouts[index] is not None
+                else None
+            ),
+        ]
+
+        return min((e for e in expiries if e is not None), default=None)
+
+    executor = futures.ThreadPoolExecutor(max_workers=max_concurrency or len(gateways))
+    indexes = {executor.submit(run, i, g): i for i, g in enumerate(gateways)}
+    pending = set(indexes.keys())
+
+    def expired(future: futures.Future, now: float) -> bool:
+        _expiry = expiry(indexes[future])
+        return _expiry is not None and _expiry <= now
+
+    try:
+        while len(pending) > 0:
+            waits = [
+                # queued gateways timeouts only start once they are running
+                POLL_INTERVAL
+                if index not in started_at and timeouts[index] is not None
+                else expiry(index) - time.monotonic()
+                for index in (indexes[f] for f in pending)
+                if expiry(index) is not None or timeouts[index] is not None
+            ]
+            wait = max(min(waits), 0) if len(waits) > 0 else None
+            done, pending = futures.wait(
+                pending, timeout=wait, return_when=futures.FIRST_COMPLETED
+            )
+
+            for future in done:
+                yield indexes[future], future.result()
+
+            now = time.monotonic()
+            for future in [f for f in pending if expired(f, now)]:
+                index = indexes[future]
+                pending.discard(future)
+                future.cancel()
+                yield index, timed_out(
+                    gateways[index],
+                    (
+                        deadline
+                        if expires_at is not None and now >= expires_at
+                        else timeouts[index]
+                    ),
+                )
+    finally:
+        for future in pending:
+            future.cancel()
+
+        executor.shutdown(wait=False)
+
+
+async def fan_out_async(
+    action: typing.Callable[[gateway.Gateway], typing.Awaitable[IDeserialize]],
+    gateways: typing.List[gateway.Gateway],
+    deadline: float = None,
+    timeout: float = None,
+    carrier_timeouts: typing.Dict[str, float] = None,
+    max_concurrency: int = None,
+) -> typing.AsyncIterator[typing.Tuple[int, IDeserialize]]:
+    """Run an async operation on many gateways yielding (index, response) as they complete
+
+    The async counterpart of `fan_out` (same arguments).
+    """
+    if len(gateways) == 0:
+        return
+
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(max_concurrency or len(gateways))
+    expires_at = None if deadline is None else loop.time() + deadline
+
+    async def run(gateway: gateway.Gateway) -> IDeserialize:
+        _timeout = carrier_timeout(gateway, timeout, carrier_timeouts)
+
+        async with semaphore:
+            try:
+                return await asyncio.wait_for(
+                    fail_safe_async(gateway)(action)(gateway), _timeout
+                )
+            except asyncio.TimeoutError:
+                return timed_out(gateway, _timeout)
+
+    indexes = {asyncio.ensure_future(run(g)): i for i, g in enumerate(gateways)}
+    pending = set(indexes.keys())
+
+    try:
+        while len(pending) > 0:
+            wait = None if expires_at is None else max(expires_at - loop.time(), 0)
+            done, pending = await asyncio.wait(
+                pending, timeout=wait, return_when=asyncio.FIRST_COMPLETED
+            )
+
+            for task in done:
+                yield indexes[task], task.result()
+
+            if expires_at is not None and loop.time() >= expires_at:
+                for task in pending:
+                    task.cancel()
+                    yield indexes[task], timed_out(gateways[indexes[task]], deadline)
+
+                pending = set()
+    finally:
+        for task in pending:
+            task.cancel()
+
 
 class Address:
     """The unified Address API fluent interface"""
@@ -135,23 +443,14 @@ class Address:
         logger.debug(f"validate an address. payload: {lib.to_json(args)}")
         payload = lib.to_object(models.AddressValidationRequest, lib.to_dict(args))
 
-        def action(gateway: gateway.Gateway) -> IDeserialize:
-            is_valid, abortion = check_operation(gateway, "validate_address")
-            if not is_valid:
-                return abortion
-
-            request: lib.Serializable = (
-                gateway.mapper.create_address_validation_request(payload)
+        return IRequestFrom(
+            *operation(
+                payload,
+                "validate_address",
+                "create_address_validation_request",
+                "parse_address_validation_response",
             )
-            response: lib.Deserializable = gateway.proxy.validate_address(request)
-
-            @fail_safe(gateway)
-            def deserialize():
-                return gateway.mapper.parse_address_validation_response(response)
-
-            return IDeserialize(deserialize)
-
-        return IRequestFrom(action)
+        )
 
 
 class Pickup:
@@ -170,21 +469,14 @@ class Pickup:
         logger.debug(f"book a pickup. payload: {lib.to_json(args)}")
         payload = lib.to_object(models.PickupRequest, lib.to_dict(args))
 
-        def action(gateway: gateway.Gateway):
-            is_valid, abortion = check_operation(gateway, "schedule_pickup")
-            if not is_valid:
-                return abortion
-
-            request: lib.Serializable = gateway.mapper.create_pickup_request(payload)
-            response: lib.Deserializable = gateway.proxy.schedule_pickup(request)
-
-            @fail_safe(gateway)
-            def deserialize():
-                return gateway.mapper.parse_pickup_response(response)
-
-            return IDeserialize(deserialize)
-
-        return IRequestFrom(action)
+        return IRequestFrom(
+            *operation(
+                payload,
+                "schedule_pickup",
+                "create_pickup_request",
+                "parse_pickup_response",
+            )
+        )
 
     @staticmethod
     def cancel(args: typing.Union[models.PickupCancelRequest, dict]) -> IRequestFrom:
@@ -199,23 +491,14 @@ class Pickup:
         logger.debug(f"cancel a pickup. payload: {lib.to_json(args)}")
         payload = lib.to_object(models.PickupCancelRequest, lib.to_dict(args))
 
-        def action(gateway: gateway.Gateway):
-            is_valid, abortion = check_operation(gateway, "cancel_pickup")
-            if not is_valid:
-                return abortion
-
-            request: lib.Serializable = gateway.mapper.create_cancel_pickup_request(
-                payload
+        return IRequestFrom(
+            *operation(
+                payload,
+                "cancel_pickup",
+                "create_cancel_pickup_request",
+                "parse_cancel_pickup_response",
             )
-            response: lib.Deserializable = gateway.proxy.cancel_pickup(request)
-
-            @fail_safe(gateway)
-            def deserialize():
-                return gateway.mapper.parse_cancel_pickup_response(response)
-
-            return IDeserialize(deserialize)
-
-        return IRequestFrom(action)
+        )
 
     @staticmethod
     def update(args: typing.Union[models.PickupUpdateRequest, dict]):
@@ -230,73 +513,92 @@ class Pickup:
         logger.debug(f"update a pickup. payload: {lib.to_json(args)}")
         payload = lib.to_object(models.PickupUpdateRequest, lib.to_dict(args))
 
-        def action(gateway: gateway.Gateway):
-            is_valid, abortion = check_operation(gateway, "modify_pickup")
-            if not is_valid:
-                return abortion
-
-            request: lib.Serializable = gateway.mapper.create_pickup_update_request(
-                payload
+        return IRequestFrom(
+            *operation(
+                payload,
+                "modify_pickup",
+                "create_pickup_update_request",
+                "parse_pickup_update_response",
             )
-            response: lib.Deserializable = gateway.proxy.modify_pickup(request)
-
-            @fail_safe(gateway)
-            def deserialize():
-                return gateway.mapper.parse_pickup_update_response(response)
-
-            return IDeserialize(deserialize)
-
-        return IRequestFrom(action)
+        )
 
 
 class Rating:
     """The unified Rating API fluent interface"""
 
     @staticmethod
-    def fetch(args: typing.Union[models.RateRequest, dict]) -> IRequestFromMany:
+    def fetch(
+        args: typing.Union[models.RateRequest, dict],
+        deadline: float = None,
+        timeout: float = None,
+        carrier_timeouts: typing.Dict[str, float] = None,
+        max_concurrency: int = None,
+    ) -> IRequestFromMany:
         """Fetch shipment rates from one or many carriers
 
         Args:
             args (Union[TrackingRequest, dict]): the rate fetching request payload
+            deadline (float): the max seconds to wait for all the carriers.
+                The rates returned in time are kept and a timeout message is added
+                for every carrier that missed the deadline.
+            timeout (float): the max seconds to wait for each carrier
+            carrier_timeouts (Dict[str, float]): timeouts by carrier_id or carrier_name
+            max_concurrency (int): the max number of carriers requested at once
 
         Returns:
             IRequestFromMany: a lazy request dataclass instance
         """
         logger.debug(f"fetch shipment rates. payload: {lib.to_json(args)}")
         payload = lib.to_object(models.RateRequest, lib.to_dict(args))
+        options: typing.Dict[str, typing.Any] = dict(
+            deadline=deadline,
+            timeout=timeout,
+            carrier_timeouts=carrier_timeouts,
+            max_concurrency=max_concurrency,
+        )
+
+        process, process_async = operation(
+            payload,
+            "get_rates",
+            "create_rate_request",
+            "parse_rate_response",
+            origin_country_code=payload.shipper.country_code,
+        )
+
+        def flatten(deserializable_collection: typing.List[IDeserialize]):
+            responses = [p.parse() for p in deserializable_collection]
+            flattened_rates: typing.List[models.RateDetails] = sum(
+                (r for r, _ in responses if r is not None), []
+            )
+            messages: typing.List[models.Message] = sum((m for _, m in responses), [])
+            return flattened_rates, messages
 
-        def action(gateways: typing.List[gateway.Gateway]):
-            def process(gateway: gateway.Gateway):
-                is_valid, abortion = check_operation(
-                    gateway,
-                    "get_rates",
-                    origin_country_code=payload.shipper.country_code,
-                )
-                if not is_valid:
-                    return abortion
-
-                request: lib.Serializable = gateway.mapper.create_rate_request(payload)
-                response: lib.Deserializable = gateway.proxy.get_rates(request)
+        def stream(gateways: typing.List[gateway.Gateway]):
+            for _, response in fan_out(process, gateways, **options):
+                yield response
 
-                @fail_safe(gateway)
-                def deserialize():
-                    return gateway.mapper.parse_rate_response(response)
+        async def stream_async(gateways: typing.List[gateway.Gateway]):
+            async for _, response in fan_out_async(process_async, gateways, **options):
+                yield response
 
-                return IDeserialize(deserialize)
+        def action(gateways: typing.List[gateway.Gateway]):
+            responses = dict(fan_out(process, gateways, **options))
+            deserializable_collection = [responses[i] for i in sorted(responses)]
 
-            deserializable_collection: typing.List[
-                IDeserialize
-            ] = lib.run_asynchronously(lambda g: fail_safe(g)(process)(g), gateways)
+            return IDeserialize(functools.partial(flatten, deserializable_collection))
 
-            def flatten(*args):
-                responses = [p.parse() for p in deserializable_collection]
-                flattened_rates = sum((r for r, _ in responses if r is not None), [])
-                messages = sum((m for _, m in responses), [])
-                return flattened_rates, messages
+        async def async_action(gateways: typing.List[gateway.Gateway]):
+            responses = {
+                index: response
+                async for index, response in fan_out_async(
+                    process_async, gateways, **options
+                )
+            }
+            deserializable_collection = [responses[i] for i in sorted(responses)]
 
-            return IDeserialize(flatten)
+            return IDeserialize(functools.partial(flatten, deserializable_collection))
 
-        return IRequestFromMany(action)
+        return IRequestFromMany(action, async_action, stream, stream_async)
 
 
 class Shipment:
@@ -316,25 +618,15 @@ class Shipment:
         logger.debug(f"create a shipment. payload: {lib.to_json(args)}")
         payload = lib.to_object(models.ShipmentRequest, lib.to_dict(args))
 
-        def action(gateway: gateway.Gateway):
-            is_valid, abortion = check_operation(
-                gateway,
+        return IRequestFrom(
+            *operation(
+                payload,
                 "create_shipment",
+                "create_shipment_request",
+                "parse_shipment_response",
                 origin_country_code=payload.shipper.country_code,
             )
-            if not is_valid:
-                return abortion
-
-            request: lib.Serializable = gateway.mapper.create_shipment_request(payload)
-            response: lib.Deserializable = gateway.proxy.create_shipment(request)
-
-            @fail_safe(gateway)
-            def deserialize():
-                return gateway.mapper.parse_shipment_response(response)
-
-            return IDeserialize(deserialize)
-
-        return IRequestFrom(action)
+        )
 
     @staticmethod
     def cancel(args: typing.Union[models.ShipmentCancelRequest, dict]) -> IRequestFrom:
@@ -349,23 +641,14 @@ class Shipment:
         logger.debug(f"void a shipment. payload: {lib.to_json(args)}")
         payload = lib.to_object(models.ShipmentCancelRequest, lib.to_dict(args))
 
-        def action(gateway: gateway.Gateway):
-            is_valid, abortion = check_operation(gateway, "cancel_shipment")
-            if not is_valid:
-                return abortion
-
-            request: lib.Serializable = gateway.mapper.create_cancel_shipment_request(
-                payload
+        return IRequestFrom(
+            *operation(
+                payload,
+                "cancel_shipment",
+                "create_cancel_shipment_request",
+                "parse_cancel_shipment_response",
             )
-            response: lib.Deserializable = gateway.proxy.cancel_shipment(request)
-
-            @fail_safe(gateway)
-            def deserialize():
-                return gateway.mapper.parse_cancel_shipment_response(response)
-
-            return IDeserialize(deserialize)
-
-        return IRequestFrom(action)
+        )
 
 
 class Tracking:
@@ -384,21 +667,14 @@ class Tracking:
         logger.debug(f"track a shipment. payload: {lib.to_json(args)}")
         payload = lib.to_object(models.TrackingRequest, lib.to_dict(args))
 
-        def action(gateway: gateway.Gateway) -> IDeserialize:
-            is_valid, abortion = check_operation(gateway, "get_tracking")
-            if not is_valid:
-                return abortion
-
-            request: lib.Serializable = gateway.mapper.create_tracking_request(payload)
-            response: lib.Deserializable = gateway.proxy.get_tracking(request)
-
-            @fail_safe(gateway)
-            def deserialize():
-                return gateway.mapper.parse_tracking_response(response)
-
-            return IDeserialize(deserialize)
-
-        return IRequestFrom(action)
+        return IRequestFrom(
+            *operation(
+                payload,
+                "get_tracking",
+                "create_tracking_request",
+                "parse_tracking_response",
+            )
+        )
 
 
 class Document:
@@ -418,23 +694,11 @@ class Document:
         logger.debug(f"upload a document. payload: {lib.to_json(args)}")
         payload = lib.to_object(models.DocumentUploadRequest, lib.to_dict(args))
 
-        def action(gateway: gateway.Gateway):
-            is_valid, abortion = check_operation(
-                gateway,
+        return IRequestFrom(
+            *operation(
+                payload,
                 "upload_document",
+                "create_document_upload_request",
+                "parse_document_upload_response",
             )
-            if not is_valid:
-                return abortion
-
-            request: lib.Serializable = gateway.mapper.create_document_upload_request(
-                payload
-            )
-            response: lib.Deserializable = gateway.proxy.upload_document(request)
-
-            @fail_safe(gateway)
-            def deserialize():
-                return gateway.mapper.parse_document_upload_response(response)
-
-            return IDeserialize(deserialize)
-
-        return IRequestFrom(action)
+        )
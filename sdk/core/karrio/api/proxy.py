@@ -2,6 +2,7 @@
 
 import abc
 import attr
+import asyncio
 import functools
 import karrio.lib as lib
 import karrio.core.errors as errors
@@ -166,3 +167,64 @@ class Proxy(abc.ABC):
         raise errors.MethodNotSupportedError(
             self.__class__.upload_document.__name__, self.settings.carrier_name
         )
+
+    async def run_async(self, method, request: lib.Serializable) -> lib.Deserializable:
+        """Run a blocking proxy method on the running event loop default executor.
+
+        This is the fallback of every ``*_async`` proxy method. Carrier integrations
+        can override those with native non-blocking calls using ``lib.request_async``
+        (e.g. the canadapost rating and tracking).
+        """
+        return await asyncio.get_running_loop().run_in_executor(
+            None, functools.partial(method, request)
+        )
+
+    async def get_rates_async(self, request: lib.Serializable) -> lib.Deserializable:
+        """Non-blocking variant of get_rates"""
+        return await self.run_async(self.get_rates, request)
+
+    async def get_tracking_async(self, request: lib.Serializable) -> lib.Deserializable:
+        """Non-blocking variant of get_tracking"""
+        return await self.run_async(self.get_tracking, request)
+
+    async def create_shipment_async(
+        self, request: lib.Serializable
+    ) -> lib.Deserializable:
+        """Non-blocking variant of create_shipment"""
+        return await self.run_async(self.create_shipment, request)
+
+    async def cancel_shipment_async(
+        self, request: lib.Serializable
+    ) -> lib.Deserializable:
+        """Non-blocking variant of cancel_shipment"""
+        return await self.run_async(self.cancel_shipment, request)
+
+    async def schedule_pickup_async(
+        self, request: lib.Serializable
+    ) -> lib.Deserializable:
+        """Non-blocking variant of schedule_pickup"""
+        return await self.run_async(self.schedule_pickup, request)
+
+    async def modify_pickup_async(
+        self, request: lib.Serializable
+    ) -> lib.Deserializable:
+        """Non-blocking variant of modify_pickup"""
+        return await self.run_async(self.modify_pickup, request)
+
+    async def cancel_pickup_async(
+        self, request: lib.Serializable
+    ) -> lib.Deserializable:
+        """Non-blocking variant of cancel_pickup"""
+        return await self.run_async(self.cancel_pickup, request)
+
+    async def validate_address_async(
+        self, request: lib.Serializable
+    ) -> lib.Deserializable:
+        """Non-blocking variant of validate_address"""
+        return await self.run_async(self.validate_address, request)
+
+    async def upload_document_async(
+        self, request: lib.Serializable
+    ) -> lib.Deserializable:
+        """Non-blocking variant of upload_document"""
+        return await self.run_async(self.upload_document, request)
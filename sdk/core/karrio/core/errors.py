@@ -75,6 +75,15 @@ class DestinationNotServicedError(ShippingSDKError):
         super().__init__(f"Destination address '{origin}' is not serviced")
 
 
+class RequestTimeoutError(ShippingSDKError):
+    """Raised when a carrier does not respond within the allowed time."""
+
+    code = "SHIPPING_SDK_TIMEOUT_ERROR"
+
+    def __init__(self, timeout: float):
+        super().__init__(f"The carrier did not respond within {timeout} seconds")
+
+
 class MultiParcelNotSupportedError(ShippingSDKError):
     """Raised when an origin is not supported by a shipping provider."""
 
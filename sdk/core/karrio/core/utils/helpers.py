@@ -1,23 +1,27 @@
 import io
 import re
 import ssl
+import shutil
+import tempfile
 import asyncio
 import logging
 import base64
 import uuid
 import urllib.parse
-from PIL import Image, ImageFile
-from PyPDF2 import PdfMerger
-from urllib.request import urlopen, Request
+from PIL import Image, ImageFile, TiffImagePlugin
+from PyPDF2 import PdfMerger, PdfWriter
+from urllib.request import Request
 from urllib.error import HTTPError
-from typing import List, TypeVar, Callable, Optional, Any, cast
+from typing import List, TypeVar, Callable, Optional, Any, Iterable, IO, Union, cast
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from karrio.core.utils import transport
 
 logger = logging.getLogger(__name__)
 ssl._create_default_https_context = ssl._create_unverified_context
 ImageFile.LOAD_TRUNCATED_IMAGES = True
 T = TypeVar("T")
 S = TypeVar("S")
+DocumentSource = Union[str, bytes, IO[bytes]]
 NEW_LINE = '''
 '''
 
@@ -43,6 +47,134 @@ def image_to_pdf(image_str: str) -> str:
     return base64.b64encode(new_buffer.getvalue()).decode("utf-8")
 
 
+def open_document(source: DocumentSource) -> IO[bytes]:
+    """Return a readable binary stream of a document source.
+
+    A source is a base64 encoded string, the raw document bytes or an
+    already open binary file (e.g. a stored label file).
+    """
+    if isinstance(source, str):
+        return io.BytesIO(base64.b64decode(source))
+    if isinstance(source, (bytes, bytearray)):
+        return io.BytesIO(source)
+
+    return source
+
+
+def write_pdfs(sources: Iterable[DocumentSource], sink: IO[bytes]) -> IO[bytes]:
+    """Write the pages of the PDF (or image) sources to the sink as a single PDF.
+
+    The sources are read one at a time (image sources are converted to a PDF
+    page each) but the copied pages are kept in the writer until the whole
+    document is written to the sink.
+    """
+    writer = PdfWriter()
+
+    for source in sources:
+        writer.append(to_pdf_document(open_document(source)), import_outline=False)
+
+    writer.write(sink)
+
+    return sink
+
+
+def to_pdf_document(document: IO[bytes]) -> IO[bytes]:
+    """Return the document itself if it is a PDF or a single page PDF of the image."""
+    head = document.read(5)
+    document.seek(0)
+
+    if head == b"%PDF-":
+        return document
+
+    buffer = io.BytesIO()
+    with Image.open(document) as image:
+        image.convert("RGB").save(buffer, format="PDF")
+
+    return buffer
+
+
+def write_imgs(
+    sources: Iterable[DocumentSource], sink: IO[bytes], format: str = "PNG"
+) -> IO[bytes]:
+    """Write the image sources to the sink.
+
+    TIFF bundles are written one page per image, decoding one image at a time
+    (see `write_tiffs`). PNG and GIF have no pages: every source is opened
+    (only the image headers are read) to size a single canvas the height of
+    all the images combined, and each image is decoded while being pasted.
+    Large batches should rather be bundled as TIFF or PDF (paged) documents.
+    """
+    if format.upper() == "TIFF":
+        return write_tiffs(sources, sink)
+
+    images = [Image.open(open_document(source)) for source in sources]
+    widths, heights = zip(*(image.size for image in images))
+    canvas = Image.new("RGB", (max(widths), sum(heights)))
+    offset = 0
+
+    for image in images:
+        canvas.paste(image, (0, offset))
+        offset += image.size[1]
+        image.close()
+
+    canvas.save(sink, format)
+
+    return sink
+
+
+def write_tiffs(sources: Iterable[DocumentSource], sink: IO[bytes]) -> IO[bytes]:
+    """Write the image sources to the sink as a multi-page TIFF.
+
+    The pages are appended one at a time to a temporary file (TIFF pages are
+    linked by offsets) that is then copied to the sink.
+    """
+    with tempfile.TemporaryFile() as file:
+        with TiffImagePlugin.AppendingTiffWriter(file) as tiff:
+            for source in sources:
+                with Image.open(open_document(source)) as image:
+                    image.convert("RGB").save(tiff, format="TIFF")
+                tiff.newFrame()
+
+        file.seek(0)
+        shutil.copyfileobj(file, sink)
+
+    return sink
+
+
+def write_zpls(sources: Iterable[DocumentSource], sink: IO[bytes]) -> IO[bytes]:
+    """Copy the ZPL sources one after the other to the sink."""
+    for source in sources:
+        shutil.copyfileobj(open_document(source), sink)
+        sink.write(NEW_LINE.encode("utf-8"))
+
+    return sink
+
+
+def write_bundle(
+    sources: Iterable[DocumentSource], sink: IO[bytes], format: str = "PDF"
+) -> IO[bytes]:
+    """Write the documents bundle to a binary file-like sink.
+
+    e.g. `write_bundle(labels, response)` writes a merged PDF of labels.
+    PDF bundles also accept image sources (one page per image).
+    """
+    if format == "PDF":
+        return write_pdfs(sources, sink)
+
+    if "ZPL" in format:
+        return write_zpls(sources, sink)
+
+    return write_imgs(sources, sink, format)
+
+
+def bundle_bytes(sources: Iterable[DocumentSource], format: str = "PDF") -> bytes:
+    """Return the raw bytes of the documents bundle."""
+    buffer = io.BytesIO()
+    write_bundle(sources, buffer, format)
+
+    return buffer.getvalue()
+
+
 def bundle_pdfs(base64_strings: List[str]) -> PdfMerger:
     merger = PdfMerger(strict=False)
 
@@ -54,50 +186,27 @@ def bundle_pdfs(base64_strings: List[str]) -> PdfMerger:
 
 
 def bundle_imgs(base64_strings: List[str]) -> Image:
-    image_buffers = [
-        io.BytesIO(base64.b64decode(b64_str)) for b64_str in base64_strings
-    ]
-    images = [Image.open(buffer) for buffer in image_buffers]
+    images = [Image.open(to_buffer(b64_str)) for b64_str in base64_strings]
     widths, heights = zip(*(i.size for i in images))
 
-    max_width = max(widths)
-    total_height = sum(heights)
-
-    image = Image.new("RGB", (max_width, total_height))
+    image = Image.new("RGB", (max(widths), sum(heights)))
 
     x_offset = 0
     for im in images:
         image.paste(im, (0, x_offset))
         x_offset += im.size[1]
+        im.close()
 
     return image
 
 
 def bundle_zpls(base64_strings: List[str]) -> str:
-    doc = ''
-    for b64_str in base64_strings:
-        doc += f'{base64.b64decode(b64_str).decode("utf-8")}{NEW_LINE}'
-
-    return doc
+    return bundle_bytes(base64_strings, format="ZPL").decode("utf-8")
 
 
 def bundle_base64(base64_strings: List[str], format: str = "PDF") -> str:
     """Return a base64 string from a list of base64 strings."""
-    result = io.BytesIO()
-
-    if format == "PDF":
-        pdf_buffer = bundle_pdfs(base64_strings)
-        pdf_buffer.write(result)
-
-    elif "ZPL" in format:
-        content = bundle_zpls(base64_strings)
-        result.write(content.encode("utf-8"))
-
-    else:
-        image = bundle_imgs(base64_strings)
-        image.save(result, format)
-
-    return base64.b64encode(result.getvalue()).decode("utf-8")
+    return base64.b64encode(bundle_bytes(base64_strings, format)).decode("utf-8")
 
 
 def decode_bytes(byte):
@@ -178,11 +287,13 @@ def request(
     decoder: Callable = decode_bytes,
     on_error: Callable[[HTTPError], str] = None,
     trace: Callable[[Any, str], Any] = None,
+    timeout: float = None,
     **kwargs,
 ) -> str:
     """Return an HTTP response body.
 
     make a http request (wrapper around Request method from built in urllib)
+    sent through the configured (keep-alive pooled by default) transport.
     """
 
     _request_id = str(uuid.uuid4())
@@ -190,9 +301,34 @@ def request(
 
     try:
         _request = process_request(_request_id, trace, **kwargs)
+        f = transport.get_transport().send(_request, timeout=timeout)
+        _response = process_response(_request_id, f.read(), decoder, trace)
 
-        with urlopen(_request) as f:
-            _response = process_response(_request_id, f.read(), decoder, trace)
+    except HTTPError as e:
+        _response = process_error(_request_id, e, on_error, trace)
+
+    return _response
+
+
+async def request_async(
+    decoder: Callable = decode_bytes,
+    on_error: Callable[[HTTPError], str] = None,
+    trace: Callable[[Any, str], Any] = None,
+    timeout: float = None,
+    **kwargs,
+) -> str:
+    """Return an HTTP response body without blocking the running event loop.
+
+    make a http request through the configured asyncio (keep-alive pooled) transport.
+    """
+
+    _request_id = str(uuid.uuid4())
+    logger.debug(f"sending async request ({_request_id})...")
+
+    try:
+        _request = process_request(_request_id, trace, **kwargs)
+        f = await transport.get_async_transport().send(_request, timeout=timeout)
+        _response = process_response(_request_id, f.read(), decoder, trace)
 
     except HTTPError as e:
         _response = process_error(_request_id, e, on_error, trace)
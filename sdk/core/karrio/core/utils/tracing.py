@@ -3,9 +3,10 @@ import attr
 import time
 import typing
 import functools
-import concurrent.futures as futures
+import collections
 
 Trace = typing.Callable[[typing.Any, str], typing.Any]
+TRUNCATION_MARKER = "...[truncated]"
 
 
 @attr.s(auto_attribs=True)
@@ -15,34 +16,80 @@ class Record:
     timestamp: float
     metadata: dict = {}
 
+
+Sink = typing.Callable[[typing.List[Record]], typing.Any]
+
+
 class Tracer:
-    def __init__(self, id: str = None) -> None:
+    """In-memory recorder of the SDK requests and responses traces.
+
+    Records are appended to a thread-safe (optionally bounded) buffer so that
+    tracing never spawns threads on the request path.
+
+    :param id: the tracer identifier.
+    :param max_records: the buffer size cap (oldest records are dropped first).
+    :param max_payload_size: the max length of traced string values.
+    """
+
+    def __init__(
+        self,
+        id: str = None,
+        max_records: int = None,
+        max_payload_size: int = None,
+    ) -> None:
         self.id = id or str(uuid.uuid4())
+        self.max_payload_size = max_payload_size
         self.inner_context: typing.Dict[str, typing.Any] = {}
-        self.inner_recordings: typing.Dict[futures.Future, dict] = {}
+        self.inner_recordings: typing.Deque[Record] = collections.deque(
+            maxlen=max_records
+        )
 
     def trace(
         self, data: typing.Any, key: str, metadata: dict = {}, format: str = None
     ) -> typing.Any:
-        def _save():
-            return Record(
+        self.inner_recordings.append(
+            Record(
                 key=key,
-                data={"format": format, **data},
+                data={"format": format, **self._truncate(data)},
                 timestamp=time.time(),
                 metadata=metadata,
             )
-
-        promise = futures.ThreadPoolExecutor(max_workers=1)
-        self.inner_recordings.update({promise.submit(_save): data})
+        )
 
         return data
 
     def with_metadata(self, metadata: dict):
         return functools.partial(self.trace, metadata=metadata)
 
+    def flush(self, sink: Sink, batch_size: int = 100) -> int:
+        """Stream the recorded traces to a sink in batches and clear them.
+
+        :param sink: a callable receiving each batch of records.
+        :param batch_size: the max number of records per batch.
+        :return: the number of records flushed.
+        """
+        flushed = 0
+
+        while True:
+            batch: typing.List[Record] = []
+
+            while len(batch) < batch_size:
+                try:
+                    batch.append(self.inner_recordings.popleft())
+                except IndexError:
+                    break
+
+            if len(batch) == 0:
+                break
+
+            sink(batch)
+            flushed += len(batch)
+
+        return flushed
+
     @property
     def records(self) -> typing.List[Record]:
-        return [rec.result() for rec in futures.as_completed(self.inner_recordings)]
+        return list(self.inner_recordings)
 
     @property
     def context(self) -> typing.Dict[str, typing.Any]:
@@ -50,3 +97,16 @@ class Tracer:
 
     def add_context(self, data: typing.Dict[str, typing.Any]):
         self.inner_context.update(data)
+
+    def _truncate(self, data: typing.Any) -> typing.Any:
+        if self.max_payload_size is None or not isinstance(data, dict):
+            return data
+
+        return {
+            key: (
+                value[: self.max_payload_size] + TRUNCATION_MARKER
+                if isinstance(value, str) and len(value) > self.max_payload_size
+                else value
+            )
+            for key, value in data.items()
+        }
@@ -0,0 +1,607 @@
+"""Karrio HTTP transport layer.
+
+The transport is the component that actually sends the ``urllib`` requests
+built by ``karrio.core.utils.helpers.request``. The default transport keeps
+per-host pools of keep-alive connections so that consecutive calls to the same
+carrier API reuse the established TCP + TLS session instead of paying a new
+handshake for every rate, shipment or tracking request.
+
+Example:
+    >>> from karrio.core.utils import transport
+    >>> transport.configure(
+    ...     pool_size=20,
+    ...     host_limits={"apis.fedex.com": 5},
+    ...     connect_timeout=5,
+    ...     read_timeout=60,
+    ... )
+"""
+
+import io
+import abc
+import ssl
+import sys
+import queue
+import typing
+import logging
+import asyncio
+import functools
+import weakref
+import threading
+import http.client
+import email.parser
+import urllib.parse
+import urllib.request
+from urllib.error import HTTPError, URLError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_CONNECT_TIMEOUT = 10.0
+DEFAULT_READ_TIMEOUT = 60.0
+MAX_REDIRECTS = 5
+REDIRECT_CODES = (301, 302, 303, 307, 308)
+STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.BadStatusLine,
+    ConnectionResetError,
+    ConnectionAbortedError,
+    BrokenPipeError,
+)
+USER_AGENT = "Python-urllib/%s.%s" % sys.version_info[:2]
+HostKey = typing.Tuple[str, str, int]
+
+
+class Response:
+    """A fully read HTTP response returned by a transport."""
+
+    def __init__(self, url: str, status: int, headers: typing.Any, body: bytes):
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    def read(self) -> bytes:
+        return self.body
+
+
+class Transport(abc.ABC):
+    """Transport interface (send a urllib Request and return a Response)"""
+
+    @abc.abstractmethod
+    def send(self, request: urllib.request.Request, timeout: float = None) -> Response:
+        pass
+
+    def close(self):
+        pass
+
+
+class UrllibTransport(Transport):
+    """Transport opening a new connection per request with ``urlopen``."""
+
+    def send(self, request: urllib.request.Request, timeout: float = None) -> Response:
+        response = (
+            urllib.request.urlopen(request, timeout=timeout)
+            if timeout is not None
+            else urllib.request.urlopen(request)
+        )
+
+        with response as f:
+            return Response(f.geturl(), f.status, f.headers, f.read())
+
+
+class HostPool:
+    """A bounded LIFO pool of keep-alive connections to a single host."""
+
+    def __init__(
+        self,
+        key: HostKey,
+        maxsize: int,
+        connect_timeout: float,
+        read_timeout: float,
+        ssl_context: ssl.SSLContext = None,
+    ):
+        self.key = key
+        self.maxsize = maxsize
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.ssl_context = ssl_context
+        self.idle: "queue.LifoQueue[http.client.HTTPConnection]" = queue.LifoQueue()
+        self.slots = threading.BoundedSemaphore(maxsize)
+
+    def new_connection(self) -> http.client.HTTPConnection:
+        scheme, host, port = self.key
+
+        if scheme == "https":
+            return http.client.HTTPSConnection(
+                host,
+                port,
+                timeout=self.connect_timeout,
+                context=self.ssl_context or ssl._create_default_https_context(),
+            )
+
+        return http.client.HTTPConnection(host, port, timeout=self.connect_timeout)
+
+    def acquire(
+        self, timeout: float = None
+    ) -> typing.Tuple[http.client.HTTPConnection, bool]:
+        """Return an idle connection (reused=True) or a new one once a slot is free.
+
+        :raises URLError: when no slot is freed within `timeout` seconds.
+        """
+        if not self.slots.acquire(timeout=timeout):
+            scheme, host, port = self.key
+            raise URLError(f"no connection available to {scheme}://{host}:{port}")
+
+        try:
+            return self.idle.get_nowait(), True
+        except queue.Empty:
+            return self.new_connection(), False
+
+    def release(self, connection: http.client.HTTPConnection, reusable: bool = True):
+        if reusable:
+            self.idle.put(connection)
+        else:
+            connection.close()
+
+        self.slots.release()
+
+    def close(self):
+        while True:
+            try:
+                self.idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+class PooledTransport(Transport):
+    """Transport reusing keep-alive connections from per-host pools.
+
+    :param pool_size: the default max number of connections per host.
+    :param host_limits: per host max connections (e.g. {"ws.fedex.com": 4}).
+    :param connect_timeout: the socket connection timeout in seconds.
+    :param read_timeout: the socket read timeout in seconds.
+    :param ssl_context: an optional SSL context for HTTPS connections.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        host_limits: typing.Dict[str, int] = None,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: float = DEFAULT_READ_TIMEOUT,
+        ssl_context: ssl.SSLContext = None,
+    ):
+        self.pool_size = pool_size
+        self.host_limits = host_limits or {}
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.ssl_context = ssl_context
+        self.pools: typing.Dict[HostKey, HostPool] = {}
+        self.lock = threading.Lock()
+        self.fallback = UrllibTransport()
+
+    def pool_for(self, key: HostKey) -> HostPool:
+        with self.lock:
+            if key not in self.pools:
+                self.pools[key] = HostPool(
+                    key,
+                    maxsize=self.host_limits.get(key[1], self.pool_size),
+                    connect_timeout=self.connect_timeout,
+                    read_timeout=self.read_timeout,
+                    ssl_context=self.ssl_context,
+                )
+
+            return self.pools[key]
+
+    def send(self, request: urllib.request.Request, timeout: float = None) -> Response:
+        url = request.full_url
+
+        for _ in range(MAX_REDIRECTS + 1):
+            parsed = urllib.parse.urlsplit(url)
+
+            # proxied and non http(s) requests are left to urllib.
+            if parsed.scheme not in ("http", "https") or (
+                parsed.scheme in urllib.request.getproxies()
+            ):
+                return self.fallback.send(request, timeout=timeout)
+
+            response = self._send(parsed, request, timeout)
+            location = response.headers.get("Location")
+
+            if response.status not in REDIRECT_CODES or location is None:
+                break
+
+            url = urllib.parse.urljoin(url, location)
+            request = _redirected_request(request, url, response.status)
+        else:
+            raise _redirect_loop_error(response)
+
+        if response.status >= 400:
+            raise HTTPError(
+                response.url,
+                response.status,
+                http.client.responses.get(response.status, ""),
+                response.headers,
+                io.BytesIO(response.body),
+            )
+
+        return response
+
+    def _send(
+        self,
+        parsed: urllib.parse.SplitResult,
+        request: urllib.request.Request,
+        timeout: float = None,
+    ) -> Response:
+        port = parsed.port or (443 if parsed.scheme == "https" else 80)
+        pool = self.pool_for((parsed.scheme, parsed.hostname or "", port))
+        path = urllib.parse.urlunsplit(("", "", parsed.path or "/", parsed.query, ""))
+        headers = {"User-agent": USER_AGENT, **dict(request.header_items())}
+
+        if request.data is not None and not request.has_header("Content-type"):
+            headers.update({"Content-type": "application/x-www-form-urlencoded"})
+
+        # a reused connection may have been closed by the server, retry once.
+        for attempt in range(2):
+            connection, reused = pool.acquire(timeout or pool.read_timeout)
+            reusable = False
+
+            try:
+                if connection.sock is None:
+                    connection.connect()
+                connection.sock.settimeout(timeout or pool.read_timeout)
+                connection.request(
+                    request.get_method(), path, body=request.data, headers=headers
+                )
+                _response = connection.getresponse()
+                body = _response.read()
+                reusable = not _response.will_close
+
+                return Response(
+                    request.full_url, _response.status, _response.headers, body
+                )
+            except STALE_CONNECTION_ERRORS as e:
+                if reused and attempt == 0:
+                    logger.debug(f"stale connection to {parsed.netloc}, retrying...")
+                    continue
+                raise URLError(e) from e
+            except OSError as e:
+                raise URLError(e) from e
+            finally:
+                pool.release(connection, reusable)
+
+        raise URLError(f"unable to reach {parsed.netloc}")
+
+    def close(self):
+        with self.lock:
+            for pool in self.pools.values():
+                pool.close()
+            self.pools = {}
+
+
+def _redirected_request(
+    request: urllib.request.Request, url: str, status: int
+) -> urllib.request.Request:
+    if status in (307, 308):
+        return urllib.request.Request(
+            url,
+            data=request.data,
+            headers=dict(request.header_items()),
+            method=request.get_method(),
+        )
+
+    headers = {
+        key: value
+        for key, value in request.header_items()
+        if key.lower() not in ("content-length", "content-type")
+    }
+    return urllib.request.Request(url, headers=headers, method="GET")
+
+
+def _redirect_loop_error(response: Response) -> HTTPError:
+    """The error raised like urllib once MAX_REDIRECTS redirects are followed."""
+    return HTTPError(
+        response.url,
+        response.status,
+        "The HTTP server returned a redirect error that would lead to an "
+        "infinite loop.\nThe last 30x error message was:\n"
+        + http.client.responses.get(response.status, ""),
+        response.headers,
+        io.BytesIO(response.body),
+    )
+
+
+class AsyncTransport(abc.ABC):
+    """Non-blocking transport interface (used by ``request_async``)"""
+
+    @abc.abstractmethod
+    async def send(
+        self, request: urllib.request.Request, timeout: float = None
+    ) -> Response:
+        pass
+
+
+class AsyncPooledTransport(AsyncTransport):
+    """asyncio streams HTTP/1.1 client reusing keep-alive connections per host.
+
+    Connection pools are bound to the event loop they were created on.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        host_limits: typing.Dict[str, int] = None,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: float = DEFAULT_READ_TIMEOUT,
+        ssl_context: ssl.SSLContext = None,
+    ):
+        self.pool_size = pool_size
+        self.host_limits = host_limits or {}
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.ssl_context = ssl_context
+        self.loops: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def pool_for(self, key: HostKey) -> typing.Tuple[asyncio.Semaphore, list]:
+        pools = self.loops.setdefault(asyncio.get_running_loop(), {})
+
+        if key not in pools:
+            pools[key] = (
+                asyncio.Semaphore(self.host_limits.get(key[1], self.pool_size)),
+                [],
+            )
+
+        return pools[key]
+
+    async def send(
+        self, request: urllib.request.Request, timeout: float = None
+    ) -> Response:
+        url = request.full_url
+
+        for _ in range(MAX_REDIRECTS + 1):
+            parsed = urllib.parse.urlsplit(url)
+
+            # proxied and non http(s) requests are left to the blocking transport.
+            if parsed.scheme not in ("http", "https") or (
+                parsed.scheme in urllib.request.getproxies()
+            ):
+                return await asyncio.get_running_loop().run_in_executor(
+                    None, functools.partial(get_transport().send, request, timeout)
+                )
+
+            response = await self._send(parsed, request, timeout)
+            location = response.headers.get("Location")
+
+            if response.status not in REDIRECT_CODES or location is None:
+                break
+
+            url = urllib.parse.urljoin(url, location)
+            request = _redirected_request(request, url, response.status)
+        else:
+            raise _redirect_loop_error(response)
+
+        if response.status >= 400:
+            raise HTTPError(
+                response.url,
+                response.status,
+                http.client.responses.get(response.status, ""),
+                response.headers,
+                io.BytesIO(response.body),
+            )
+
+        return response
+
+    async def _send(
+        self,
+        parsed: urllib.parse.SplitResult,
+        request: urllib.request.Request,
+        timeout: float = None,
+    ) -> Response:
+        host = parsed.hostname or ""
+        port = parsed.port or (443 if parsed.scheme == "https" else 80)
+        slots, idle = self.pool_for((parsed.scheme, host, port))
+        method = request.get_method()
+        path = urllib.parse.urlunsplit(("", "", parsed.path or "/", parsed.query, ""))
+        message = _serialize_request(method, path, parsed.netloc, request)
+
+        async with slots:
+            # a reused connection may have been closed by the server, retry once.
+            for attempt in range(2):
+                reused = len(idle) > 0
+                reader, writer = (
+                    idle.pop()
+                    if reused
+                    else await self._open_connection(parsed.scheme, host, port)
+                )
+                reusable = False
+
+                try:
+                    writer.write(message)
+                    await writer.drain()
+                    status, headers, body, reusable = await asyncio.wait_for(
+                        _read_response(reader, method),
+                        timeout or self.read_timeout,
+                    )
+
+                    return Response(request.full_url, status, headers, body)
+                except (*STALE_CONNECTION_ERRORS, asyncio.IncompleteReadError) as e:
+                    if reused and attempt == 0:
+                        logger.debug(
+                            f"stale connection to {parsed.netloc}, retrying..."
+                        )
+                        continue
+                    raise URLError(e) from e
+                except (OSError, asyncio.TimeoutError) as e:
+                    raise URLError(e) from e
+                finally:
+                    if reusable:
+                        idle.append((reader, writer))
+                    else:
+                        await _close(writer)
+
+        raise URLError(f"unable to reach {parsed.netloc}")
+
+    async def _open_connection(
+        self, scheme: str, host: str, port: int
+    ) -> typing.Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        connection = (
+            asyncio.open_connection(
+                host,
+                port,
+                ssl=(self.ssl_context or ssl._create_default_https_context()),
+                server_hostname=host,
+            )
+            if scheme == "https"
+            else asyncio.open_connection(host, port)
+        )
+
+        try:
+            return await asyncio.wait_for(connection, self.connect_timeout)
+        except (OSError, asyncio.TimeoutError) as e:
+            raise URLError(e) from e
+
+
+async def _close(writer: asyncio.StreamWriter):
+    writer.close()
+
+    try:
+        await writer.wait_closed()
+    except (OSError, asyncio.TimeoutError):
+        pass
+
+
+def _serialize_request(
+    method: str, path: str, netloc: str, request: urllib.request.Request
+) -> bytes:
+    headers = {
+        "Host": netloc,
+        "User-agent": USER_AGENT,
+        "Accept-encoding": "identity",
+        **dict(request.header_items()),
+    }
+    if not isinstance(request.data, (bytes, bytearray, memoryview, type(None))):
+        raise TypeError("request_async only sends bytes-like request bodies")
+
+    body = bytes(request.data or b"")
+
+    if request.data is not None:
+        headers.update({"Content-length": str(len(body))})
+        if not request.has_header("Content-type"):
+            headers.update({"Content-type": "application/x-www-form-urlencoded"})
+
+    head = "".join(f"{key}: {value}\r\n" for key, value in headers.items())
+
+    return f"{method} {path} HTTP/1.1\r\n{head}\r\n".encode("latin-1") + body
+
+
+async def _read_response(
+    reader: asyncio.StreamReader, method: str
+) -> typing.Tuple[int, http.client.HTTPMessage, bytes, bool]:
+    while True:
+        status_line = await reader.readuntil(b"\r\n")
+        version, status, *_ = status_line.decode("latin-1").split(" ", 2)
+        lines = []
+        line = await reader.readuntil(b"\r\n")
+        while line != b"\r\n":
+            lines.append(line)
+            line = await reader.readuntil(b"\r\n")
+        headers = email.parser.Parser(_class=http.client.HTTPMessage).parsestr(
+            b"".join(lines).decode("latin-1")
+        )
+
+        # skip informational responses (e.g: 100 Continue)
+        if not (100 <= int(status) < 200):
+            break
+
+    code = int(status)
+    connection = (headers.get("Connection") or "").lower()
+    will_close = connection == "close" or (
+        version == "HTTP/1.0" and connection != "keep-alive"
+    )
+
+    if method == "HEAD" or code in (204, 304):
+        body = b""
+    elif "chunked" in (headers.get("Transfer-Encoding") or "").lower():
+        chunks = []
+        while True:
+            size = int((await reader.readuntil(b"\r\n")).split(b";")[0], 16)
+            if size == 0:
+                # consume the optional trailers up to the final empty line.
+                while (await reader.readuntil(b"\r\n")) != b"\r\n":
+                    pass
+                break
+            chunks.append(await reader.readexactly(size))
+            await reader.readexactly(2)
+        body = b"".join(chunks)
+    elif headers.get("Content-Length") is not None:
+        body = await reader.readexactly(int(headers["Content-Length"]))
+    else:
+        body = await reader.read()
+        will_close = True
+
+    return code, headers, body, not will_close
+
+
+_transport: Transport = PooledTransport()
+_async_transport: AsyncTransport = AsyncPooledTransport()
+
+
+def get_transport() -> Transport:
+    return _transport
+
+
+def get_async_transport() -> AsyncTransport:
+    return _async_transport
+
+
+def set_async_transport(transport: AsyncTransport):
+    """Replace the transport used by every ``karrio.core.utils.request_async`` call."""
+    global _async_transport
+
+    _async_transport = transport
+
+
+def set_transport(transport: Transport):
+    """Replace the transport used by every ``karrio.core.utils.request`` call."""
+    global _transport
+
+    previous = _transport
+    _transport = transport
+    previous.close()
+
+
+def configure(
+    pool_size: int = DEFAULT_POOL_SIZE,
+    host_limits: typing.Dict[str, int] = None,
+    connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+    read_timeout: float = DEFAULT_READ_TIMEOUT,
+    pooling: bool = True,
+):
+    """Configure the default transport used for carrier API calls.
+
+    :param pool_size: the default max number of keep-alive connections per host.
+    :param host_limits: per host (carrier API hostname) connection limits.
+    :param connect_timeout: the socket connection timeout in seconds.
+    :param read_timeout: the socket read timeout in seconds.
+    :param pooling: set to False to open a new connection per request (urlopen).
+    """
+    set_transport(
+        PooledTransport(
+            pool_size=pool_size,
+            host_limits=host_limits,
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout,
+        )
+        if pooling
+        else UrllibTransport()
+    )
+    set_async_transport(
+        AsyncPooledTransport(
+            pool_size=pool_size,
+            host_limits=host_limits,
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout,
+        )
+    )
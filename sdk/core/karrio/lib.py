@@ -525,9 +525,24 @@ def request(
     decoder: typing.Callable = utils.decode_bytes,
     on_error: typing.Callable = None,
     trace: typing.Callable[[typing.Any, str], typing.Any] = None,
+    timeout: float = None,
     **kwargs,
 ) -> str:
-    return utils.request(decoder, on_error=on_error, trace=trace, **kwargs)
+    return utils.request(
+        decoder, on_error=on_error, trace=trace, timeout=timeout, **kwargs
+    )
+
+
+async def request_async(
+    decoder: typing.Callable = utils.decode_bytes,
+    on_error: typing.Callable = None,
+    trace: typing.Callable[[typing.Any, str], typing.Any] = None,
+    timeout: float = None,
+    **kwargs,
+) -> str:
+    return await utils.request_async(
+        decoder, on_error=on_error, trace=trace, timeout=timeout, **kwargs
+    )
 
 
 # -----------------------------------------------------------
@@ -566,6 +581,21 @@ def bundle_base64(
     return utils.bundle_base64(base64_strings, format=format)
 
 
+def bundle_bytes(
+    sources: typing.Iterable[utils.DocumentSource],
+    format: str = "PDF",
+) -> bytes:
+    return utils.bundle_bytes(sources, format=format)
+
+
+def write_bundle(
+    sources: typing.Iterable[utils.DocumentSource],
+    sink: typing.IO[bytes],
+    format: str = "PDF",
+) -> typing.IO[bytes]:
+    return utils.write_bundle(sources, sink, format=format)
+
+
 def to_buffer(
     base64_string: str,
     **kwargs,
@@ -1,8 +1,21 @@
-"""
+"""Karrio carrier extensions (providers) registry and references.
 
+Set ``KARRIO_REFERENCES_CACHE`` to a file path (or pass ``cache_file`` to
+``collect_references``) to enable the lazy extensions loading mode: the
+references (carriers, services, options, packaging types...) are then loaded
+from a JSON snapshot and the carrier extensions (and their generated schema
+libraries) are only imported on the first gateway request for that carrier.
 """
+import os
 import attr
+import json
+import typing
+import logging
 import pkgutil
+import functools
+import importlib
+import threading
+import importlib.metadata
 from typing import Dict, List
 
 import karrio.mappers as mappers
@@ -14,26 +27,65 @@ from karrio.core.metadata import Metadata
 PROVIDERS = None
 PROVIDERS_DATA = None
 REFERENCES = None
+PROVIDER_NAMES = None
+LOADED_PROVIDERS: Dict[str, Metadata] = {}
+LOCK = threading.RLock()
+logger = logging.getLogger(__name__)
+
+
+def provider_names() -> List[str]:
+    """Return the names of the installed carrier extensions (discovered once)."""
+    global PROVIDER_NAMES
+
+    with LOCK:
+        if PROVIDER_NAMES is None:
+            PROVIDER_NAMES = [
+                name for _, name, _ in pkgutil.iter_modules(mappers.__path__)
+            ]
+
+    return PROVIDER_NAMES
+
+
+def import_extension(carrier_name: str) -> Metadata:
+    """Import a single carrier extension on first use and return its metadata.
+
+    Raises:
+        KeyError: if no extension is installed for the carrier name.
+    """
+    if carrier_name in LOADED_PROVIDERS:
+        return LOADED_PROVIDERS[carrier_name]
+
+    if carrier_name not in provider_names():
+        raise KeyError(carrier_name)
+
+    with LOCK:
+        if carrier_name not in LOADED_PROVIDERS:
+            module = __import__(
+                f"{mappers.__name__}.{carrier_name}", fromlist=[carrier_name]
+            )
+            LOADED_PROVIDERS[carrier_name] = module.METADATA
+
+    return LOADED_PROVIDERS[carrier_name]
 
 
 def import_extensions() -> Dict[str, Metadata]:
     global PROVIDERS
-    modules = {
-        name: __import__(f"{mappers.__name__}.{name}", fromlist=[name])
-        for _, name, _ in pkgutil.iter_modules(mappers.__path__)
-    }
 
-    PROVIDERS = {
-        carrier_name: module.METADATA for carrier_name, module in modules.items()
-    }
+    if PROVIDERS is None:
+        PROVIDERS = {
+            carrier_name: import_extension(carrier_name)
+            for carrier_name in provider_names()
+        }
 
     return PROVIDERS
 
 
 def collect_providers_data() -> Dict[str, dict]:
     global PROVIDERS_DATA
-    if PROVIDERS is None:
-        import_extensions()
+    if PROVIDERS_DATA is not None:
+        return PROVIDERS_DATA
+
+    providers = import_extensions()
 
     PROVIDERS_DATA = {
         "universal": dict(
@@ -43,34 +95,152 @@ def collect_providers_data() -> Dict[str, dict]:
         ),
         **{
             carrier_name: attr.asdict(metadata)
-            for carrier_name, metadata in PROVIDERS.items()
+            for carrier_name, metadata in providers.items()
         },
     }
 
     return PROVIDERS_DATA
 
 
+@functools.lru_cache(maxsize=None)
 def detect_capabilities(proxy_type: object) -> List[str]:
     return [prop for prop in proxy_type.__dict__.keys() if "_" not in prop[0]]
 
 
-def collect_references() -> dict:
+def reload():
+    """Discard the providers registry caches to pick up (un)installed extensions."""
+    global PROVIDERS, PROVIDERS_DATA, REFERENCES, PROVIDER_NAMES
+
+    with LOCK:
+        mappers.__path__ = pkgutil.extend_path(  # type: ignore
+            mappers.__path__, mappers.__name__
+        )
+        importlib.invalidate_caches()
+        detect_capabilities.cache_clear()
+        LOADED_PROVIDERS.clear()
+        PROVIDERS = None
+        PROVIDERS_DATA = None
+        REFERENCES = None
+        PROVIDER_NAMES = None
+
+
+def collect_references(cache_file: str = None) -> dict:
+    """Return the karrio references (carriers, services, options, units...).
+
+    :param cache_file: an optional references snapshot file path
+        (defaults to the ``KARRIO_REFERENCES_CACHE`` environment variable).
+    """
     global REFERENCES
-    if PROVIDERS_DATA is None:
-        collect_providers_data()
+    if REFERENCES is not None:
+        return REFERENCES
+
+    cache_file = cache_file or os.environ.get("KARRIO_REFERENCES_CACHE")
+    snapshot = load_references(cache_file) if cache_file else None
+
+    with LOCK:
+        if REFERENCES is None:
+            REFERENCES = snapshot or _compute_references()
+
+        if cache_file and snapshot is None:
+            dump_references(REFERENCES, cache_file)
+
+    return REFERENCES
+
+
+def references_fingerprint() -> str:
+    """Identify the installed extensions set (names and karrio packages versions)."""
+    versions = sorted(
+        f"{dist.metadata['Name']}=={dist.version}"
+        for dist in importlib.metadata.distributions()
+        if (dist.metadata["Name"] or "").lower().startswith("karrio")
+    )
+
+    return json.dumps(dict(providers=sorted(provider_names()), versions=versions))
+
+
+def load_references(cache_file: str) -> typing.Optional[dict]:
+    """Load a references snapshot if it matches the installed extensions."""
+    try:
+        with open(cache_file, "r") as f:
+            snapshot = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if snapshot.get("fingerprint") != references_fingerprint():
+        logger.info("outdated references snapshot, collecting references...")
+        return None
+
+    return snapshot.get("references")
+
+
+def dump_references(references: dict, cache_file: str):
+    """Save a references snapshot (written atomically).
+
+    No snapshot is written if a reference value doesn't load back identical
+    from JSON, the references are then collected on every start.
+    """
+    try:
+        content = json.dumps(
+            dict(
+                fingerprint=references_fingerprint(),
+                references=_snapshot_value(references),
+            )
+        )
+    except TypeError as e:
+        logger.error(f"references snapshot skipped: {e}")
+        return
+
+    try:
+        temp_file = f"{cache_file}.{os.getpid()}.tmp"
+
+        with open(temp_file, "w") as f:
+            f.write(content)
+
+        os.replace(temp_file, cache_file)
+    except OSError as e:
+        logger.warning(f"failed to save references snapshot: {e}")
+
+
+def _snapshot_value(value: typing.Any, path: str = "references") -> typing.Any:
+    """Return a references value checked to be plain JSON data.
+
+    Enums, tuples, classes... would load back as different values, they are
+    rejected instead of being stringified.
+    """
+    if type(value) is dict:
+        for key in value.keys():
+            if type(key) is not str:
+                raise TypeError(f"{path} has a non string key: {key!r}")
+
+        return {
+            key: _snapshot_value(item, f"{path}.{key}") for key, item in value.items()
+        }
+
+    if type(value) is list:
+        return [_snapshot_value(item, f"{path}[{i}]") for i, item in enumerate(value)]
+
+    if value is None or type(value) in (str, int, float, bool):
+        return value
+
+    raise TypeError(f"{path} is not JSON serializable: {type(value).__name__}")
+
+
+def _compute_references() -> dict:
+    providers = import_extensions()
+    providers_data = collect_providers_data()
 
     services = {
         key: {c.name: c.value for c in list(mapper["services"])}  # type: ignore
-        for key, mapper in PROVIDERS_DATA.items()
+        for key, mapper in providers_data.items()
         if mapper.get("services") is not None
     }
     options = {
         key: {c.name: dict(code=c.value.code) for c in list(mapper["options"])}  # type: ignore
-        for key, mapper in PROVIDERS_DATA.items()
+        for key, mapper in providers_data.items()
         if mapper.get("options") is not None
     }
 
-    REFERENCES = {
+    return {
         "countries": {c.name: c.value for c in list(units.Country)},
         "currencies": {c.name: c.value for c in list(units.Currency)},
         "weight_units": {c.name: c.value for c in list(units.WeightUnit)},
@@ -85,28 +255,28 @@ def collect_references() -> dict:
         },
         "incoterms": {c.name: c.value for c in list(units.Incoterm)},
         "carriers": {
-            carrier_name: metadata.label for carrier_name, metadata in PROVIDERS.items()
+            carrier_name: metadata.label for carrier_name, metadata in providers.items()
         },
         "carrier_hubs": {
             carrier_name: metadata.label
-            for carrier_name, metadata in PROVIDERS.items()
+            for carrier_name, metadata in providers.items()
             if metadata.is_hub
         },
         "services": services,
         "options": options,
         "carrier_capabilities": {
             key: detect_capabilities(mapper["Proxy"])
-            for key, mapper in PROVIDERS_DATA.items()
+            for key, mapper in providers_data.items()
             if mapper.get("Proxy") is not None
         },
         "packaging_types": {
             key: {c.name: c.value for c in list(mapper["packaging_types"])}  # type: ignore
-            for key, mapper in PROVIDERS_DATA.items()
+            for key, mapper in providers_data.items()
             if mapper.get("packaging_types") is not None
         },
         "package_presets": {
             key: {c.name: DP.to_dict(c.value) for c in list(mapper["package_presets"])}  # type: ignore
-            for key, mapper in PROVIDERS_DATA.items()
+            for key, mapper in providers_data.items()
             if mapper.get("package_presets") is not None
         },
         "option_names": {
@@ -119,9 +289,7 @@ def collect_references() -> dict:
         },
         "service_levels": {
             key: DP.to_dict(mapper.get("service_levels"))
-            for key, mapper in PROVIDERS_DATA.items()
+            for key, mapper in providers_data.items()
             if mapper.get("service_levels") is not None
         },
     }
-
-    return REFERENCES
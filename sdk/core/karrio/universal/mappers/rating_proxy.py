@@ -1,5 +1,5 @@
 import attr
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 from karrio.core.utils import (
     Tracer,
     Serializable,
@@ -11,8 +11,6 @@ from karrio.core.models import (
     ServiceLevel,
 )
 from karrio.core.units import (
-    Weight,
-    Dimension,
     Packages,
     Package,
 )
@@ -41,6 +39,7 @@ def filter_service_level(
     request: RateRequest, settings: RatingMixinSettings
 ) -> Tuple[PackageServices, List[Message]]:
     errors: List[Message] = []
+    table = settings.service_table
     packages = Packages(request.parcels)
     has_origin = any(
         [
@@ -52,148 +51,96 @@ def filter_service_level(
         request.shipper.country_code == request.recipient.country_code
         or settings.account_country_code == request.recipient.country_code
     )
-    is_international = not is_domicile
-    selected_services = [
-        s.service_code for s in settings.services
-        if s.service_code in request.services
-    ]
+    covered = table.international if not is_domicile else table.domestic
+    selected_services = set(request.services or []).intersection(table.by_code)
+
+    # Pick the candidate rows once for all packages (settings order preserved)
+    if any(selected_services):
+        covered_rows = set(map(id, covered))
+        candidates = [
+            (row, id(row) in covered_rows)
+            for row in table.rows
+            if row.service.active and row.service.service_code in selected_services
+        ]
+    else:
+        candidates = [(row, True) for row in covered]
+
+    def error(code: str, message: str) -> Message:
+        return Message(
+            carrier_id=settings.carrier_id,
+            carrier_name=settings.carrier_name,
+            code=code,
+            message=message,
+        )
 
-    def match_requirements(package: Package, service: ServiceLevel) -> bool:
-        # Check if service requested
-        explicitly_requested = service.service_code in selected_services
-        implicitly_requested = len(selected_services or []) == 0
-        excluded = len(selected_services or []) > 0 and not explicitly_requested
+    def match_requirements(package: Package) -> List[ServiceLevel]:
+        measures: Dict[Tuple[str, str], float] = {}
 
-        if not service.active or excluded:
-            return False
+        def measure(name: str, unit: str) -> float:
+            if (name, unit) not in measures:
+                measures[(name, unit)] = getattr(package, name)[unit]
+            return measures[(name, unit)]
 
-        # Check if destination covered
-        cover_domestic_shipment = (
-            service.domicile is True and service.domicile == is_domicile
-        )
-        cover_international_shipment = (
-            service.international is True and service.international == is_international
-        )
-        cover_all_destination = (
-            service.domicile is None and service.international is None
-        )
-        explicit_destination_covered = explicitly_requested and (
-            cover_domestic_shipment
-            or cover_international_shipment
-            or cover_all_destination
-        )
-        implicit_destination_covered = implicitly_requested and (
-            cover_domestic_shipment
-            or cover_international_shipment
-            or cover_all_destination
-        )
+        def fits(name: str, limit: float, unit: str) -> bool:
+            return limit is None or measure(name, unit) <= limit
 
-        destination_covered = (
-            explicit_destination_covered or implicit_destination_covered
-        )
+        matches: List[ServiceLevel] = []
 
-        # Check if weight and dimensions fit restrictions
-        match_length_requirements = (
-            service.max_length is not None
-            and package.length[service.dimension_unit]
-            <= Dimension(service.max_length or 0, service.dimension_unit).value
-        ) or (service.max_length is None)
-        match_height_requirements = (
-            service.max_height is not None
-            and package.height[service.dimension_unit]
-            <= Dimension(service.max_height, service.dimension_unit).value
-        ) or (service.max_height is None)
-        match_width_requirements = (
-            service.max_width is not None
-            and package.width[service.dimension_unit]
-            <= Dimension(service.max_width, service.dimension_unit).value
-        ) or (service.max_width is None)
-        match_weight_requirements = (
-            service.max_weight is not None
-            and package.weight[service.weight_unit]
-            <= Weight(service.max_weight, service.weight_unit).value
-        ) or (service.max_weight is None)
-
-        # error validations
-        if explicitly_requested and not explicit_destination_covered:
-            errors.append(
-                Message(
-                    carrier_id=settings.carrier_id,
-                    carrier_name=settings.carrier_name,
-                    code="destination_not_supported",
-                    message=f"the service {service.service_code} does not cover the requested destination",
+        for row, destination_covered in candidates:
+            code = row.service.service_code
+
+            if not destination_covered:
+                errors.append(
+                    error(
+                        "destination_not_supported",
+                        f"the service {code} does not cover the requested destination",
+                    )
                 )
-            )
-        if (
-            destination_covered
-            and service.max_length is not None
-            and not match_length_requirements
-        ):
-            errors.append(
-                Message(
-                    carrier_id=settings.carrier_id,
-                    carrier_name=settings.carrier_name,
-                    code="invalid_dimension",
-                    message=f"length size exceeds service {service.service_code} max length",
+                continue
+
+            # Check if weight and dimensions fit restrictions
+            match_length = fits("length", row.max_length, row.dimension_unit)
+            match_height = fits("height", row.max_height, row.dimension_unit)
+            match_width = fits("width", row.max_width, row.dimension_unit)
+            match_weight = fits("weight", row.max_weight, row.weight_unit)
+
+            # error validations
+            if not match_length:
+                errors.append(
+                    error(
+                        "invalid_dimension",
+                        f"length size exceeds service {code} max length",
+                    )
                 )
-            )
-        if (
-            destination_covered
-            and service.max_height is not None
-            and not match_height_requirements
-        ):
-            errors.append(
-                Message(
-                    carrier_id=settings.carrier_id,
-                    carrier_name=settings.carrier_name,
-                    code="invalid_dimension",
-                    message=f"height size exceeds service {service.service_code} max height",
+            if not match_height:
+                errors.append(
+                    error(
+                        "invalid_dimension",
+                        f"height size exceeds service {code} max height",
+                    )
                 )
-            )
-        if (
-            destination_covered
-            and service.max_width is not None
-            and not match_width_requirements
-        ):
-            errors.append(
-                Message(
-                    carrier_id=settings.carrier_id,
-                    carrier_name=settings.carrier_name,
-                    code="invalid_dimension",
-                    message=f"the width size exceeds service {service.service_code} max width",
+            if not match_width:
+                errors.append(
+                    error(
+                        "invalid_dimension",
+                        f"the width size exceeds service {code} max width",
+                    )
                 )
-            )
-        if (
-            destination_covered
-            and service.max_weight is not None
-            and not match_weight_requirements
-        ):
-            errors.append(
-                Message(
-                    carrier_id=settings.carrier_id,
-                    carrier_name=settings.carrier_name,
-                    code="invalid_weight",
-                    message=f"the weight exceeds service {service.service_code} max weight",
+            if not match_weight:
+                errors.append(
+                    error(
+                        "invalid_weight",
+                        f"the weight exceeds service {code} max weight",
+                    )
                 )
-            )
-
-        return (
-            destination_covered
-            and match_length_requirements
-            and match_height_requirements
-            and match_width_requirements
-            and match_weight_requirements
-        )
+
+            if match_length and match_height and match_width and match_weight:
+                matches.append(row.service)
+
+        return matches
 
     services = [
-        (
-            f'{getattr(pkg, "id", index)}',
-            [
-                service
-                for service in settings.services
-                if match_requirements(pkg, service)
-            ],
-        )
+        (f'{getattr(pkg, "id", index)}', match_requirements(pkg))
         for index, pkg in enumerate(packages, 1)
     ]
 
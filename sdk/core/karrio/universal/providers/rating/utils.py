@@ -1,9 +1,10 @@
 import attr
-from typing import List, Tuple
+from typing import Dict, List, NamedTuple, Optional, Tuple
 from jstruct import JList
 
 from karrio.core.settings import Settings as BaseSettings
 from karrio.core.models import ServiceLevel
+from karrio.core.units import Dimension, Weight
 
 PackageServices = List[Tuple[str, List[ServiceLevel]]]
 
@@ -14,3 +15,82 @@ class RatingMixinSettings(BaseSettings):
 
     # Additional properties
     services: List[ServiceLevel] = JList[ServiceLevel]
+
+    @property
+    def service_table(self) -> "ServiceTable":
+        """The services compiled for matching (rebuilt when `services` changes)."""
+        table = getattr(self, "_service_table", None)
+
+        if table is None or table.services is not self.services:
+            table = ServiceTable.compile(self.services)
+            object.__setattr__(self, "_service_table", table)
+
+        return table
+
+
+class ServiceRow(NamedTuple):
+    """A service level with its limits converted once into its own units."""
+
+    service: ServiceLevel
+    dimension_unit: Optional[str]
+    weight_unit: Optional[str]
+    max_length: Optional[float]
+    max_height: Optional[float]
+    max_width: Optional[float]
+    max_weight: Optional[float]
+
+
+@attr.s(auto_attribs=True)
+class ServiceTable:
+    """Precompiled service levels bucketed by destination coverage."""
+
+    services: List[ServiceLevel]
+    rows: List[ServiceRow]
+    domestic: List[ServiceRow]
+    international: List[ServiceRow]
+    by_code: Dict[str, List[ServiceRow]]
+
+    @staticmethod
+    def compile(services: List[ServiceLevel]) -> "ServiceTable":
+        rows = [
+            ServiceRow(
+                service=service,
+                dimension_unit=service.dimension_unit,
+                weight_unit=service.weight_unit,
+                max_length=_limit(
+                    Dimension, service.max_length, service.dimension_unit
+                ),
+                max_height=_limit(
+                    Dimension, service.max_height, service.dimension_unit
+                ),
+                max_width=_limit(Dimension, service.max_width, service.dimension_unit),
+                max_weight=_limit(Weight, service.max_weight, service.weight_unit),
+            )
+            for service in services
+        ]
+        cover_all = lambda s: s.domicile is None and s.international is None
+        by_code: Dict[str, List[ServiceRow]] = {}
+        for row in rows:
+            by_code.setdefault(row.service.service_code, []).append(row)
+
+        return ServiceTable(
+            services=services,
+            rows=rows,
+            domestic=[
+                row
+                for row in rows
+                if row.service.active
+                and (row.service.domicile is True or cover_all(row.service))
+            ],
+            international=[
+                row
+                for row in rows
+                if row.service.active
+                and (row.service.international is True or cover_all(row.service))
+            ],
+            by_code=by_code,
+        )
+
+
+def _limit(unit_type, value: Optional[float], unit: Optional[str]):
+    return None if value is None else unit_type(value, unit).value
@@ -1 +1,6 @@
 from .universal_rate import *
+from .transport import *
+from .tracing import *
+from .references import *
+from .rating import *
+from .documents import *
@@ -0,0 +1,68 @@
+import io
+import base64
+import unittest
+from PIL import Image
+from PyPDF2 import PdfReader
+from karrio.core.utils import bundle_base64, bundle_bytes, write_bundle
+
+
+class TestDocumentsBundle(unittest.TestCase):
+    def test_write_pdf_bundle_from_mixed_sources(self):
+        sink = io.BytesIO()
+        sources = iter(
+            [
+                base64.b64encode(create_pdf()).decode("utf-8"),
+                create_pdf(),
+                io.BytesIO(create_pdf()),
+            ]
+        )
+
+        write_bundle(sources, sink, format="PDF")
+
+        self.assertEqual(len(PdfReader(io.BytesIO(sink.getvalue())).pages), 3)
+
+    def test_bundle_zpl_bytes(self):
+        sources = [base64.b64encode(b"^XA^XZ").decode("utf-8"), b"^XA^FDx^XZ"]
+
+        self.assertEqual(
+            bundle_bytes(sources, format="ZPL"), b"^XA^XZ\n^XA^FDx^XZ\n"
+        )
+
+    def test_bundle_base64_images(self):
+        labels = [
+            base64.b64encode(create_image((40, 60))).decode("utf-8"),
+            base64.b64encode(create_image((30, 20))).decode("utf-8"),
+        ]
+
+        image = Image.open(io.BytesIO(base64.b64decode(bundle_base64(labels, "PNG"))))
+
+        self.assertEqual(image.size, (40, 80))
+
+    def test_write_paged_bundles_of_images(self):
+        sizes = [(40, 60), (30, 20), (50, 10)]
+        tiff, pdf = io.BytesIO(), io.BytesIO()
+
+        write_bundle((create_image(size) for size in sizes), tiff, format="TIFF")
+        write_bundle((create_image(size) for size in sizes), pdf, format="PDF")
+        image = Image.open(io.BytesIO(tiff.getvalue()))
+
+        self.assertEqual(image.n_frames, 3)
+        self.assertEqual(len(PdfReader(io.BytesIO(pdf.getvalue())).pages), 3)
+
+
+def create_pdf() -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (20, 20), "white").save(buffer, format="PDF")
+
+    return buffer.getvalue()
+
+
+def create_image(size) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", size, "white").save(buffer, format="PNG")
+
+    return buffer.getvalue()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,149 @@
+import time
+import attr
+import asyncio
+import unittest
+import karrio
+import karrio.lib as lib
+from karrio.api.proxy import Proxy
+from karrio.api.mapper import Mapper
+from karrio.api.gateway import Gateway
+from karrio.core.settings import Settings
+from karrio.core.models import RateDetails
+
+
+class TestRatingFanOut(unittest.TestCase):
+    def setUp(self):
+        self.gateways = [create_gateway("fast", 0), create_gateway("slow", 1)]
+
+    def test_fetch_waits_for_every_carrier(self):
+        rates, messages = karrio.Rating.fetch(RateRequest).from_(*self.gateways).parse()
+
+        self.assertListEqual([r.carrier_id for r in rates], ["fast", "slow"])
+        self.assertListEqual(messages, [])
+
+    def test_fetch_returns_rates_received_before_the_deadline(self):
+        started_at = time.monotonic()
+        rates, messages = (
+            karrio.Rating.fetch(RateRequest, deadline=0.2)
+            .from_(*self.gateways)
+            .parse()
+        )
+
+        self.assertLess(time.monotonic() - started_at, 0.8)
+        self.assertListEqual([r.carrier_id for r in rates], ["fast"])
+        self.assertListEqual(
+            lib.to_dict(messages),
+            [
+                {
+                    "carrier_id": "slow",
+                    "carrier_name": "mock",
+                    "code": "SHIPPING_SDK_TIMEOUT_ERROR",
+                    "message": "The carrier did not respond within 0.2 seconds",
+                }
+            ],
+        )
+
+    def test_fetch_with_carrier_timeouts(self):
+        rates, messages = (
+            karrio.Rating.fetch(RateRequest, carrier_timeouts=dict(slow=0.1))
+            .from_(*self.gateways)
+            .parse()
+        )
+
+        self.assertListEqual([r.carrier_id for r in rates], ["fast"])
+        self.assertListEqual([m.carrier_id for m in messages], ["slow"])
+
+    def test_stream_yields_rates_as_they_complete(self):
+        gateways = [create_gateway("slow", 0.3), create_gateway("fast", 0)]
+        responses = karrio.Rating.fetch(RateRequest).stream(*gateways)
+
+        self.assertListEqual(
+            [[r.carrier_id for r in response.parse()[0]] for response in responses],
+            [["fast"], ["slow"]],
+        )
+
+
+class TestAsyncRatingFanOut(unittest.IsolatedAsyncioTestCase):
+    async def test_fetch_async_returns_rates_received_before_the_deadline(self):
+        gateways = [create_gateway("fast", 0), create_gateway("slow", 1)]
+        response = await karrio.Rating.fetch(RateRequest, deadline=0.2).from_async(
+            *gateways
+        )
+        rates, messages = response.parse()
+
+        self.assertListEqual([r.carrier_id for r in rates], ["fast"])
+        self.assertListEqual([m.code for m in messages], ["SHIPPING_SDK_TIMEOUT_ERROR"])
+
+    async def test_stream_async_yields_rates_as_they_complete(self):
+        gateways = [create_gateway("slow", 0.3), create_gateway("fast", 0)]
+        responses = [
+            [r.carrier_id for r in response.parse()[0]]
+            async for response in karrio.Rating.fetch(RateRequest).stream_async(
+                *gateways
+            )
+        ]
+
+        self.assertListEqual(responses, [["fast"], ["slow"]])
+
+
+@attr.s(auto_attribs=True)
+class MockSettings(Settings):
+    delay: float = 0
+
+    @property
+    def carrier_name(self):
+        return "mock"
+
+
+@attr.s(auto_attribs=True)
+class MockProxy(Proxy):
+    def get_rates(self, request: lib.Serializable) -> lib.Deserializable:
+        time.sleep(self.settings.delay)
+        return lib.Deserializable(self.settings.carrier_id)
+
+    async def get_rates_async(self, request: lib.Serializable) -> lib.Deserializable:
+        await asyncio.sleep(self.settings.delay)
+        return lib.Deserializable(self.settings.carrier_id)
+
+
+@attr.s(auto_attribs=True)
+class MockMapper(Mapper):
+    settings: MockSettings
+
+    def create_rate_request(self, payload) -> lib.Serializable:
+        return lib.Serializable(payload)
+
+    def parse_rate_response(self, response: lib.Deserializable):
+        carrier_id = response.deserialize()
+        rate = RateDetails(
+            carrier_id=carrier_id,
+            carrier_name="mock",
+            service="standard",
+            currency="USD",
+            total_charge=10.0,
+        )
+
+        return [rate], []
+
+
+def create_gateway(carrier_id: str, delay: float) -> Gateway:
+    settings = MockSettings(carrier_id=carrier_id, delay=delay)
+
+    return Gateway(
+        is_hub=False,
+        settings=settings,
+        mapper=MockMapper(settings),
+        proxy=MockProxy(settings),
+        tracer=lib.Tracer(),
+    )
+
+
+RateRequest = {
+    "shipper": {"postal_code": "H3N1S4", "country_code": "CA"},
+    "recipient": {"postal_code": "89109", "country_code": "US"},
+    "parcels": [{"weight": 1.0, "weight_unit": "KG"}],
+}
+
+
+if __name__ == "__main__":
+    unittest.main()
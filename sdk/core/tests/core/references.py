@@ -0,0 +1,82 @@
+import os
+import unittest
+import tempfile
+from unittest import mock
+import karrio
+import karrio.references as references
+import karrio.core.units as units
+import karrio.core.errors as errors
+
+
+class TestProvidersRegistry(unittest.TestCase):
+    def tearDown(self):
+        references.reload()
+
+    def test_providers_are_discovered_once(self):
+        references.reload()
+
+        with mock.patch.object(
+            references.pkgutil, "iter_modules", wraps=references.pkgutil.iter_modules
+        ) as iter_modules:
+            references.import_extensions()
+            references.import_extensions()
+            references.collect_references()
+
+        self.assertEqual(iter_modules.call_count, 1)
+
+    def test_references_snapshot_skips_extensions_import(self):
+        cache_file = os.path.join(tempfile.mkdtemp(), "references.json")
+        references.reload()
+        collected = references.collect_references(cache_file=cache_file)
+        references.reload()
+
+        with mock.patch.object(references, "import_extensions") as import_extensions:
+            loaded = references.collect_references(cache_file=cache_file)
+
+        import_extensions.assert_not_called()
+        self.assertListEqual(sorted(loaded.keys()), sorted(collected.keys()))
+        self.assertDictEqual(loaded["carriers"], collected["carriers"])
+
+    def test_references_snapshot_skips_non_json_values(self):
+        cache_file = os.path.join(tempfile.mkdtemp(), "references.json")
+
+        for value in [units.WeightUnit.KG, ("KG", "LB"), units.WeightUnit]:
+            references.dump_references(dict(weight_units=value), cache_file)
+
+        self.assertFalse(os.path.exists(cache_file))
+
+    def test_non_json_references_are_collected_without_snapshot(self):
+        cache_file = os.path.join(tempfile.mkdtemp(), "references.json")
+        references.reload()
+
+        with mock.patch.object(
+            references,
+            "_compute_references",
+            return_value=dict(weight_units=units.WeightUnit),
+        ):
+            collected = references.collect_references(cache_file=cache_file)
+
+        self.assertDictEqual(collected, dict(weight_units=units.WeightUnit))
+        self.assertFalse(os.path.exists(cache_file))
+
+    def test_unknown_provider(self):
+        with self.assertRaises(KeyError):
+            references.import_extension("unknown_carrier")
+
+        with self.assertRaises(errors.ShippingSDKError):
+            karrio.gateway["unknown_carrier"]
+
+    def test_detect_capabilities_is_memoized(self):
+        class Proxy:
+            def get_rates(self):
+                pass
+
+        self.assertListEqual(references.detect_capabilities(Proxy), ["get_rates"])
+        self.assertIs(
+            references.detect_capabilities(Proxy),
+            references.detect_capabilities(Proxy),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
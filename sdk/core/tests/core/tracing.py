@@ -0,0 +1,53 @@
+import unittest
+import threading
+from karrio.core.utils import Tracer
+
+
+class TestTracer(unittest.TestCase):
+    def test_trace_records_without_spawning_threads(self):
+        tracer = Tracer()
+        threads = threading.active_count()
+
+        for index in range(20):
+            tracer.trace({"request_id": str(index), "url": "/rates"}, "request")
+
+        self.assertEqual(threading.active_count(), threads)
+        self.assertEqual(len(tracer.records), 20)
+        self.assertDictEqual(
+            tracer.records[0].data,
+            {"format": None, "request_id": "0", "url": "/rates"},
+        )
+
+    def test_bounded_buffer_keeps_latest_records(self):
+        tracer = Tracer(max_records=2)
+
+        for index in range(5):
+            tracer.trace({"request_id": str(index)}, "request")
+
+        self.assertListEqual(
+            [record.data["request_id"] for record in tracer.records], ["3", "4"]
+        )
+
+    def test_payload_truncation(self):
+        tracer = Tracer(max_payload_size=5)
+        data = {"response": "<label>base64...</label>"}
+
+        self.assertIs(tracer.trace(data, "response"), data)
+        self.assertEqual(tracer.records[0].data["response"], "<labe...[truncated]")
+
+    def test_flush_records_in_batches(self):
+        tracer = Tracer()
+        batches = []
+
+        for index in range(5):
+            tracer.trace({"request_id": str(index)}, "request")
+
+        flushed = tracer.flush(batches.append, batch_size=2)
+
+        self.assertEqual(flushed, 5)
+        self.assertListEqual([len(batch) for batch in batches], [2, 2, 1])
+        self.assertListEqual(tracer.records, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
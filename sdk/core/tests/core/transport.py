@@ -0,0 +1,159 @@
+import socket
+import threading
+import unittest
+import http.server
+import urllib.request
+from urllib.error import HTTPError, URLError
+from karrio.core.utils import request, request_async, transport
+
+
+class LocalServer:
+    @classmethod
+    def setUpClass(cls):
+        cls.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+
+class TestPooledTransport(LocalServer, unittest.TestCase):
+    def setUp(self):
+        Handler.connections = set()
+        self.transport = transport.PooledTransport(pool_size=2)
+        transport.set_transport(self.transport)
+
+    def tearDown(self):
+        transport.configure()
+
+    def test_requests_reuse_keep_alive_connection(self):
+        responses = [
+            request(url=f"{self.url}/echo", data="<ping/>", method="POST")
+            for _ in range(3)
+        ]
+
+        self.assertListEqual(responses, ["<ping/>"] * 3)
+        self.assertEqual(len(Handler.connections), 1)
+
+    def test_error_response_is_passed_to_on_error(self):
+        response = request(
+            url=f"{self.url}/error",
+            method="GET",
+            on_error=lambda e: f"{e.code}:{e.read().decode('utf-8')}",
+        )
+
+        self.assertEqual(response, "400:invalid request")
+
+    def test_error_response_raises_http_error(self):
+        with self.assertRaises(HTTPError):
+            self.transport.send(urllib.request.Request(f"{self.url}/error"))
+
+    def test_redirect_loop_raises_http_error(self):
+        with self.assertRaises(HTTPError) as context:
+            self.transport.send(urllib.request.Request(f"{self.url}/loop"))
+
+        self.assertEqual(context.exception.code, 302)
+
+    def test_host_limits(self):
+        pool = self.transport.pool_for(("http", "127.0.0.1", 80))
+        limited = transport.PooledTransport(host_limits={"127.0.0.1": 1})
+
+        self.assertEqual(pool.maxsize, 2)
+        self.assertEqual(limited.pool_for(("http", "127.0.0.1", 80)).maxsize, 1)
+
+    def test_saturated_host_raises_url_error(self):
+        limited = transport.PooledTransport(host_limits={"127.0.0.1": 1})
+        port = self.server.server_address[1]
+        connection, _ = limited.pool_for(("http", "127.0.0.1", port)).acquire()
+
+        with self.assertRaises(URLError):
+            limited.send(urllib.request.Request(f"{self.url}/echo"), timeout=0.1)
+
+        connection.close()
+
+
+class TestAsyncPooledTransport(LocalServer, unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        Handler.connections = set()
+        self.transport = transport.AsyncPooledTransport(pool_size=2)
+        transport.set_async_transport(self.transport)
+
+    def tearDown(self):
+        transport.configure()
+
+    async def test_async_requests_reuse_keep_alive_connection(self):
+        responses = [
+            await request_async(url=f"{self.url}/echo", data="<ping/>", method="POST")
+            for _ in range(3)
+        ]
+
+        self.assertListEqual(responses, ["<ping/>"] * 3)
+        self.assertEqual(len(Handler.connections), 1)
+
+    async def test_async_error_response_is_passed_to_on_error(self):
+        response = await request_async(
+            url=f"{self.url}/error",
+            method="GET",
+            on_error=lambda e: f"{e.code}:{e.read().decode('utf-8')}",
+        )
+
+        self.assertEqual(response, "400:invalid request")
+
+    async def test_async_redirect_loop_raises_http_error(self):
+        with self.assertRaises(HTTPError) as context:
+            await self.transport.send(urllib.request.Request(f"{self.url}/loop"))
+
+        self.assertEqual(context.exception.code, 302)
+
+    async def test_async_connection_errors_raise_url_error(self):
+        refused = transport.AsyncPooledTransport()
+        timed_out = transport.AsyncPooledTransport(connect_timeout=0)
+        unreachable = f"http://127.0.0.1:{self.closed_port()}"
+
+        with self.assertRaises(URLError):
+            await refused.send(urllib.request.Request(unreachable))
+        with self.assertRaises(URLError):
+            await timed_out.send(urllib.request.Request(f"{self.url}/echo"))
+
+    @staticmethod
+    def closed_port() -> int:
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            return sock.getsockname()[1]
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    connections: set = set()
+
+    def reply(self, status: int, body: bytes):
+        Handler.connections.add(self.client_address)
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.reply(200, self.rfile.read(length))
+
+    def do_GET(self):
+        if self.path == "/loop":
+            Handler.connections.add(self.client_address)
+            self.send_response(302)
+            self.send_header("Location", "/loop")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        self.reply(400, b"invalid request")
+
+    def log_message(self, *args):
+        pass
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -118,6 +118,34 @@ class TestUniversalRating(unittest.TestCase):
             ParsedMultiPieceRateResponse,
         )
 
+    def test_unsupported_destination_service_request(self):
+        InternationalStandardRateRequest = Serializable(
+            RateRequest(
+                **{
+                    **rate_request_data,
+                    "recipient": {"postal_code": "11111", "country_code": "US"},
+                    "services": ["carrier_standard"],
+                }
+            )
+        )
+        response_data = self.proxy.get_rates(InternationalStandardRateRequest)
+        rates = parse_rate_response(response_data.deserialize(), self.settings)
+
+        self.assertListEqual(
+            DP.to_dict(rates),
+            ParsedUnsupportedDestinationResponse,
+        )
+
+    def test_service_table_is_compiled_once(self):
+        table = self.settings.service_table
+
+        self.assertIs(self.settings.service_table, table)
+        self.assertListEqual(
+            [row.service.service_code for row in table.domestic],
+            ["carrier_standard", "carrier_premium"],
+        )
+        self.assertEqual(table.rows[0].max_weight, 5.0)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -271,3 +299,14 @@ ParsedMultiPieceRateResponse = [
     ],
     [],
 ]
+
+ParsedUnsupportedDestinationResponse = [
+    [],
+    [
+        {
+            "carrier_id": "universal",
+            "code": "destination_not_supported",
+            "message": "the service carrier_standard does not cover the requested destination",
+        }
+    ],
+]
@@ -1,11 +1,13 @@
 import base64
 import time
+import asyncio
 from typing import List
 from canadapost_lib.rating import mailing_scenario
 from karrio.api.proxy import Proxy as BaseProxy
 from karrio.core.errors import ShippingSDKError
 from karrio.core.utils import (
     request as http,
+    request_async as http_async,
     exec_async,
     Serializable,
     Deserializable,
@@ -20,18 +22,7 @@ class Proxy(BaseProxy):
     settings: Settings
 
     def get_rates(self, request: Serializable[mailing_scenario]) -> Deserializable[str]:
-        response = http(
-            url=f"{self.settings.server_url}/rs/ship/price",
-            data=request.serialize(),
-            trace=self.trace_as("xml"),
-            method="POST",
-            headers={
-                "Content-Type": "application/vnd.cpc.ship.rate-v4+xml",
-                "Accept": "application/vnd.cpc.ship.rate-v4+xml",
-                "Authorization": f"Basic {self.settings.authorization}",
-                "Accept-language": f"{self.settings.language}-CA",
-            },
-        )
+        response = http(**self._rates_request(request))
 
         return Deserializable(response, XP.to_xml)
 
@@ -46,21 +37,65 @@ class Proxy(BaseProxy):
             time.sleep(_throttle)
             _throttle += 0.025
 
-            return http(
-                url=f"{self.settings.server_url}/vis/track/pin/{tracking_pin}/detail",
-                trace=self.trace_as("xml"),
-                method="GET",
-                headers={
-                    "Accept": "application/vnd.cpc.track-v2+xml",
-                    "Authorization": f"Basic {self.settings.authorization}",
-                    "Accept-language": f"{self.settings.language}-CA",
-                },
-            )
+            return http(**self._tracking_request(tracking_pin))
 
         response: List[str] = exec_async(track, request.serialize())
 
         return Deserializable(XP.bundle_xml(xml_strings=response), XP.to_xml)
 
+    async def get_rates_async(
+        self, request: Serializable[mailing_scenario]
+    ) -> Deserializable[str]:
+        response = await http_async(**self._rates_request(request))
+
+        return Deserializable(response, XP.to_xml)
+
+    async def get_tracking_async(
+        self, request: Serializable[List[str]]
+    ) -> Deserializable[str]:
+        """
+        get_tracking_async make concurrent (non-blocking) requests for each pin
+        """
+
+        async def track(index: int, tracking_pin: str) -> str:
+            await asyncio.sleep(index * 0.025)
+
+            return await http_async(**self._tracking_request(tracking_pin))
+
+        response: List[str] = await asyncio.gather(
+            *[track(index, pin) for index, pin in enumerate(request.serialize())]
+        )
+
+        return Deserializable(XP.bundle_xml(xml_strings=response), XP.to_xml)
+
+    def _rates_request(self, request: Serializable[mailing_scenario]) -> dict:
+        """The rating request arguments (shared by the blocking and async paths)."""
+        return dict(
+            url=f"{self.settings.server_url}/rs/ship/price",
+            data=request.serialize(),
+            trace=self.trace_as("xml"),
+            method="POST",
+            headers={
+                "Content-Type": "application/vnd.cpc.ship.rate-v4+xml",
+                "Accept": "application/vnd.cpc.ship.rate-v4+xml",
+                "Authorization": f"Basic {self.settings.authorization}",
+                "Accept-language": f"{self.settings.language}-CA",
+            },
+        )
+
+    def _tracking_request(self, tracking_pin: str) -> dict:
+        """The tracking request arguments of a pin (shared by both paths)."""
+        return dict(
+            url=f"{self.settings.server_url}/vis/track/pin/{tracking_pin}/detail",
+            trace=self.trace_as("xml"),
+            method="GET",
+            headers={
+                "Accept": "application/vnd.cpc.track-v2+xml",
+                "Authorization": f"Basic {self.settings.authorization}",
+                "Accept-language": f"{self.settings.language}-CA",
+            },
+        )
+
     def create_shipment(self, request: Serializable[Pipeline]) -> Deserializable[str]:
         def _contract_shipment(job: Job):
             return http(
@@ -1,5 +1,5 @@
 import unittest
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 from karrio.core.utils import DP
 from karrio import Rating
 from karrio.core.models import RateRequest
@@ -60,6 +60,23 @@ class TestCanadaPostRating(unittest.TestCase):
             self.assertEqual(DP.to_dict(parsed_response), ParsedQuoteMissingArgsError)
 
 
+class TestCanadaPostAsyncRating(unittest.IsolatedAsyncioTestCase):
+    async def test_get_rates_async(self):
+        with patch(
+            "karrio.mappers.canadapost.proxy.http_async", new_callable=AsyncMock
+        ) as mock:
+            mock.return_value = RateResponseXml
+            response = await Rating.fetch(RateRequest(**RatePayload)).from_async(
+                gateway
+            )
+
+            self.assertEqual(
+                mock.call_args[1]["url"],
+                f"{gateway.proxy.settings.server_url}/rs/ship/price",
+            )
+            self.assertListEqual(DP.to_dict(response.parse()), ParsedQuoteResponse)
+
+
 if __name__ == "__main__":
     unittest.main()
 
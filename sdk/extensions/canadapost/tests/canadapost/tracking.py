@@ -1,5 +1,5 @@
 import unittest
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 from karrio.core.utils import DP
 from karrio import Tracking
 from karrio.core.models import TrackingRequest
@@ -54,6 +54,19 @@ class TestCanadaPostTracking(unittest.TestCase):
             )
 
 
+class TestCanadaPostAsyncTracking(unittest.IsolatedAsyncioTestCase):
+    async def test_get_tracking_async(self):
+        with patch(
+            "karrio.mappers.canadapost.proxy.http_async", new_callable=AsyncMock
+        ) as mock:
+            mock.return_value = "<a></a>"
+            await Tracking.fetch(
+                TrackingRequest(tracking_numbers=TRACKING_PAYLOAD)
+            ).from_async(gateway)
+
+            self.assertEqual(mock.call_args[1]["url"], TrackingRequestURL)
+
+
 if __name__ == "__main__":
     unittest.main()
 
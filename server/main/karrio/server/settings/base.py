@@ -160,6 +160,131 @@ AUDIT_LOGGING = importlib.util.find_spec(  # type:ignore
     "karrio.server.audit"
 ) is not None and config("AUDIT_LOGGING", default=True, cast=bool)
 PERSIST_SDK_TRACING = config("PERSIST_SDK_TRACING", default=True, cast=bool)
+SDK_TRACING_BATCH_SIZE = config("SDK_TRACING_BATCH_SIZE", default=100, cast=int)
+# 0 means no limit
+SDK_TRACING_MAX_RECORDS = config("SDK_TRACING_MAX_RECORDS", default=0, cast=int)
+SDK_TRACING_MAX_PAYLOAD_SIZE = config(
+    "SDK_TRACING_MAX_PAYLOAD_SIZE", default=0, cast=int
+)
+# background writer queue size (0 means no limit) and flush interval in seconds
+SDK_TRACING_QUEUE_SIZE = config("SDK_TRACING_QUEUE_SIZE", default=10000, cast=int)
+SDK_TRACING_FLUSH_INTERVAL = config("SDK_TRACING_FLUSH_INTERVAL", default=2, cast=float)
+# share of the traced requests persisted (1 keeps them all)
+SDK_TRACING_SAMPLE_RATE = config("SDK_TRACING_SAMPLE_RATE", default=1, cast=float)
+# e.g: SDK_TRACING_SAMPLE_RATES="fedex:0.1,shipment-rates:0.05" (carrier_id, carrier_name or operation)
+SDK_TRACING_SAMPLE_RATES = {
+    key.strip(): float(rate)
+    for key, rate in [
+        item.split(":")
+        for item in config("SDK_TRACING_SAMPLE_RATES", default="").split(",")
+        if ":" in item
+    ]
+}
+# base64 documents longer than this are stripped from the records (0 keeps them)
+SDK_TRACING_MAX_DOCUMENT_SIZE = config(
+    "SDK_TRACING_MAX_DOCUMENT_SIZE", default=1024, cast=int
+)
+SDK_TRACING_COMPRESS = config("SDK_TRACING_COMPRESS", default=False, cast=bool)
+
+# API request logs bodies longer than this are truncated (0 keeps them whole)
+API_LOGS_MAX_BODY_SIZE = config("API_LOGS_MAX_BODY_SIZE", default=20000, cast=int)
+# logged body fields (e.g: base64 documents) replaced by their size
+API_LOGS_REDACTED_FIELDS = [
+    field.strip()
+    for field in config(
+        "API_LOGS_REDACTED_FIELDS", default="label,invoice,doc_file,image"
+    ).split(",")
+    if field.strip()
+]
+# background writer queue size (0 means no limit), batch size and flush interval
+API_LOGS_QUEUE_SIZE = config("API_LOGS_QUEUE_SIZE", default=10000, cast=int)
+API_LOGS_BATCH_SIZE = config("API_LOGS_BATCH_SIZE", default=100, cast=int)
+API_LOGS_FLUSH_INTERVAL = config("API_LOGS_FLUSH_INTERVAL", default=2, cast=float)
+
+# Carrier extensions references snapshot (enables lazy carrier extensions import)
+# e.g: REFERENCES_CACHE_FILE="/karrio/app/references.json"
+REFERENCES_CACHE_FILE = config("REFERENCES_CACHE_FILE", default="") or None
+
+# Shipment documents (labels and invoices) storage
+# e.g: DOCUMENTS_STORAGE="database" | "filesystem" | "s3" | "<storage class path>"
+DOCUMENTS_STORAGE = config("DOCUMENTS_STORAGE", default="database")
+DOCUMENTS_STORAGE_ROOT = config(
+    "DOCUMENTS_STORAGE_ROOT", default=os.path.join(WORK_DIR, "documents")
+)
+DOCUMENTS_STORAGE_BUCKET = config("DOCUMENTS_STORAGE_BUCKET", default="")
+DOCUMENTS_STORAGE_PREFIX = config("DOCUMENTS_STORAGE_PREFIX", default="")
+DOCUMENTS_STORAGE_REGION = config("DOCUMENTS_STORAGE_REGION", default="")
+DOCUMENTS_STORAGE_ENDPOINT_URL = config("DOCUMENTS_STORAGE_ENDPOINT_URL", default="")
+DOCUMENTS_STORAGE_ACCESS_KEY = config("DOCUMENTS_STORAGE_ACCESS_KEY", default="")
+DOCUMENTS_STORAGE_SECRET_KEY = config("DOCUMENTS_STORAGE_SECRET_KEY", default="")
+
+# Data exports: queryset chunk size and the row count from which spreadsheet
+# exports are generated in the background (0 means never)
+DATA_EXPORT_CHUNK_SIZE = config("DATA_EXPORT_CHUNK_SIZE", default=500, cast=int)
+DATA_EXPORT_ASYNC_THRESHOLD = config(
+    "DATA_EXPORT_ASYNC_THRESHOLD", default=5000, cast=int
+)
+
+# Data imports: rows processed per task and the delay in seconds after which
+# an import without progress is resumed from its last completed chunk
+DATA_IMPORT_CHUNK_SIZE = config("DATA_IMPORT_CHUNK_SIZE", default=500, cast=int)
+DATA_IMPORT_RESUME_DELAY = config("DATA_IMPORT_RESUME_DELAY", default=900, cast=int)
+
+# Carrier connections resolution cache TTL in seconds (opt-in, 0 disables it).
+# Only enable it with a cache shared by all the processes (REDIS_HOST).
+CARRIERS_CACHE_TTL = config("CARRIERS_CACHE_TTL", default=0, cast=int)
+
+# Seconds between two checks of the compiled surcharges against the database
+SURCHARGES_CACHE_TTL = config("SURCHARGES_CACHE_TTL", default=5, cast=int)
+
+# Authentication contexts (tokens, organizations and permissions) cache TTL in
+# seconds (opt-in, 0 disables it). Only enable it with a cache shared by all the
+# processes (REDIS_HOST): revoked tokens are only expired in the shared cache.
+AUTH_CACHE_TTL = config("AUTH_CACHE_TTL", default=0, cast=int)
+
+# Carrier API HTTP transport (keep-alive connection pools)
+CARRIER_HTTP_POOLING = config("CARRIER_HTTP_POOLING", default=True, cast=bool)
+CARRIER_HTTP_POOL_SIZE = config("CARRIER_HTTP_POOL_SIZE", default=10, cast=int)
+CARRIER_HTTP_CONNECT_TIMEOUT = config(
+    "CARRIER_HTTP_CONNECT_TIMEOUT", default=10, cast=float
+)
+CARRIER_HTTP_READ_TIMEOUT = config("CARRIER_HTTP_READ_TIMEOUT", default=60, cast=float)
+# e.g: CARRIER_HTTP_HOST_LIMITS="apis.fedex.com:4,onlinetools.ups.com:8"
+CARRIER_HTTP_HOST_LIMITS = {
+    host.strip(): int(limit)
+    for host, limit in [
+        item.split(":")
+        for item in config("CARRIER_HTTP_HOST_LIMITS", default="").split(",")
+        if ":" in item
+    ]
+}
+
+# Rates fan-out (0 means no limit)
+RATES_DEADLINE = config("RATES_DEADLINE", default=0, cast=float)
+RATES_CARRIER_TIMEOUT = config("RATES_CARRIER_TIMEOUT", default=0, cast=float)
+RATES_MAX_CONCURRENCY = config("RATES_MAX_CONCURRENCY", default=0, cast=int)
+# e.g: RATES_CARRIER_TIMEOUTS="fedex:5,ups:3.5" (carrier_name or carrier_id)
+RATES_CARRIER_TIMEOUTS = {
+    carrier.strip(): float(timeout)
+    for carrier, timeout in [
+        item.split(":")
+        for item in config("RATES_CARRIER_TIMEOUTS", default="").split(",")
+        if ":" in item
+    ]
+}
+
+# Rates quotes cache (opt-in, never applied to test mode requests)
+RATES_CACHE_ENABLED = config("RATES_CACHE_ENABLED", default=False, cast=bool)
+RATES_CACHE_TTL = config("RATES_CACHE_TTL", default=300, cast=int)
+# e.g: RATES_CACHE_TTLS="fedex:600,ups:120" (carrier_name or carrier_id)
+RATES_CACHE_TTLS = {
+    carrier.strip(): int(ttl)
+    for carrier, ttl in [
+        item.split(":")
+        for item in config("RATES_CACHE_TTLS", default="").split(",")
+        if ":" in item
+    ]
+}
 
 
 # Feature flags
@@ -368,10 +493,16 @@ REST_FRAMEWORK = {
         "no_underscore_before_number": True,
     },
     "TEST_REQUEST_DEFAULT_FORMAT": "json",
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.LimitOffsetPagination",
+    "DEFAULT_PAGINATION_CLASS": "karrio.server.core.pagination.LimitOffsetPagination",
     "PAGE_SIZE": 100,
 }
 
+# List endpoints count (use the query planner estimate above the threshold)
+PAGINATION_COUNT_ESTIMATE = config("PAGINATION_COUNT_ESTIMATE", default=False, cast=bool)
+PAGINATION_COUNT_ESTIMATE_THRESHOLD = config(
+    "PAGINATION_COUNT_ESTIMATE_THRESHOLD", default=1000, cast=int
+)
+
 # JWT config
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=30),
@@ -1,6 +1,7 @@
 import os
 import decouple
-from huey import SqliteHuey
+import urllib.parse
+from huey import SqliteHuey, RedisHuey
 from karrio.server.settings import base as settings
 
 # Karrio Server Background jobs interval config
@@ -9,6 +10,58 @@ DEFAULT_TRACKERS_UPDATE_INTERVAL = decouple.config(
     "TRACKING_PULSE", default=7200, cast=int
 )  # value is seconds. so 10800 seconds = 3 Hours
 
+# Trackers refresh scheduler (intervals in seconds)
+TRACKERS_SCHEDULER_INTERVAL = decouple.config(
+    "TRACKERS_SCHEDULER_INTERVAL", default=600, cast=int
+)
+TRACKERS_MIN_POLL_INTERVAL = decouple.config(
+    "TRACKERS_MIN_POLL_INTERVAL", default=1800, cast=int
+)
+TRACKERS_MAX_POLL_INTERVAL = decouple.config(
+    "TRACKERS_MAX_POLL_INTERVAL", default=86400, cast=int
+)
+TRACKERS_UPDATE_CONCURRENCY = decouple.config(
+    "TRACKERS_UPDATE_CONCURRENCY", default=4, cast=int
+)
+# batch size (tracking numbers per request) and rate limit (requests per second)
+# e.g: TRACKERS_BATCH_SIZES="fedex:30,ups:1" (carrier_name or carrier_id)
+TRACKERS_BATCH_SIZE = decouple.config("TRACKERS_BATCH_SIZE", default=10, cast=int)
+TRACKERS_BATCH_SIZES = {
+    carrier.strip(): int(size)
+    for carrier, size in [
+        item.split(":")
+        for item in decouple.config("TRACKERS_BATCH_SIZES", default="").split(",")
+        if ":" in item
+    ]
+}
+TRACKERS_RATE_LIMIT = decouple.config("TRACKERS_RATE_LIMIT", default=1.0, cast=float)
+TRACKERS_RATE_LIMITS = {
+    carrier.strip(): float(limit)
+    for carrier, limit in [
+        item.split(":")
+        for item in decouple.config("TRACKERS_RATE_LIMITS", default="").split(",")
+        if ":" in item
+    ]
+}
+
+# Webhooks delivery (timeouts and retry delay in seconds)
+WEBHOOK_CONNECT_TIMEOUT = decouple.config(
+    "WEBHOOK_CONNECT_TIMEOUT", default=3, cast=float
+)
+WEBHOOK_TIMEOUT = decouple.config("WEBHOOK_TIMEOUT", default=10, cast=float)
+WEBHOOK_MAX_ATTEMPTS = decouple.config("WEBHOOK_MAX_ATTEMPTS", default=5, cast=int)
+WEBHOOK_RETRY_DELAY = decouple.config("WEBHOOK_RETRY_DELAY", default=60, cast=int)
+WEBHOOK_DELIVERY_CONCURRENCY = decouple.config(
+    "WEBHOOK_DELIVERY_CONCURRENCY", default=8, cast=int
+)
+WEBHOOK_ENDPOINT_CONCURRENCY = decouple.config(
+    "WEBHOOK_ENDPOINT_CONCURRENCY", default=2, cast=int
+)
+# Days the delivered and failed webhook deliveries are kept
+WEBHOOK_DELIVERY_RETENTION = decouple.config(
+    "WEBHOOK_DELIVERY_RETENTION", default=30, cast=int
+)
+
 
 WORKER_DB_DIR = decouple.config("WORKER_DB_DIR", default=settings.WORK_DIR)
 WORKER_DB_FILE_NAME = os.path.join(WORKER_DB_DIR, "tasks.sqlite3")
@@ -19,8 +72,51 @@ settings.DATABASES["workers"] = {
     "ENGINE": "django.db.backends.sqlite3",
 }
 
-HUEY = SqliteHuey(
-    name="default",
-    filename=WORKER_DB_FILE_NAME,
-    **({"immediate": WORKER_IMMEDIATE_MODE} if WORKER_IMMEDIATE_MODE else {})
-)
+# Background jobs broker: "sqlite" (single host), "redis" or "postgres".
+# WORKER_BROKER_URL defaults to the REDIS_HOST or the default database.
+WORKER_BROKER = decouple.config("WORKER_BROKER", default="sqlite")
+WORKER_BROKER_URL = decouple.config("WORKER_BROKER_URL", default=None)
+# Named queues consumed by dedicated workers (`karrio run_queue <name>`) with
+# their worker count. Tasks of the queues not listed run on the default queue.
+# e.g: WORKER_QUEUES="tracking:4,webhooks:8,data:2"
+WORKER_QUEUES = {
+    name.strip(): int(workers or 1)
+    for name, workers in [
+        (item.split(":") + [""])[:2]
+        for item in decouple.config("WORKER_QUEUES", default="").split(",")
+        if item.strip()
+    ]
+}
+
+
+def _broker_url() -> str:
+    if WORKER_BROKER_URL:
+        return WORKER_BROKER_URL
+
+    if WORKER_BROKER == "redis":
+        host = decouple.config("REDIS_HOST", default="127.0.0.1")
+        port = decouple.config("REDIS_PORT", default="6379")
+        return f"redis://{host}:{port}/2"
+
+    db = settings.DATABASES["default"]
+    user = urllib.parse.quote(str(db["USER"] or ""), safe="")
+    password = urllib.parse.quote(str(db["PASSWORD"] or ""), safe="")
+    return f"postgresql://{user}:{password}@{db['HOST']}:{db['PORT']}/{db['NAME']}"
+
+
+def _create_huey(name: str):
+    options = {"immediate": WORKER_IMMEDIATE_MODE} if WORKER_IMMEDIATE_MODE else {}
+
+    if WORKER_BROKER == "redis":
+        return RedisHuey(name=name, url=_broker_url(), **options)
+
+    if WORKER_BROKER == "postgres":
+        from huey.contrib.sql_huey import SqlHuey
+
+        return SqlHuey(name=name, database=_broker_url(), **options)
+
+    return SqliteHuey(name=name, filename=WORKER_DB_FILE_NAME, **options)
+
+
+HUEY = _create_huey("default")
+HUEY_QUEUES = {name: _create_huey(name) for name in WORKER_QUEUES}
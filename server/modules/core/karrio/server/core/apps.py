@@ -5,8 +5,32 @@ class CoreConfig(AppConfig):
     name = 'karrio.server.core'
 
     def ready(self):
+        import karrio.server.core.lookups  # noqa: F401 registers the JSON lookups
         from constance import config
         from constance.signals import config_updated
-        from karrio.server.core.signals import update_settings, constance_updated
+        from karrio.server.core.signals import (
+            update_settings,
+            constance_updated,
+            register_signals,
+        )
         config_updated.connect(constance_updated)
+        register_signals()
         update_settings(config)
+        configure_carrier_transport()
+
+
+def configure_carrier_transport():
+    from django.conf import settings
+    from karrio.core.utils import transport
+
+    transport.configure(
+        pool_size=getattr(settings, "CARRIER_HTTP_POOL_SIZE", transport.DEFAULT_POOL_SIZE),
+        host_limits=getattr(settings, "CARRIER_HTTP_HOST_LIMITS", {}),
+        connect_timeout=getattr(
+            settings, "CARRIER_HTTP_CONNECT_TIMEOUT", transport.DEFAULT_CONNECT_TIMEOUT
+        ),
+        read_timeout=getattr(
+            settings, "CARRIER_HTTP_READ_TIMEOUT", transport.DEFAULT_READ_TIMEOUT
+        ),
+        pooling=getattr(settings, "CARRIER_HTTP_POOLING", True),
+    )
@@ -1,9 +1,15 @@
 import yaml # type: ignore
+import json
+import uuid
 import pydoc
+import typing
+import hashlib
 import logging
 import functools
 from django.db.utils import ProgrammingError
+from django.apps import apps
 from django.conf import settings
+from django.core.cache import cache
 from django.contrib.auth import mixins, get_user_model
 from django.utils.translation import gettext_lazy as _
 from django.utils.functional import SimpleLazyObject
@@ -27,6 +33,8 @@ from django_otp.middleware import OTPMiddleware
 logger = logging.getLogger(__name__)
 UserModel = get_user_model()
 AUTHENTICATION_CLASSES = getattr(settings, "AUTHENTICATION_CLASSES", [])
+AUTH_CACHE_VERSION_KEY = "karrio:auth:version"
+AUTH_CACHE_EXCLUDED_FIELDS = ["password"]
 
 
 def catch_auth_exception(func):
@@ -54,6 +62,9 @@ class TokenAuthentication(BaseTokenAuthentication):
 
         return Token
 
+    def authenticate_credentials(self, key):
+        return authenticate_token(key, _("Invalid token."))
+
     @catch_auth_exception
     def authenticate(self, request):
         auth = super().authenticate(request)
@@ -98,18 +109,7 @@ class TokenBasicAuthentication(BaseBasicAuthentication):
         """
         Authenticate the api token with optional request for context.
         """
-        from karrio.server.user.models import Token
-
-        token = Token.objects.filter(key=api_key).first()
-        user = getattr(token, "user", None)
-
-        if user is None:
-            raise exceptions.AuthenticationFailed(_("Invalid username/password."))
-
-        if not user.is_active:
-            raise exceptions.AuthenticationFailed(_("User inactive or deleted."))
-
-        return (user, token)
+        return authenticate_token(api_key, _("Invalid username/password."))
 
 
 class JWTAuthentication(BaseJWTAuthentication):
@@ -210,14 +210,8 @@ class AuthenticationMiddleware(BaseAuthenticationMiddleware):
         """
         if settings.MULTI_ORGANIZATIONS:
             try:
-                from karrio.server.orgs.models import Organization
-
-                org_id = request.META.get("HTTP_X_ORG_ID")
-                orgs = Organization.objects.filter(users__id=request.user.id)
-                org = (
-                    orgs.filter(id=org_id).first()
-                    if org_id is not None
-                    else orgs.filter(is_active=True).first()
+                org = find_user_org(
+                    request.user.id, org_id=request.META.get("HTTP_X_ORG_ID")
                 )
 
                 # org was found but is not active
@@ -257,18 +251,11 @@ def get_request_org(request, user, org_id: str = None, default_org=None):
     """
     if settings.MULTI_ORGANIZATIONS:
         try:
-            from karrio.server.orgs.models import Organization
-
             if default_org is not None:
                 org = default_org
 
             else:
-                orgs = Organization.objects.filter(users__id=user.id)
-                org = (
-                    orgs.filter(id=org_id).first()
-                    if org_id is not None
-                    else orgs.filter(is_active=True).first()
-                )
+                org = find_user_org(user.id, org_id=org_id)
 
             if org is not None and not org.is_active:
                 raise exceptions.AuthenticationFailed(
@@ -288,6 +275,155 @@ def get_request_org(request, user, org_id: str = None, default_org=None):
         return None
 
 
+def authenticate_token(key: str, error: str):
+    token = resolve_cached(
+        ("token", key),
+        lambda: _load_token(key),
+        dump=_dump_token,
+        load=_restore_token,
+    )
+    user = getattr(token, "user", None)
+
+    if user is None:
+        raise exceptions.AuthenticationFailed(error)
+
+    if not user.is_active:
+        raise exceptions.AuthenticationFailed(_("User inactive or deleted."))
+
+    return (user, token)
+
+
+def find_user_org(user_id, org_id: str = None):
+    """Return the requested (or first active) organization of a user."""
+
+    def _find():
+        from karrio.server.orgs.models import Organization
+
+        orgs = Organization.objects.filter(users__id=user_id)
+
+        return (
+            orgs.filter(id=org_id).first()
+            if org_id is not None
+            else orgs.filter(is_active=True).first()
+        )
+
+    return resolve_cached(
+        ("org", user_id, org_id), _find, dump=dump_instance, load=restore_instance
+    )
+
+
+def resolve_cached(
+    key: tuple,
+    resolve: typing.Callable[[], typing.Any],
+    dump: typing.Callable[[typing.Any], typing.Any] = None,
+    load: typing.Callable[[typing.Any], typing.Any] = None,
+):
+    """Resolve an authentication context object (token, organization,
+    permissions...) through the Django cache.
+
+    Resolutions are kept for AUTH_CACHE_TTL seconds and all expire on
+    tokens, users, organizations or permissions changes.
+    Model instances are cached as plain values with `dump` and rebuilt
+    with `load` (see `dump_instance`).
+    """
+    from karrio.server.conf import settings as conf
+
+    ttl = getattr(settings, "AUTH_CACHE_TTL", 0)
+
+    if ttl <= 0:
+        return resolve()
+
+    identity = [
+        cache.get_or_set(AUTH_CACHE_VERSION_KEY, uuid.uuid4().hex, None),
+        conf.schema,
+        *key,
+    ]
+    digest = hashlib.sha1(
+        json.dumps(identity, default=str).encode("utf-8")
+    ).hexdigest()
+    cache_key = f"karrio:auth:{digest}"
+    entry = cache.get(cache_key)
+
+    if entry is None:
+        value = resolve()
+        cache.set(cache_key, (dump(value) if dump else value,), ttl)
+
+        return value
+
+    return load(entry[0]) if load else entry[0]
+
+
+def dump_instance(instance) -> typing.Optional[tuple]:
+    """Return the (model label, field names, values) of a model instance
+    without its sensitive fields (e.g. the user password hash)."""
+    if instance is None:
+        return None
+
+    fields = [
+        field
+        for field in instance._meta.concrete_fields
+        if field.name not in AUTH_CACHE_EXCLUDED_FIELDS
+    ]
+
+    return (
+        instance._meta.label,
+        [field.attname for field in fields],
+        [getattr(instance, field.attname) for field in fields],
+    )
+
+
+def restore_instance(values: typing.Optional[tuple]):
+    """Rebuild a model instance from `dump_instance` values.
+
+    The excluded fields are deferred (loaded from the database on access).
+    """
+    if values is None:
+        return None
+
+    label, field_names, field_values = values
+
+    return apps.get_model(label).from_db(None, field_names, field_values)
+
+
+def invalidate_auth_cache():
+    """Expire all the cached authentication context resolutions."""
+    cache.set(AUTH_CACHE_VERSION_KEY, uuid.uuid4().hex, None)
+
+
+def _load_token(key: str):
+    from karrio.server.user.models import Token
+
+    token = Token.objects.select_related("user").filter(key=key).first()
+
+    if token is not None:
+        token.organization  # resolved ahead to be cached with the token
+
+    return token
+
+
+def _dump_token(token) -> typing.Optional[tuple]:
+    if token is None:
+        return None
+
+    return (
+        dump_instance(token),
+        dump_instance(token.user),
+        dump_instance(token.organization),
+    )
+
+
+def _restore_token(values: typing.Optional[tuple]):
+    if values is None:
+        return None
+
+    token_values, user_values, org_values = values
+    token = restore_instance(token_values)
+    token.user = restore_instance(user_values)
+    token.__dict__["organization"] = restore_instance(org_values)
+
+    return token
+
+
 def get_request_user(request, user):
     if not getattr(request, "otp_is_verified", True):
         raise exceptions.AuthenticationFailed(
@@ -15,6 +15,7 @@ from karrio.core.models import (
     ShipmentRequest as BaseShipmentRequest,
     ShipmentCancelRequest,
     ChargeDetails,
+    RateDetails,
     PickupRequest as BasePickupRequest,
     PickupDetails,
     PickupUpdateRequest as BasePickupUpdateRequest,
@@ -7,10 +7,8 @@ import karrio.core.units as units
 import karrio.server.providers.models as providers
 
 
-PACKAGE_MAPPERS = references.collect_providers_data()
-
 REFERENCE_MODELS = {
-    **references.collect_references(),
+    **references.collect_references(cache_file=settings.REFERENCES_CACHE_FILE),
     "customs_content_type": {c.name: c.value for c in list(units.CustomsContentType)},
     "incoterms": {c.name: c.value for c in list(units.Incoterm)},
 }
@@ -31,6 +29,15 @@ NON_HUBS_CARRIERS = [
 ]
 
 
+def __getattr__(name: str):
+    # The providers data requires importing every carrier extension, so it is
+    # only collected when accessed (see REFERENCES_CACHE_FILE lazy loading).
+    if name == "PACKAGE_MAPPERS":
+        return references.collect_providers_data()
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 def contextual_metadata(request: Request):
     host = (
         request.build_absolute_uri(reverse("karrio.server.core:metadata", kwargs={}))
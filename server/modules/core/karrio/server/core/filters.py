@@ -2,12 +2,26 @@ import typing
 from django.db.models import Q
 from django_filters import rest_framework as filters
 
-from karrio.server.core import dataunits
+from karrio.server.core import dataunits, search
 from karrio.server.core import serializers
 import karrio.server.tracing.models as tracing
 import karrio.server.core.models as core
 
 
+# the recipient fields searched while a shipment has no search document yet.
+ADDRESS_SEARCH_FIELDS = [
+    "recipient__address_line1",
+    "recipient__address_line2",
+    "recipient__postal_code",
+    "recipient__person_name",
+    "recipient__company_name",
+    "recipient__country_code",
+    "recipient__city",
+    "recipient__email",
+    "recipient__phone_number",
+]
+
+
 class CharInFilter(filters.BaseInFilter, filters.CharFilter):
     pass
 
@@ -88,31 +102,15 @@ class ShipmentFilters(filters.FilterSet):
         fields: typing.List[str] = []
 
     def address_filter(self, queryset, name, value):
-        return queryset.filter(
-            Q(recipient__address_line1__icontains=value)
-            | Q(recipient__address_line2__icontains=value)
-            | Q(recipient__postal_code__icontains=value)
-            | Q(recipient__person_name__icontains=value)
-            | Q(recipient__company_name__icontains=value)
-            | Q(recipient__country_code__icontains=value)
-            | Q(recipient__city__icontains=value)
-            | Q(recipient__email__icontains=value)
-            | Q(recipient__phone_number__icontains=value)
-        )
+        return queryset.filter(search.fields_filter(value, *ADDRESS_SEARCH_FIELDS))
 
     def keyword_filter(self, queryset, name, value):
-        return queryset.filter(
-            Q(recipient__address_line1__icontains=value)
-            | Q(recipient__address_line2__icontains=value)
-            | Q(recipient__postal_code__icontains=value)
-            | Q(recipient__person_name__icontains=value)
-            | Q(recipient__company_name__icontains=value)
-            | Q(recipient__country_code__icontains=value)
-            | Q(recipient__city__icontains=value)
-            | Q(recipient__email__icontains=value)
-            | Q(recipient__phone_number__icontains=value)
-            | Q(tracking_number__icontains=value)
-            | Q(reference__icontains=value)
+        return search.keyword_search(
+            queryset,
+            value,
+            *ADDRESS_SEARCH_FIELDS,
+            "tracking_number",
+            "reference",
         )
 
     def carrier_filter(self, queryset, name, values):
@@ -135,25 +133,13 @@ class ShipmentFilters(filters.FilterSet):
         return queryset.filter(Q(options__has_keys=value))
 
     def option_value_filter(self, queryset, name, value):
-        return queryset.filter(
-            id__in=[
-                o["id"]
-                for o in queryset.values("id", "options")
-                if value in (o.get("options") or {}).values()
-            ]
-        )
+        return queryset.filter(options__has_value=value)
 
     def metadata_key_filter(self, queryset, name, value):
         return queryset.filter(metadata__has_keys=value)
 
     def metadata_value_filter(self, queryset, name, value):
-        return queryset.filter(
-            id__in=[
-                o["id"]
-                for o in queryset.values("id", "metadata")
-                if value in (o.get("metadata") or {}).values()
-            ]
-        )
+        return queryset.filter(metadata__has_value=value)
 
     def service_filter(self, queryset, name, values):
         return queryset.filter(Q(selected_rate__service__in=values))
@@ -191,6 +177,20 @@ class TrackerFilters(filters.FilterSet):
         Values: {', '.join([f"`{s.name}`" for s in list(serializers.TrackerStatus)])}
         """,
     )
+    keyword = filters.CharFilter(
+        method="keyword_filter",
+        help_text="tracker' keyword and indexes search",
+    )
+    metadata_key = CharInFilter(
+        field_name="metadata",
+        method="metadata_key_filter",
+        help_text="tracker metadata keys.",
+    )
+    metadata_value = filters.CharFilter(
+        field_name="metadata",
+        method="metadata_value_filter",
+        help_text="tracker metadata value",
+    )
 
     class Meta:
         import karrio.server.manager.models as manager
@@ -209,6 +209,15 @@ class TrackerFilters(filters.FilterSet):
 
         return queryset.filter(query)
 
+    def keyword_filter(self, queryset, name, value):
+        return search.keyword_search(queryset, value, "tracking_number")
+
+    def metadata_key_filter(self, queryset, name, value):
+        return queryset.filter(metadata__has_keys=value)
+
+    def metadata_value_filter(self, queryset, name, value):
+        return queryset.filter(metadata__has_value=value)
+
 
 class LogFilter(filters.FilterSet):
     api_endpoint = filters.CharFilter(field_name="path", lookup_expr="icontains")
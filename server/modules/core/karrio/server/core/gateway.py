@@ -1,10 +1,15 @@
+import json
 import uuid
+import collections
 import typing
+import hashlib
+import functools
 import logging
 from datetime import datetime
 
-from django.db.models import Q
+from django.db.models import Q, QuerySet
 from django.conf import settings
+from django.core.cache import cache
 from rest_framework import status
 from rest_framework.exceptions import NotFound
 
@@ -22,11 +27,157 @@ from karrio.server.core import (
 )
 
 logger = logging.getLogger(__name__)
+CARRIERS_CACHE_VERSION_KEY = "karrio:carriers:version"
+
+
+class CarrierResolution(typing.NamedTuple):
+    carriers: QuerySet
+    services: typing.Dict[str, typing.List[str]]
 
 
 class Carriers:
     @staticmethod
-    def list(context=None, **kwargs) -> typing.List[providers.Carrier]:
+    def list(context=None, **kwargs) -> QuerySet:
+        list_filter = kwargs.copy()
+        services = list_filter.pop("services", None) or []
+        raise_not_found = list_filter.pop("raise_not_found", False)
+        resolution = Carriers.resolve(context, **list_filter)
+        carriers = resolution.carriers
+
+        # Check if a list of services is provided, to keep only the carriers offering them
+        if any(service in resolution.services for service in services):
+            carrier_ids = set(
+                id
+                for service in services
+                for id in resolution.services.get(service, [])
+            )
+            carriers = carriers.filter(pk__in=carrier_ids)
+
+        providers.prefetch_settings(carriers)
+
+        # Raise an error if no carrier is found
+        if raise_not_found and len(carriers) == 0:
+            raise NotFound("No active carrier connection found to process the request")
+
+        return carriers
+
+    @staticmethod
+    def first(**kwargs) -> providers.Carrier:
+        return next(iter(Carriers.list(**kwargs)), None)
+
+    @staticmethod
+    def resolve(context=None, **list_filter) -> CarrierResolution:
+        """Resolve the carriers accessible in a context with their services index.
+
+        Resolutions are memoized for the current request. With a
+        CARRIERS_CACHE_TTL set, the resolved carrier ids are also cached per
+        org/user in the Django cache (which must be shared by all the
+        processes, e.g. Redis, for the invalidations to reach them).
+        """
+        from karrio.server.core import middleware
+
+        ttl = getattr(settings, "CARRIERS_CACHE_TTL", 0)
+        key = Carriers._resolution_key(context, list_filter, versioned=ttl > 0)
+        request = middleware.SessionContext.get_current_request()
+        request_cache = getattr(request, "_carriers_resolutions", None)
+
+        if request is not None and request_cache is None:
+            request_cache = request._carriers_resolutions = {}
+
+        if request_cache is not None and key in request_cache:
+            return request_cache[key]
+
+        cached = cache.get(key) if ttl > 0 else None
+
+        if cached is not None:
+            ids, services = cached
+            resolution = CarrierResolution(
+                carriers=providers.Carrier.objects.filter(pk__in=ids),
+                services=services,
+            )
+        else:
+            carriers = Carriers._query(context, **list_filter)
+            providers.prefetch_settings(carriers)
+            resolution = CarrierResolution(
+                carriers=carriers, services=Carriers._services_index(carriers)
+            )
+
+            if ttl > 0:
+                cache.set(key, ([c.pk for c in carriers], resolution.services), ttl)
+
+        if request_cache is not None:
+            request_cache[key] = resolution
+
+        return resolution
+
+    @staticmethod
+    def invalidate_cache():
+        """Expire all the cached carrier resolutions (and the current request ones)."""
+        from karrio.server.core import middleware
+
+        request = middleware.SessionContext.get_current_request()
+
+        if hasattr(request, "_carriers_resolutions"):
+            request._carriers_resolutions = {}
+
+        cache.set(CARRIERS_CACHE_VERSION_KEY, uuid.uuid4().hex, None)
+
+    @staticmethod
+    def _resolution_key(context, list_filter: dict, versioned: bool = False) -> str:
+        from karrio.server.conf import settings as conf
+
+        identity = dict(
+            version=(
+                cache.get_or_set(CARRIERS_CACHE_VERSION_KEY, uuid.uuid4().hex, None)
+                if versioned
+                else None
+            ),
+            schema=conf.schema,
+            user=getattr(getattr(context, "user", None), "id", None),
+            org=getattr(getattr(context, "org", None), "id", None),
+            test_mode=getattr(context, "test_mode", None),
+            filter=list_filter,
+        )
+        digest = hashlib.sha1(
+            json.dumps(identity, sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()
+
+        return f"karrio:carriers:{digest}"
+
+    @staticmethod
+    def _services_index(
+        carriers: QuerySet,
+    ) -> typing.Dict[str, typing.List[str]]:
+        """Map every known service code to the ids of the carriers offering it."""
+        extensions = {Model: name for name, Model in providers.MODELS.items()}
+        services: typing.Dict[str, typing.Set[str]] = {
+            name: set(codes.keys())
+            for name, codes in dataunits.REFERENCE_MODELS["services"].items()
+        }
+
+        for carrier in carriers:
+            if hasattr(carrier.settings, "custom_carrier_name"):
+                services.setdefault(carrier.settings.custom_carrier_name, set()).update(
+                    service.service_code for service in carrier.settings.services.all()
+                )
+
+        index: typing.Dict[str, typing.List[str]] = {
+            code: [] for codes in services.values() for code in codes
+        }
+
+        for carrier in carriers:
+            names = [
+                extensions.get(type(carrier.settings)),
+                getattr(carrier.settings, "custom_carrier_name", None),
+            ]
+
+            for code in set().union(*[services.get(name, set()) for name in names]):
+                index[code].append(carrier.id)
+
+        return index
+
+    @staticmethod
+    def _query(context=None, **kwargs) -> QuerySet:
         query: typing.Any = tuple()
         list_filter = kwargs.copy()
         user_filter = core.get_access_filter(context) if context is not None else []
@@ -85,32 +236,6 @@ class Carriers:
         if any(list_filter.get("carrier_ids", [])):
             query += (Q(carrier_id__in=list_filter["carrier_ids"]),)
 
-        if any(list_filter.get("services", [])):
-            carrier_names = [
-                name
-                for name, services in dataunits.contextual_reference(context)[
-                    "services"
-                ].items()
-                if any(
-                    service in list_filter["services"] for service in services.keys()
-                )
-            ]
-
-            if len(carrier_names) > 0:
-                _queries = (
-                    Q(**{f"{carrier_names[0].replace('_', '')}settings__isnull": False})
-                    if carrier_names[0] in providers.MODELS.keys()
-                    else Q(genericsettings__custom_carrier_name=carrier_names[0])
-                )
-                for carrier_name in carrier_names[1:]:
-                    _queries |= (
-                        Q(**{f"{carrier_name.replace('_', '')}settings__isnull": False})
-                        if carrier_name in providers.MODELS.keys()
-                        else Q(genericsettings__custom_carrier_name=carrier_name)
-                    )
-
-                query += (_queries,)
-
         if "carrier_name" in list_filter:
             carrier_name = list_filter["carrier_name"]
 
@@ -121,17 +246,7 @@ class Carriers:
 
             query += (Q(**{f"{carrier_name.replace('_', '')}settings__isnull": False}),)
 
-        carriers = providers.Carrier.objects.filter(*query)
-
-        # Raise an error if no carrier is found
-        if list_filter.get("raise_not_found") and len(carriers) == 0:
-            raise NotFound("No active carrier connection found to process the request")
-
-        return carriers
-
-    @staticmethod
-    def first(**kwargs) -> providers.Carrier:
-        return next(iter(Carriers.list(**kwargs)), None)
+        return providers.Carrier.objects.filter(*query)
 
 
 class Address:
@@ -501,8 +616,84 @@ class Rates:
 
     @staticmethod
     def fetch(
-        payload: dict, carriers: typing.List[providers.Carrier] = None, **carrier_filters,
+        payload: dict,
+        carriers: typing.List[providers.Carrier] = None,
+        use_cache: bool = True,
+        **carrier_filters,
     ) -> datatypes.RateResponse:
+        carriers, gateways = Rates.resolve_gateways(
+            payload, carriers, **carrier_filters
+        )
+        quotes = RatesCache(
+            payload, carriers, carrier_filters.get("context"), use_cache
+        )
+        cached_rates = quotes.lookup(gateways)
+        pending_gateways = [g for g in gateways if g.settings.id not in cached_rates]
+        rates: typing.List[datatypes.RateDetails] = []
+        messages: typing.List[datatypes.Message] = []
+
+        if any(pending_gateways):
+            request = Rates.rating_request(payload)
+
+            # The request call is wrapped in utils.identity to simplify mocking in tests
+            rates, messages = utils.identity(
+                lambda: request.from_(*pending_gateways).parse()
+            )
+            quotes.store(pending_gateways, rates or [], messages)
+
+        rates = sum(cached_rates.values(), []) + (rates or [])
+
+        if not any(rates) and any(messages):
+            raise exceptions.APIException(
+                detail=messages,
+                status_code=status.HTTP_424_FAILED_DEPENDENCY,
+            )
+
+        return Rates.rate_response(rates, messages, carriers)
+
+    @staticmethod
+    def stream(
+        payload: dict,
+        carriers: typing.List[providers.Carrier] = None,
+        use_cache: bool = True,
+        **carrier_filters,
+    ) -> typing.Iterator[datatypes.RateResponse]:
+        """Fetch the rates yielding a post processed response per carrier as they arrive"""
+        context = carrier_filters.get("context")
+        carriers, gateways = Rates.resolve_gateways(
+            payload, carriers, **carrier_filters
+        )
+        quotes = RatesCache(payload, carriers, context, use_cache)
+        cached_rates = quotes.lookup(gateways)
+        pending_gateways = [g for g in gateways if g.settings.id not in cached_rates]
+        request = Rates.rating_request(payload)
+
+        def process(rates, messages) -> datatypes.RateResponse:
+            return functools.reduce(
+                lambda cummulated_result, process: process(context, cummulated_result),
+                Rates.post_process_functions,
+                Rates.rate_response(rates, messages, carriers),
+            )
+
+        def responses():
+            if any(cached_rates):
+                yield process(sum(cached_rates.values(), []), [])
+
+            if not any(pending_gateways):
+                return
+
+            for response in request.stream(*pending_gateways):
+                rates, messages = response.parse()
+                quotes.store(pending_gateways, rates or [], messages)
+
+                yield process(rates or [], messages)
+
+        return responses()
+
+    @staticmethod
+    def resolve_gateways(
+        payload: dict, carriers: typing.List[providers.Carrier] = None, **carrier_filters,
+    ) -> typing.Tuple[typing.List[providers.Carrier], list]:
         carrier_ids = payload.get("carrier_ids", [])
         services = payload.get("services", [])
         shipper_country_code = payload["shipper"].get("country_code")
@@ -525,17 +716,24 @@ class Rates:
         if len(gateways) == 0:
             raise NotFound("No active carrier connection found to process the request")
 
-        request = karrio.Rating.fetch(lib.to_object(datatypes.RateRequest, payload))
-
-        # The request call is wrapped in utils.identity to simplify mocking in tests
-        rates, messages = utils.identity(lambda: request.from_(*gateways).parse())
+        return carriers, gateways
 
-        if not any(rates) and any(messages):
-            raise exceptions.APIException(
-                detail=messages,
-                status_code=status.HTTP_424_FAILED_DEPENDENCY,
-            )
+    @staticmethod
+    def rating_request(payload: dict):
+        return karrio.Rating.fetch(
+            lib.to_object(datatypes.RateRequest, payload),
+            deadline=(settings.RATES_DEADLINE or None),
+            timeout=(settings.RATES_CARRIER_TIMEOUT or None),
+            carrier_timeouts=settings.RATES_CARRIER_TIMEOUTS,
+            max_concurrency=(settings.RATES_MAX_CONCURRENCY or None),
+        )
 
+    @staticmethod
+    def rate_response(
+        rates: typing.List[datatypes.Rate],
+        messages: typing.List[datatypes.Message],
+        carriers: typing.List[providers.Carrier],
+    ) -> datatypes.RateResponse:
         def process_rate(rate: datatypes.Rate) -> datatypes.Rate:
             carrier = next((c for c in carriers if c.carrier_id == rate.carrier_id))
             meta = {
@@ -569,6 +767,142 @@ class Rates:
         )
 
 
+class RatesCache:
+    """Opt-in carrier rates cache (enabled with RATES_CACHE_ENABLED).
+
+    Rates are stored per carrier connection under a fingerprint of the
+    normalised rate request, for RATES_CACHE_TTL seconds (or the carrier
+    specific RATES_CACHE_TTLS). Test mode connections and contexts are never
+    cached and cached rates are marked with `meta.rate_cache_hit`.
+    """
+
+    ADDRESS_FIELDS = [
+        "postal_code",
+        "country_code",
+        "state_code",
+        "city",
+        "residential",
+    ]
+    PARCEL_EXCLUSIONS = [
+        "id",
+        "object_type",
+        "reference_number",
+        "description",
+        "items",
+    ]
+
+    def __init__(
+        self,
+        payload: dict,
+        carriers: typing.List[providers.Carrier],
+        context=None,
+        use_cache: bool = True,
+    ):
+        self.payload = payload
+        self.carriers = {carrier.id: carrier for carrier in carriers}
+        self.enabled = (
+            settings.RATES_CACHE_ENABLED
+            and use_cache
+            and not getattr(context, "test_mode", False)
+        )
+
+    def lookup(
+        self, gateways: typing.List[typing.Any]
+    ) -> typing.Dict[str, typing.List[datatypes.RateDetails]]:
+        """Return the cached rates by carrier connection id."""
+        keys = {
+            gateway.settings.id: self.key(gateway)
+            for gateway in gateways
+            if self.cacheable(gateway)
+        }
+        entries = cache.get_many(list(keys.values())) if any(keys) else {}
+
+        return {
+            id: [
+                lib.to_object(
+                    datatypes.RateDetails,
+                    {
+                        **rate,
+                        "meta": {**(rate.get("meta") or {}), "rate_cache_hit": True},
+                    },
+                )
+                for rate in entries[key]
+            ]
+            for id, key in keys.items()
+            if key in entries
+        }
+
+    def store(
+        self,
+        gateways: typing.List[typing.Any],
+        rates: typing.List[datatypes.RateDetails],
+        messages: typing.List[datatypes.Message],
+    ):
+        """Cache the rates of the connections that returned rates without errors.
+
+        Rates only identify their connection by `carrier_id` which is not unique
+        across connections: the connections sharing a `carrier_id` are not cached.
+        """
+        carrier_ids = collections.Counter(g.settings.carrier_id for g in gateways)
+
+        for gateway in [
+            g
+            for g in gateways
+            if self.cacheable(g) and carrier_ids[g.settings.carrier_id] == 1
+        ]:
+            carrier_id = gateway.settings.carrier_id
+            carrier_rates = [r for r in rates if r.carrier_id == carrier_id]
+            has_messages = any(m.carrier_id == carrier_id for m in messages)
+
+            if any(carrier_rates) and not has_messages:
+                cache.set(
+                    self.key(gateway), lib.to_dict(carrier_rates), self.ttl(gateway)
+                )
+
+    def cacheable(self, gateway) -> bool:
+        return (
+            self.enabled
+            and gateway.settings.test_mode is not True
+            and gateway.settings.id in self.carriers
+        )
+
+    def ttl(self, gateway) -> int:
+        ttls = settings.RATES_CACHE_TTLS or {}
+
+        return ttls.get(
+            gateway.settings.carrier_id,
+            ttls.get(gateway.settings.carrier_name, settings.RATES_CACHE_TTL),
+        )
+
+    def key(self, gateway) -> str:
+        carrier = self.carriers[gateway.settings.id]
+        request = lib.to_dict(lib.to_object(datatypes.RateRequest, self.payload))
+        fingerprint = dict(
+            connection=[carrier.id, carrier.updated_at],
+            shipper=self.normalize_address(request.get("shipper") or {}),
+            recipient=self.normalize_address(request.get("recipient") or {}),
+            parcels=[
+                {k: v for k, v in parcel.items() if k not in self.PARCEL_EXCLUSIONS}
+                for parcel in request.get("parcels") or []
+            ],
+            services=sorted(request.get("services") or []),
+            options=request.get("options") or {},
+        )
+        digest = hashlib.sha256(
+            json.dumps(fingerprint, sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()
+
+        return f"karrio:rates:{digest}"
+
+    @classmethod
+    def normalize_address(cls, address: dict) -> dict:
+        return {
+            key: ("".join(value.split()).upper() if isinstance(value, str) else value)
+            for key, value in address.items()
+            if key in cls.ADDRESS_FIELDS and value is not None
+        }
+
+
 class Documents:
 
     @staticmethod
@@ -0,0 +1,144 @@
+import json
+import typing
+from django.db import connection, transaction
+from rest_framework_tracking.models import APIRequestLog
+
+from karrio.server.conf import settings
+from karrio.server.core import utils
+from karrio.server.core.writers import BatchWriter
+from karrio.server.core.models import APILog, APILogIndex, APILogIndexEntry
+
+
+class LogEntry(typing.NamedTuple):
+    id: typing.Optional[int]
+    fields: dict
+    org_id: typing.Optional[str] = None
+    schema: typing.Optional[str] = None
+
+
+def save_log(entry: LogEntry):
+    """Queue a log for the background writer.
+
+    Logs without a reserved id (databases without sequences) are saved
+    right away.
+    """
+    if entry.id is None:
+        persist_logs([entry], schema=entry.schema)
+    else:
+        APILogWriter.get().put([entry])
+
+
+def reserve_log_id() -> typing.Optional[int]:
+    """Reserve the id of a request log so that it can be referenced (e.g. by
+    the tracing records) before it is written.
+    """
+    if connection.vendor != "postgresql":
+        return None
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT nextval(pg_get_serial_sequence(%s, 'id'))",
+            [APIRequestLog._meta.db_table],
+        )
+        return cursor.fetchone()[0]
+
+
+def load_body(content: typing.Any) -> typing.Any:
+    if isinstance(content, (str, bytes)):
+        try:
+            return json.loads(content)
+        except ValueError:
+            pass
+
+    return content
+
+
+def compact_body(content: typing.Any) -> typing.Optional[str]:
+    """Serialize a logged body with the API_LOGS_REDACTED_FIELDS replaced and
+    truncated to API_LOGS_MAX_BODY_SIZE characters.
+    """
+    if content is None:
+        return None
+
+    redacted = _redact(content, set(settings.API_LOGS_REDACTED_FIELDS or []))
+    body = redacted if isinstance(redacted, str) else json.dumps(redacted, default=str)
+    max_size = settings.API_LOGS_MAX_BODY_SIZE or 0
+
+    if max_size > 0 and len(body) > max_size:
+        return f"{body[:max_size]}... [truncated: {len(body)} chars]"
+
+    return body
+
+
+@utils.tenant_aware
+def persist_logs(entries: typing.List[LogEntry], schema: str = None):
+    """Bulk create the request logs and their organization links."""
+    logs = [
+        APILogIndex(**entry.fields, id=entry.id, apirequestlog_ptr_id=entry.id)
+        for entry in entries
+    ]
+
+    if all(log.id is not None for log in logs):
+        # bulk_create doesn't support multi-table inheritance, the parent and
+        # index rows are bulk created separately with the reserved ids.
+        with transaction.atomic():
+            APIRequestLog.objects.bulk_create(
+                [
+                    APIRequestLog(
+                        **{
+                            field.attname: getattr(log, field.attname)
+                            for field in APIRequestLog._meta.concrete_fields
+                        }
+                    )
+                    for log in logs
+                ]
+            )
+            APILogIndexEntry.objects.bulk_create(
+                [
+                    APILogIndexEntry(
+                        apirequestlog_ptr_id=log.id, entity_id=log.entity_id
+                    )
+                    for log in logs
+                ]
+            )
+    else:
+        for log in logs:
+            log.save()
+
+    links = [
+        (log, entry.org_id)
+        for log, entry in zip(logs, entries)
+        if entry.org_id is not None
+    ]
+
+    if any(links):
+        Link = APILog.link.related.related_model
+        Link.objects.bulk_create(
+            [Link(org_id=org_id, item_id=log.id) for log, org_id in links]
+        )
+
+
+class APILogWriter(BatchWriter):
+    """Background writer of the API request logs (API_LOGS_* settings)."""
+
+    name = "api-logs"
+    settings_prefix = "API_LOGS"
+
+    def persist(self, entries: typing.List[LogEntry], schema: str = None):
+        persist_logs(entries, schema=schema)
+
+
+def _redact(content: typing.Any, fields: typing.Set[str]) -> typing.Any:
+    if isinstance(content, dict):
+        return {
+            key: (
+                f"[redacted: {len(value)} chars]"
+                if key in fields and isinstance(value, str)
+                else _redact(value, fields)
+            )
+            for key, value in content.items()
+        }
+    if isinstance(content, list):
+        return [_redact(value, fields) for value in content]
+
+    return content
@@ -0,0 +1,48 @@
+import json
+from django.db import NotSupportedError
+from django.db.models import JSONField, Lookup
+
+
+@JSONField.register_lookup
+class HasValue(Lookup):
+    """Match the JSON objects having a top level key set to the given value.
+
+    e.g. `Shipment.objects.filter(metadata__has_value="ord_123")`
+
+    On Postgres the lookup is a jsonpath `@?` condition that can be served
+    by a GIN index on the field. SQLite and MySQL scan the object values.
+    """
+
+    lookup_name = "has_value"
+    prepare_rhs = False
+
+    def get_prep_lookup(self):
+        return str(self.rhs)
+
+    def as_postgresql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        path = "$.* ? (@ == %s)" % json.dumps(self.rhs)
+
+        return f"{lhs} @? %s::jsonpath", [*lhs_params, path]
+
+    def as_sqlite(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+
+        return (
+            f"EXISTS (SELECT 1 FROM json_each({lhs}) "
+            "WHERE json_each.type = 'text' AND json_each.value = %s)",
+            [*lhs_params, self.rhs],
+        )
+
+    def as_mysql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+
+        return (
+            f"JSON_CONTAINS(JSON_EXTRACT({lhs}, '$.*'), JSON_QUOTE(%s))",
+            [*lhs_params, self.rhs],
+        )
+
+    def as_sql(self, compiler, connection):
+        raise NotSupportedError(
+            f"The has_value lookup is not supported on {connection.vendor}"
+        )
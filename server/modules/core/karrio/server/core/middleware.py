@@ -34,7 +34,7 @@ class SessionContext:
     def __call__(self, request):
         # Code to be executed for each request before
         # the view (and later middleware) are called.
-        request.tracer = Tracer()
+        request.tracer = self._create_tracer()
         self._threadmap[threading.get_ident()] = request
 
         response = self.get_response(request)
@@ -49,6 +49,11 @@ class SessionContext:
 
         return response
 
+    def _create_tracer(self) -> Tracer:
+        from karrio.server.tracing.utils import create_tracer
+
+        return create_tracer()
+
     def _save_tracing_records(self, request, schema: str = None):
         from karrio.server.tracing.utils import save_tracing_records
 
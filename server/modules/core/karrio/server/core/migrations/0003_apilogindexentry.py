@@ -0,0 +1,35 @@
+# Generated by Django 3.2.16 on 2026-10-18 20:22
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("rest_framework_tracking", "0011_auto_20201117_2016"),
+        ("core", "0002_apilogindex"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="APILogIndexEntry",
+            fields=[
+                (
+                    "apirequestlog_ptr",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="+",
+                        serialize=False,
+                        to="rest_framework_tracking.apirequestlog",
+                    ),
+                ),
+                ("entity_id", models.CharField(max_length=50, null=True)),
+            ],
+            options={
+                "db_table": "core_apilogindex",
+                "managed": False,
+            },
+        ),
+    ]
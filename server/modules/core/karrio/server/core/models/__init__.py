@@ -9,6 +9,7 @@ from karrio.server.core.models.base import (
 from karrio.server.core.models.third_party import (
     APILog,
     APILogIndex,
+    APILogIndexEntry,
 )
 from karrio.server.core.models.entity import Entity, OwnedEntity
 
@@ -16,3 +16,23 @@ class APILog(APIRequestLog, ControlledAccessModel):
 
 class APILogIndex(APILog):
     entity_id = models.CharField(max_length=50, null=True, db_index=True)
+
+
+class APILogIndexEntry(models.Model):
+    """The APILogIndex table without the parent link.
+
+    bulk_create doesn't support multi-table inheritance, the index rows of
+    request logs written with their reserved ids are bulk created with it.
+    """
+
+    apirequestlog_ptr = models.OneToOneField(
+        APIRequestLog,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="+",
+    )
+    entity_id = models.CharField(max_length=50, null=True)
+
+    class Meta:
+        managed = False
+        db_table = "core_apilogindex"
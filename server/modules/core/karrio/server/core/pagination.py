@@ -0,0 +1,138 @@
+import json
+import base64
+import typing
+from django.conf import settings
+from django.db import connections, models
+from rest_framework import pagination
+from rest_framework.exceptions import NotFound
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class LimitOffsetPagination(pagination.LimitOffsetPagination):
+    """Limit/offset paginator slicing querysets in the database.
+
+    Views must paginate the queryset *before* serializing it so that only the
+    requested page is loaded. Passing a `cursor` query parameter (an empty
+    value starts from the first page) switches to keyset pagination over
+    `(created_at, id)`, which stays stable and avoids `OFFSET` scans when
+    paging deep into large tables. Keyset pages don't run a `COUNT(*)`,
+    their `count` is null.
+
+    With `PAGINATION_COUNT_ESTIMATE` enabled, counts above
+    `PAGINATION_COUNT_ESTIMATE_THRESHOLD` are taken from the PostgreSQL
+    query planner instead of running a `COUNT(*)` for every page.
+    """
+
+    cursor_query_param = "cursor"
+    keyset_fields = ("created_at", "id")
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor = None
+        self.keyset = self.cursor_query_param in request.query_params and (
+            self.supports_keyset(queryset)
+        )
+
+        if self.keyset:
+            return self.paginate_keyset(queryset, request)
+
+        return super().paginate_queryset(queryset, request, view)
+
+    def paginate_keyset(self, queryset, request):
+        self.request = request
+        self.limit = self.get_limit(request) or self.default_limit or 20
+        self.offset = 0
+        self.count = None
+        created_at, id = self.keyset_fields
+        queryset = queryset.order_by(f"-{created_at}", f"-{id}")
+        position = self.decode_cursor(request.query_params[self.cursor_query_param])
+
+        if position is not None:
+            queryset = queryset.filter(
+                models.Q(**{f"{created_at}__lt": position[0]})
+                | models.Q(**{created_at: position[0], f"{id}__lt": position[1]})
+            )
+
+        results = list(queryset[: self.limit + 1])
+        page = results[: self.limit]
+
+        if len(results) > self.limit:
+            last = page[-1]
+            self.cursor = self.encode_cursor(
+                getattr(last, created_at), getattr(last, id)
+            )
+
+        return page
+
+    def get_next_link(self):
+        if self.keyset and self.cursor is None:
+            return None
+        if self.keyset:
+            url = remove_query_param(
+                self.request.build_absolute_uri(), self.offset_query_param
+            )
+            return replace_query_param(url, self.cursor_query_param, self.cursor)
+
+        return super().get_next_link()
+
+    def get_previous_link(self):
+        if self.keyset:
+            return None
+
+        return super().get_previous_link()
+
+    def get_count(self, queryset) -> int:
+        if not isinstance(queryset, models.QuerySet) or not getattr(
+            settings, "PAGINATION_COUNT_ESTIMATE", False
+        ):
+            return super().get_count(queryset)
+
+        estimate = estimate_count(queryset)
+        threshold = getattr(settings, "PAGINATION_COUNT_ESTIMATE_THRESHOLD", 1000)
+
+        if estimate is None or estimate < threshold:
+            return super().get_count(queryset)
+
+        return estimate
+
+    def supports_keyset(self, queryset) -> bool:
+        if not isinstance(queryset, models.QuerySet):
+            return False
+
+        fields = [field.name for field in queryset.model._meta.get_fields()]
+        return all(field in fields for field in self.keyset_fields)
+
+    @staticmethod
+    def encode_cursor(created_at, id) -> str:
+        position = json.dumps([created_at.isoformat(), str(id)])
+        return base64.urlsafe_b64encode(position.encode("utf-8")).decode("utf-8")
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> typing.Optional[typing.Tuple[str, str]]:
+        if not cursor:
+            return None
+
+        try:
+            position = base64.urlsafe_b64decode(cursor.encode("utf-8"))
+            created_at, id = json.loads(position)
+            return created_at, id
+        except Exception:
+            raise NotFound("Invalid cursor")
+
+
+def estimate_count(queryset: models.QuerySet) -> typing.Optional[int]:
+    """Return the planner row estimate of a queryset (PostgreSQL only)."""
+    connection = connections[queryset.db]
+
+    if connection.vendor != "postgresql":
+        return None
+
+    sql, params = queryset.query.sql_with_params()
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    return int(plan[0]["Plan"]["Plan Rows"])
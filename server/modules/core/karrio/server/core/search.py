@@ -0,0 +1,73 @@
+import typing
+from django.db.models import Q, QuerySet
+
+
+def search_document(*values: typing.Any) -> str:
+    """Return the normalized (lowercased) search text of the given values.
+
+    Dicts contribute their values (e.g. metadata) and lists their items.
+    """
+    terms: typing.List[str] = []
+
+    def collect(value):
+        if isinstance(value, dict):
+            return [collect(item) for item in value.values()]
+        if isinstance(value, (list, tuple)):
+            return [collect(item) for item in value]
+        if value is None or value == "" or isinstance(value, bool):
+            return
+
+        terms.append(str(value).strip().lower())
+
+    collect(values)
+
+    return " ".join(term for term in terms if term != "")
+
+
+def search_filter(value: str, *fallback_fields: str) -> Q:
+    """The keyword condition served by the search documents trigram index.
+
+    Records without a search document yet (not indexed by `build_search_index`)
+    are matched with an `icontains` lookup on the given fallback fields.
+    """
+    condition = Q(search_document__contains=(value or "").strip().lower())
+
+    if not any(fallback_fields):
+        return condition
+
+    return condition | (
+        Q(search_document__isnull=True) & fields_filter(value, *fallback_fields)
+    )
+
+
+def fields_filter(value: str, *fields: str) -> Q:
+    """The condition matching the records with any of the fields containing value."""
+    condition = Q()
+    for field in fields:
+        condition |= Q(**{f"{field}__icontains": value})
+
+    return condition
+
+
+def keyword_search(queryset: QuerySet, value: str, *fallback_fields: str) -> QuerySet:
+    return queryset.filter(search_filter(value, *fallback_fields))
+
+
+def update_search_document(instance) -> bool:
+    """Refresh the search document of an instance exposing `search_values`.
+
+    The document is written with an update query so no save signal is sent.
+    :return: whether the document changed.
+    """
+    if instance is None or instance.pk is None:
+        return False
+
+    document = search_document(*instance.search_values)
+
+    if document == instance.search_document:
+        return False
+
+    type(instance).objects.filter(pk=instance.pk).update(search_document=document)
+    instance.search_document = document
+
+    return True
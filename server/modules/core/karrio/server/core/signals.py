@@ -1,12 +1,23 @@
 import logging
 from django.conf import settings
+from django.db import transaction
+from django.db.models import signals
 from django.dispatch import receiver
+from django.contrib.auth import get_user_model
 
 from constance.signals import config_updated
 
 logger = logging.getLogger(__name__)
 
 
+def register_signals():
+    from karrio.server.user.models import Token
+
+    for sender in [get_user_model(), Token]:
+        signals.post_save.connect(auth_context_updated, sender=sender)
+        signals.post_delete.connect(auth_context_updated, sender=sender)
+
+
 @receiver(config_updated)
 def constance_updated(sender, key, old_value, new_value, **kwargs):
     logger.info(f"Updated config {key} to {new_value}")
@@ -23,3 +34,19 @@ def update_settings(current):
         cfg is not None and cfg != '' for cfg
         in [current.EMAIL_HOST, current.EMAIL_HOST_USER, current.EMAIL_HOST_PASSWORD]
     )
+
+
+def auth_context_updated(sender, *args, **kwargs):
+    # logins only update last_login
+    if set(kwargs.get("update_fields") or []) == {"last_login"}:
+        return
+
+    invalidate_auth_cache()
+
+
+def invalidate_auth_cache():
+    """Expire the cached authentication contexts (now and after commit)."""
+    from karrio.server.core.authentication import invalidate_auth_cache
+
+    invalidate_auth_cache()
+    transaction.on_commit(invalidate_auth_cache)
@@ -0,0 +1,113 @@
+import re
+import typing
+from django.conf import settings
+from django.core.files import File
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.storage import Storage, FileSystemStorage
+from django.utils.module_loading import import_string
+
+RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+_STORAGES: typing.Dict[str, Storage] = {}
+
+
+def documents_storage_enabled() -> bool:
+    return (getattr(settings, "DOCUMENTS_STORAGE", None) or "database") != "database"
+
+
+def documents_storage() -> Storage:
+    """Return the storage of the shipments documents (labels and invoices).
+
+    `DOCUMENTS_STORAGE` selects the backend: "filesystem" (under
+    `DOCUMENTS_STORAGE_ROOT`), "s3" for any S3 compatible object storage
+    (requires django-storages and boto3) or the dotted path of a Django
+    storage class. With "database" (the default), documents are kept base64
+    encoded in the shipment table.
+    """
+    backend = getattr(settings, "DOCUMENTS_STORAGE", None) or "database"
+
+    if backend not in _STORAGES:
+        _STORAGES[backend] = _create_storage(backend)
+
+    return _STORAGES[backend]
+
+
+def _create_storage(backend: str) -> Storage:
+    if backend in ["database", "filesystem"]:
+        return FileSystemStorage(location=settings.DOCUMENTS_STORAGE_ROOT)
+
+    if backend == "s3":
+        try:
+            from storages.backends.s3boto3 import S3Boto3Storage
+        except ImportError:
+            raise ImproperlyConfigured(
+                "The s3 documents storage requires django-storages and boto3"
+            )
+
+        return S3Boto3Storage(
+            bucket_name=settings.DOCUMENTS_STORAGE_BUCKET,
+            endpoint_url=settings.DOCUMENTS_STORAGE_ENDPOINT_URL or None,
+            region_name=settings.DOCUMENTS_STORAGE_REGION or None,
+            access_key=settings.DOCUMENTS_STORAGE_ACCESS_KEY or None,
+            secret_key=settings.DOCUMENTS_STORAGE_SECRET_KEY or None,
+            location=settings.DOCUMENTS_STORAGE_PREFIX,
+            default_acl="private",
+            file_overwrite=False,
+        )
+
+    return import_string(backend)()
+
+
+def byte_range(
+    header: typing.Optional[str], size: int
+) -> typing.Optional[typing.Tuple[int, int]]:
+    """Parse a single `Range: bytes=start-end` header.
+
+    Returns the (inclusive) bounds of the range or None when the whole file
+    should be sent (no range or an unsupported/unsatisfiable one).
+    """
+    match = RANGE_PATTERN.match((header or "").strip())
+
+    if match is None or size == 0 or match.groups() == ("", ""):
+        return None
+
+    start, end = match.groups()
+
+    if start == "":
+        start, end = max(size - int(end), 0), size - 1
+    else:
+        start, end = int(start), min(int(end), size - 1) if end else size - 1
+
+    if start > end:
+        return None
+
+    return start, end
+
+
+class FileRange(File):
+    """A file wrapper streaming a byte range of a file."""
+
+    def __init__(self, file: File, start: int, end: int):
+        super().__init__(file, name=file.name)
+        self.start = start
+        self.end = end
+
+    @property
+    def size(self):
+        return self.end - self.start + 1
+
+    def chunks(self, chunk_size: int = None):
+        chunk_size = chunk_size or self.DEFAULT_CHUNK_SIZE
+        remaining = self.size
+        self.file.seek(self.start)
+
+        while remaining > 0:
+            data = self.file.read(min(chunk_size, remaining))
+
+            if not data:
+                break
+
+            remaining -= len(data)
+            yield data
+
+    def __iter__(self):
+        return self.chunks()
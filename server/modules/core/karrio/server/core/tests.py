@@ -1,8 +1,11 @@
+from django.test import TestCase
 from django.contrib.auth import get_user_model
 from rest_framework.test import APITestCase as BaseAPITestCase, APIClient
 
 from karrio.server.providers.models import MODELS
 from karrio.server.user.models import Token
+from karrio.server.core.models import APILogIndex
+from karrio.server.core import logs
 
 
 class APITestCase(BaseAPITestCase):
@@ -46,3 +49,42 @@ class APITestCase(BaseAPITestCase):
         )
         self.client = APIClient()
         self.client.credentials(HTTP_AUTHORIZATION="Token " + self.token.key)
+
+
+class TestAPILogs(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_superuser(
+            "admin@example.com", "test"
+        )
+
+    def test_persist_compacted_logs(self):
+        entries = [
+            logs.LogEntry(
+                id=logs.reserve_log_id(),
+                fields=dict(
+                    path="/v1/shipments/shp_123456/purchase",
+                    host="localhost",
+                    method="POST",
+                    user=self.user,
+                    status_code=200,
+                    response=logs.compact_body(
+                        logs.load_body('{"id": "shp_123456", "label": "JVBERi0xLjQ="}')
+                    ),
+                    entity_id="shp_123456",
+                ),
+            )
+            for _ in range(2)
+        ]
+
+        with self.settings(API_LOGS_MAX_BODY_SIZE=10):
+            truncated = logs.compact_body({"description": "A" * 20})
+
+        logs.persist_logs(entries)
+        log = APILogIndex.objects.filter(entity_id="shp_123456").first()
+
+        self.assertEqual(APILogIndex.objects.count(), 2)
+        self.assertEqual(log.id, max(entry.id for entry in entries))
+        self.assertEqual(
+            log.response, '{"id": "shp_123456", "label": "[redacted: 12 chars]"}'
+        )
+        self.assertEqual(truncated, '{"descript... [truncated: 39 chars]')
@@ -2,6 +2,8 @@ import sys
 import inspect
 import functools
 import logging
+import contextlib
+import contextvars
 from string import Template
 from concurrent import futures
 from datetime import timedelta, datetime
@@ -110,10 +112,13 @@ def run_on_all_tenants(func):
     return wrapper
 
 
+SIGNALS_MUTED = contextvars.ContextVar("signals_muted", default=False)
+
+
 def disable_for_loaddata(signal_handler):
     @functools.wraps(signal_handler)
     def wrapper(*args, **kwargs):
-        if is_system_loading_data():
+        if SIGNALS_MUTED.get() or is_system_loading_data():
             return
 
         signal_handler(*args, **kwargs)
@@ -121,6 +126,17 @@ def disable_for_loaddata(signal_handler):
     return wrapper
 
 
+@contextlib.contextmanager
+def muted_signals():
+    """Skip the (`disable_for_loaddata`) signal handlers within the block."""
+    token = SIGNALS_MUTED.set(True)
+
+    try:
+        yield
+    finally:
+        SIGNALS_MUTED.reset(token)
+
+
 def skip_on_loadata(func):
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
@@ -227,24 +243,25 @@ def filter_rate_carrier_compatible_gateways(
     and if no explicit carrier list is provided, it will filter out any
     carrier that does not support the shipper's country code.
     """
+    gateways = [carrier.gateway for carrier in carriers]
+
     return [
-        carrier.gateway
-        for carrier in carriers
+        gateway
+        for gateway in gateways
         if (
             # If no carrier list is provided, and gateway has get_rates capability.
-            ("get_rates" in carrier.gateway.capabilities and len(carrier_ids) > 0)
+            ("get_rates" in gateway.capabilities and len(carrier_ids) > 0)
             # If a carrier list is provided, and gateway is in the list.
             or (
                 # the gateway has get_rates capability.
-                "get_rates" in carrier.gateway.capabilities
+                "get_rates" in gateway.capabilities
                 # and no explicit carrier list is provided.
                 and len(carrier_ids) == 0
                 # and the shipper country code is provided.
                 and shipper_country_code is not None
                 and (
-                    carrier.gateway.settings.account_country_code
-                    == shipper_country_code
-                    or carrier.gateway.settings.account_country_code is None
+                    gateway.settings.account_country_code == shipper_country_code
+                    or gateway.settings.account_country_code is None
                 )
             )
         )
@@ -7,16 +7,15 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.throttling import UserRateThrottle, AnonRateThrottle
 from rest_framework_tracking import mixins
 from rest_framework import status
-from karrio.core.utils import DP
 from karrio.server.tracing.utils import set_tracing_context
-from karrio.server.core.utils import failsafe
 from karrio.server.core.authentication import (
     TokenAuthentication,
     JWTAuthentication,
     TokenBasicAuthentication,
     OAuth2Authentication,
 )
-from karrio.server.core.models import APILogIndex
+import karrio.server.conf as conf
+import karrio.server.core.logs as logs
 
 AccessMixin: typing.Any = pydoc.locate(
     getattr(settings, "ACCESS_METHOD", "karrio.server.core.authentication.AccessMixin")
@@ -25,48 +24,26 @@ AccessMixin: typing.Any = pydoc.locate(
 
 class LoggingMixin(mixins.LoggingMixin):
     def handle_log(self):
-        data = None if "data" not in self.log else DP.jsonify(self.log["data"])
-        query_params = (
-            None
-            if "query_params" not in self.log
-            else DP.jsonify(self.log["query_params"])
-        )
-        response = (
-            None
-            if "response" not in self.log
-            else (
-                DP.jsonify(self.log["response"])
-                if isinstance(DP.to_object(self.log["response"]), dict)
-                else self.log["response"]
-            )
-        )
-        entity_id = failsafe(
-            lambda: None if response is None else DP.to_dict(response)["id"]
-        )
-
-        log = APILogIndex(
-            **{
+        """Capture a compact log record and hand it to the background writer."""
+        response = logs.load_body(self.log.get("response"))
+        entity_id = response.get("id") if isinstance(response, dict) else None
+        org = getattr(self.request, "org", None) if settings.MULTI_ORGANIZATIONS else None
+
+        entry = logs.LogEntry(
+            id=logs.reserve_log_id(),
+            fields={
                 **self.log,
-                "data": data,
-                "response": response,
-                "query_params": query_params,
+                "data": logs.compact_body(self.log.get("data")),
+                "response": logs.compact_body(response),
+                "query_params": logs.compact_body(self.log.get("query_params")),
                 "entity_id": entity_id,
-            }
+            },
+            org_id=getattr(org, "id", None),
+            schema=conf.settings.schema,
         )
-        log.save()
-
-        if (settings.MULTI_ORGANIZATIONS) and (
-            getattr(self.request, "org", None) is not None
-        ):
-            log.link = log.__class__.link.related.related_model.objects.create(
-                org=self.request.org, item=log
-            )
-            log.save()
+        logs.save_log(entry)
 
-        set_tracing_context(
-            request_log_id=getattr(log, "id", None),
-            object_id=failsafe(lambda: (self.log.get("response") or {}).get("id")),
-        )
+        set_tracing_context(request_log_id=entry.id, object_id=entity_id)
 
 
 class BaseView:
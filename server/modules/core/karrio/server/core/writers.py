@@ -0,0 +1,123 @@
+import abc
+import time
+import queue
+import atexit
+import typing
+import logging
+import itertools
+import threading
+from django import db
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class BatchWriter(abc.ABC):
+    """Single background thread persisting queued entries in batches.
+
+    Entries are written in batches of `<PREFIX>_BATCH_SIZE` at least every
+    `<PREFIX>_FLUSH_INTERVAL` seconds. When the queue (`<PREFIX>_QUEUE_SIZE`)
+    is full, new entries are dropped so that the request path never blocks.
+    Subclasses implement `persist` for the entries of a tenant schema.
+    """
+
+    name: str = "records"
+    settings_prefix: str = ""
+    _instance: typing.Optional["BatchWriter"] = None
+    _lock = threading.Lock()
+
+    def __init__(self, max_size: int = 0, batch_size: int = 100, interval: float = 2):
+        self.queue: queue.Queue = queue.Queue(maxsize=max_size)
+        self.batch_size = batch_size
+        self.interval = interval
+        self.thread: typing.Optional[threading.Thread] = None
+
+    @classmethod
+    def get(cls):
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = cls(
+                    max_size=cls.setting("QUEUE_SIZE") or 0,
+                    batch_size=cls.setting("BATCH_SIZE") or 100,
+                    interval=cls.setting("FLUSH_INTERVAL") or 2,
+                )
+                atexit.register(cls._instance.flush)
+
+            return cls._instance
+
+    @classmethod
+    def setting(cls, name: str):
+        return getattr(settings, f"{cls.settings_prefix}_{name}", None)
+
+    @abc.abstractmethod
+    def persist(self, entries: list, schema: str = None):
+        pass
+
+    def put(self, entries: list):
+        self.start()
+        dropped = 0
+
+        for entry in entries:
+            try:
+                self.queue.put_nowait(entry)
+            except queue.Full:
+                dropped += 1
+
+        if dropped > 0:
+            logger.warning(f"{self.name} queue full, {dropped} record(s) dropped")
+
+    def start(self):
+        with self._lock:
+            # the thread is not inherited by forked worker processes
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(
+                    target=self.run, name=f"karrio-{self.name}-writer", daemon=True
+                )
+                self.thread.start()
+
+    def run(self):
+        while True:
+            self.write(self.take())
+
+    def take(self) -> list:
+        """Wait for an entry then fill the batch until the flush interval elapses."""
+        batch = [self.queue.get()]
+        deadline = time.monotonic() + self.interval
+
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(
+                    self.queue.get(timeout=max(deadline - time.monotonic(), 0))
+                )
+            except queue.Empty:
+                break
+
+        return batch
+
+    def flush(self):
+        """Synchronously write the queued entries."""
+        entries: list = []
+
+        while True:
+            try:
+                entries.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+
+        for index in range(0, len(entries), self.batch_size):
+            self.write(entries[index : index + self.batch_size])
+
+    def write(self, batch: list):
+        groups = itertools.groupby(
+            sorted(batch, key=lambda e: e.schema or ""), key=lambda e: e.schema or ""
+        )
+
+        try:
+            for schema, entries in groups:
+                try:
+                    self.persist(list(entries), schema=(schema or None))
+                    logger.info(f"successfully saved {self.name} records...")
+                except Exception as e:
+                    logger.error(e, exc_info=False)
+        finally:
+            db.close_old_connections()
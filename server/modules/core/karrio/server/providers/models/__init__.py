@@ -2,8 +2,14 @@ import pkgutil
 import logging
 from typing import Any, Dict
 
-from karrio import gateway
-from karrio.server.providers.models.carrier import Carrier, ServiceLevel, register_model
+import karrio.references as references
+from karrio.server.providers.models.carrier import (
+    Carrier,
+    ServiceLevel,
+    register_model,
+    invalidate_gateway_cache,
+    prefetch_settings,
+)
 from karrio.server.providers.models.template import LabelTemplate
 import karrio.server.providers.extension.models as extensions
 
@@ -16,7 +22,7 @@ MODELS: Dict[str, Any] = {}
 
 # Register karrio-server models extensions
 for _, name, _ in pkgutil.iter_modules(extensions.__path__):
-    if name in gateway.providers:
+    if name in references.provider_names():
         try:
             extension = __import__(f"{extensions.__name__}.{name}", fromlist=[name])
             MODELS.update({name: register_model(extension.SETTINGS)})
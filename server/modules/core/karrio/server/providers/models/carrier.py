@@ -1,13 +1,19 @@
+import threading
 from functools import partial
-from typing import Dict
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
 
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 from django.forms.models import model_to_dict
 from django.core.validators import RegexValidator
 
 from karrio import gateway
-from karrio.core.utils import Enum, Tracer
+import karrio.references as references
+from karrio.core.settings import Settings
+from karrio.core.errors import ShippingSDKError
+from karrio.core.utils import DP, Enum, Tracer
 from karrio.core.units import Country, Currency, DimensionUnit, WeightUnit
 from karrio.api.gateway import Gateway
 from karrio.server.core.models import OwnedEntity, uuid, register_model
@@ -15,6 +21,18 @@ from karrio.server.core.datatypes import CarrierSettings
 from karrio.server.core.fields import MultiChoiceField
 
 
+GATEWAY_CACHE_SIZE = 1000
+GATEWAY_CACHE_LOCK = threading.Lock()
+GATEWAY_SETTINGS_CACHE: "OrderedDict[tuple, Settings]" = OrderedDict()
+
+
+def invalidate_gateway_cache(carrier_id: Optional[str] = None):
+    """Discard the cached gateway settings of a carrier connection (or all of them)."""
+    with GATEWAY_CACHE_LOCK:
+        for key in [k for k in GATEWAY_SETTINGS_CACHE if carrier_id in (None, k[1])]:
+            GATEWAY_SETTINGS_CACHE.pop(key, None)
+
+
 class CarrierCapabilities(Enum):
     pickup = "pickup"
     rating = "rating"
@@ -34,15 +52,81 @@ WEIGHT_UNITS = [(c.name, c.name) for c in WeightUnit]
 DIMENSION_UNITS = [(c.name, c.name) for c in DimensionUnit]
 
 
-class CarrierManager(models.Manager):
-    def get_queryset(self):
-        from karrio.server.providers.models import MODELS
+class CarrierQuerySet(models.QuerySet):
+    """Carrier queryset keeping `updated_at` current on bulk updates.
+
+    The gateway settings cache of every process is keyed on `updated_at`.
+    """
+
+    def update(self, **kwargs):
+        return super().update(**{"updated_at": timezone.now(), **kwargs})
+
+
+class CarrierManager(models.Manager.from_queryset(CarrierQuerySet)):
+    pass
+
+
+def prefetch_settings(carriers: Iterable["Carrier"]):
+    """Populate the carriers settings relations without a query per relation.
+
+    The settings model of each connection is detected with a single query,
+    then only the settings tables actually referenced are loaded (one query
+    per carrier type instead of one per installed extension). Carriers
+    already prefetched are skipped.
+    """
+    from karrio.server.providers.models import MODELS
+
+    relations = {
+        Model: Carrier._meta.get_field(Model.__name__.lower())
+        for Model in MODELS.values()
+    }
+    carriers = [
+        carrier
+        for carrier in carriers
+        if not all(relation.is_cached(carrier) for relation in relations.values())
+    ]
+    linked_settings = {
+        carrier.pk: carrier for carrier in carriers if type(carrier) in relations
+    }
+    carrier_ids = [
+        carrier.pk for carrier in carriers if carrier.pk not in linked_settings
+    ]
+
+    if len(carrier_ids) > 0:
+        queries = [
+            Model._base_manager.filter(pk__in=carrier_ids)
+            .order_by()
+            .annotate(extension=models.Value(name, output_field=models.CharField()))
+            .values_list("pk", "extension")
+            for name, Model in MODELS.items()
+        ]
+        extensions: Dict[str, List[str]] = {}
+
+        for pk, name in queries[0].union(*queries[1:], all=True):
+            extensions.setdefault(name, []).append(pk)
+
+        for name, ids in extensions.items():
+            linked_settings.update(
+                {
+                    _settings.pk: _settings
+                    for _settings in MODELS[name]._base_manager.filter(pk__in=ids)
+                }
+            )
 
-        return (
-            super()
-            .get_queryset()
-            .prefetch_related(*[Model.__name__.lower() for Model in MODELS.values()])
-        )
+    for Model in set(type(_settings) for _settings in linked_settings.values()):
+        if hasattr(Model, "services"):
+            models.prefetch_related_objects(
+                [s for s in linked_settings.values() if type(s) is Model], "services"
+            )
+
+    # the settings instances are connections too, their relations are set as well
+    for carrier in [*carriers, *linked_settings.values()]:
+        _settings = linked_settings.get(carrier.pk)
+
+        for Model, relation in relations.items():
+            relation.set_cached_value(
+                carrier, _settings if type(_settings) is Model else None
+            )
 
 
 class Carrier(OwnedEntity):
@@ -143,7 +227,37 @@ class Carrier(OwnedEntity):
             else self.settings.carrier_name
         )
 
-        return gateway[_carrier_name].create({**self.data.to_dict()}, _tracer)
+        initializer = gateway[_carrier_name]
+
+        return initializer.create(self._gateway_settings(_carrier_name), _tracer)
+
+    def _gateway_settings(self, carrier_name: str) -> Settings:
+        """Return the SDK settings of the connection, materialised once per change."""
+        from karrio.server.conf import settings as conf
+
+        key = (conf.schema, self.id, self.updated_at)
+
+        with GATEWAY_CACHE_LOCK:
+            if key in GATEWAY_SETTINGS_CACHE:
+                GATEWAY_SETTINGS_CACHE.move_to_end(key)
+                return GATEWAY_SETTINGS_CACHE[key]
+
+        try:
+            _settings = DP.to_object(
+                references.import_extension(carrier_name).Settings,
+                {**self.data.to_dict()},
+            )
+        except Exception as e:
+            raise ShippingSDKError(f"Failed to setup provider '{carrier_name}'") from e
+
+        invalidate_gateway_cache(self.id)
+        with GATEWAY_CACHE_LOCK:
+            GATEWAY_SETTINGS_CACHE[key] = _settings
+
+            while len(GATEWAY_SETTINGS_CACHE) > GATEWAY_CACHE_SIZE:
+                GATEWAY_SETTINGS_CACHE.popitem(last=False)
+
+        return _settings
 
     @property
     def carrier_display_name(self):
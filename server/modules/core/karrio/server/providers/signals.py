@@ -0,0 +1,90 @@
+import logging
+from django.utils import timezone
+from django.db import transaction
+from django.db.models import signals
+
+from karrio.server.core import utils
+import karrio.server.providers.models as models
+
+logger = logging.getLogger(__name__)
+
+
+def register_signals():
+    for Model in models.MODELS.values():
+        signals.post_save.connect(carrier_updated, sender=Model)
+        signals.post_delete.connect(carrier_updated, sender=Model)
+
+        if hasattr(Model, "services"):
+            signals.m2m_changed.connect(
+                carrier_services_changed, sender=Model.services.through
+            )
+
+    signals.post_save.connect(carrier_updated, sender=models.Carrier)
+    signals.post_delete.connect(carrier_updated, sender=models.Carrier)
+
+    signals.post_save.connect(service_level_updated, sender=models.ServiceLevel)
+    signals.pre_delete.connect(service_level_updated, sender=models.ServiceLevel)
+
+    # the carriers m2m relations (e.g: active_users) define the context access
+    for field in models.Carrier._meta.get_fields():
+        if field.many_to_many:
+            through = field.remote_field.through if field.concrete else field.through
+            signals.m2m_changed.connect(carrier_access_changed, sender=through)
+
+    logger.info("karrio.providers signals registered...")
+
+
+def carrier_updated(sender, instance, *args, **kwargs):
+    """Discard the cached gateway settings and resolutions of a changed connection."""
+    models.invalidate_gateway_cache(instance.id)
+    _invalidate_carriers_cache()
+
+
+def carrier_access_changed(sender, instance, action, *args, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        _invalidate_carriers_cache()
+
+
+def carrier_services_changed(sender, instance, action, *args, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    _touch_carriers([instance.id])
+
+
+@utils.disable_for_loaddata
+def service_level_updated(sender, instance, *args, **kwargs):
+    """Renew the gateway settings of the connections using the service level.
+
+    Bumping the connections updated_at also expires the cached gateways of
+    the other server processes (the cache is keyed on updated_at).
+    """
+    _touch_carriers(
+        [
+            id
+            for Model in models.MODELS.values()
+            if hasattr(Model, "services")
+            for id in Model.objects.filter(services__id=instance.id).values_list(
+                "id", flat=True
+            )
+        ]
+    )
+
+
+def _touch_carriers(carrier_ids: list):
+    if len(carrier_ids) == 0:
+        return
+
+    models.Carrier.objects.filter(id__in=carrier_ids).update(updated_at=timezone.now())
+
+    for carrier_id in carrier_ids:
+        models.invalidate_gateway_cache(carrier_id)
+
+    _invalidate_carriers_cache()
+
+
+def _invalidate_carriers_cache():
+    from karrio.server.core.gateway import Carriers
+
+    Carriers.invalidate_cache()
+    transaction.on_commit(Carriers.invalidate_cache)
@@ -1,3 +1,72 @@
-from django.test import TestCase
+import threading
+from unittest.mock import patch
+from django.core.cache import cache
+from django.test import RequestFactory
+from django.db.models import QuerySet
 
-# TODO: Write carriers API tests
+from karrio.server.serializers import Context
+from karrio.server.core.tests import APITestCase
+from karrio.server.core import middleware
+from karrio.server.providers.models import MODELS
+import karrio.server.core.gateway as gateway
+
+
+class TestCarriersResolution(APITestCase):
+    def test_cached_resolution_holds_carrier_ids(self):
+        context = Context(user=self.user, test_mode=True)
+
+        with self.settings(CARRIERS_CACHE_TTL=30):
+            key = gateway.Carriers._resolution_key(context, {}, versioned=True)
+            carriers = gateway.Carriers.list(context=context)
+            ids, services = cache.get(key)
+            cached = gateway.Carriers.list(context=context)
+
+        self.assertIsInstance(carriers, QuerySet)
+        self.assertIsInstance(cached, QuerySet)
+        self.assertSetEqual(set(ids), {carrier.pk for carrier in carriers})
+        self.assertSetEqual(set(ids), {carrier.pk for carrier in cached})
+        self.assertIn(self.carrier.pk, services["canadapost_priority"])
+
+    def test_resolution_is_not_cached_by_default(self):
+        context = Context(user=self.user, test_mode=True)
+        gateway.Carriers.list(context=context)
+
+        self.assertIsNone(cache.get(gateway.Carriers._resolution_key(context, {})))
+
+    def test_resolution_is_not_versioned_by_default(self):
+        context = Context(user=self.user, test_mode=True)
+
+        with patch.object(gateway.cache, "get_or_set") as get_or_set:
+            gateway.Carriers.list(context=context)
+
+        get_or_set.assert_not_called()
+
+    def test_request_resolution_is_refreshed_on_carrier_changes(self):
+        context = Context(user=self.user, test_mode=True)
+        request = RequestFactory().get("/")
+        middleware.SessionContext._threadmap[threading.get_ident()] = request
+
+        try:
+            carriers = gateway.Carriers.list(context=context)
+            carrier = MODELS["canadapost"].objects.create(
+                carrier_id="canadapost_new",
+                test_mode=True,
+                username="test",
+                customer_number="2004381",
+                password="test",
+                created_by=self.user,
+            )
+            refreshed = gateway.Carriers.list(context=context)
+        finally:
+            middleware.SessionContext._threadmap.pop(threading.get_ident(), None)
+
+        self.assertNotIn(carrier.pk, [c.pk for c in carriers])
+        self.assertIn(carrier.pk, [c.pk for c in refreshed])
+
+    def test_bulk_updates_change_the_carriers_updated_at(self):
+        updated_at = self.carrier.updated_at
+        MODELS["canadapost"].objects.filter(pk=self.carrier.pk).update(active=False)
+        self.carrier.refresh_from_db()
+
+        self.assertGreater(self.carrier.updated_at, updated_at)
+        self.assertFalse(self.carrier.active)
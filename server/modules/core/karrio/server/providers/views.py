@@ -8,7 +8,6 @@ from django.urls import path, re_path
 from django.core.files.base import ContentFile
 from django_downloadview import VirtualDownloadView
 from rest_framework import status
-from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.request import Request
 from rest_framework.response import Response
 from drf_yasg.utils import swagger_auto_schema
@@ -20,6 +19,7 @@ from karrio.server.core.views.api import GenericAPIView, APIView
 from karrio.server.core.gateway import Carriers
 from karrio.server.core import datatypes, dataunits
 from karrio.server.providers import models
+from karrio.server.core.pagination import LimitOffsetPagination
 from karrio.server.core.serializers import (
     CarrierSettings,
     ErrorResponse,
@@ -84,9 +84,9 @@ class CarrierList(GenericAPIView):
             "context": request,
         }
 
-        carriers = [carrier.data for carrier in Carriers.list(**filter)]
-        response = self.paginate_queryset(CarrierSettings(carriers, many=True).data)
-        return self.get_paginated_response(response)
+        carriers = self.paginate_queryset(Carriers.list(**filter))
+        response = CarrierSettings([carrier.data for carrier in carriers], many=True)
+        return self.get_paginated_response(response.data)
 
 
 class CarrierServices(APIView):
@@ -1,4 +1,5 @@
 import pydoc
+import contextlib
 import logging
 import drf_yasg.openapi as openapi
 from typing import Generic, Type, Optional, Union, TypeVar, Any, NamedTuple, List
@@ -183,13 +184,19 @@ def owned_model_serializer(serializer: Type[Serializer]):
 
             super().__init__(*args, **kwargs)
 
-        @transaction.atomic
         def create(self, data: dict, **kwargs):
             payload = {"created_by": self.__context.user, **data}
+            # serializers calling carrier APIs manage their own short transactions
+            atomic = (
+                transaction.atomic()
+                if getattr(serializer, "atomic_create", True)
+                else contextlib.nullcontext()
+            )
 
             try:
-                instance = super().create(payload, context=self.__context)
-                link_org(instance, self.__context)  # Link to organization if supported
+                with atomic:
+                    instance = super().create(payload, context=self.__context)
+                    link_org(instance, self.__context)  # Link to organization if supported
             except Exception as e:
                 logger.exception(e)
                 raise e
@@ -1,3 +1,81 @@
+from unittest.mock import patch
 from django.test import TestCase
+from django.contrib.auth import get_user_model
 
-# Create your tests here.
+from karrio.core.utils import Tracer
+from karrio.server.serializers import Context
+from karrio.server.providers.models import MODELS
+from karrio.server.tracing import models, utils
+
+
+class TestTracingRecords(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_superuser(
+            "admin@example.com", "test"
+        )
+        self.carrier = MODELS["canadapost"].objects.create(
+            carrier_id="canadapost",
+            test_mode=True,
+            username="6e93d53968881714",
+            customer_number="2004381",
+            contract_id="42708517",
+            password="0bfa9fcb9853d1f51ee57a",
+            created_by=self.user,
+        )
+        self.context = Context(user=self.user, test_mode=True)
+
+    def test_persist_sampled_and_stripped_records(self):
+        tracer = create_tracer(self.carrier.data)
+        entries = utils.collect_records(self.context, tracer)
+
+        utils.persist_records(entries)
+        record = models.TracingRecord.objects.get(key="response")
+
+        self.assertEqual(len(tracer.records), 0)
+        self.assertEqual(models.TracingRecord.objects.count(), 2)
+        self.assertEqual(record.meta["carrier_id"], "canadapost")
+        self.assertEqual(
+            record.record["response"],
+            "<label>[base64 document: 4096 chars]</label>",
+        )
+
+    def test_persist_compressed_records(self):
+        tracer = create_tracer(self.carrier.data)
+
+        with self.settings(SDK_TRACING_COMPRESS=True):
+            utils.persist_records(utils.collect_records(self.context, tracer))
+
+        record = models.TracingRecord.objects.get(key="request")
+
+        self.assertEqual(record.record["compression"], "zlib")
+        self.assertDictEqual(
+            utils.load_record(record.record),
+            {"format": "xml", "request": "<rates/>"},
+        )
+
+    def test_carrier_sample_rate(self):
+        tracer = create_tracer(self.carrier.data)
+
+        with self.settings(SDK_TRACING_SAMPLE_RATES={"canadapost": 0.0}):
+            entries = utils.collect_records(self.context, tracer)
+
+        self.assertListEqual(entries, [])
+
+    def test_writer_batches_queued_records(self):
+        writer = utils.TracingWriter(batch_size=1)
+        entries = utils.collect_records(self.context, create_tracer(self.carrier.data))
+
+        with patch.object(writer, "start"), patch.object(utils, "persist_records") as persist:
+            writer.put(entries)
+            writer.flush()
+
+        self.assertEqual(persist.call_count, 2)
+
+
+def create_tracer(connection) -> Tracer:
+    tracer = Tracer()
+    trace = tracer.with_metadata(dict(connection=connection))
+    trace({"request": "<rates/>"}, "request", format="xml")
+    trace({"response": f"<label>{'A' * 4096}</label>"}, "response", format="xml")
+
+    return tracer
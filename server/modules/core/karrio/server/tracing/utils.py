@@ -1,86 +1,208 @@
-import logging
-import concurrent.futures as futures
+import re
+import json
+import zlib
+import base64
+import typing
+import hashlib
+import functools
 
 from karrio.core.settings import Settings
 from karrio.core.utils import DP, Tracer
 from karrio.server.conf import settings
 from karrio.server.core import utils
+from karrio.server.core.writers import BatchWriter
 from karrio.server.tracing import models
 
-logger = logging.getLogger(__name__)
+
+class TraceEntry(typing.NamedTuple):
+    key: str
+    data: typing.Any
+    timestamp: float
+    meta: dict
+    test_mode: bool
+    created_by_id: typing.Any
+    org_id: typing.Optional[str] = None
+    schema: typing.Optional[str] = None
 
 
 def save_tracing_records(context, tracer: Tracer = None, schema: str = None):
+    """Queue the tracer records of interest for the background writer."""
     if settings.PERSIST_SDK_TRACING is False:
         return
 
     tracer = tracer or getattr(context, "tracer", Tracer())
-
-    # Process Karrio SDK tracing records to persist records of interest.
-    @utils.async_wrapper
-    @utils.tenant_aware
-    def persist_records(**kwarg):
-        actor = getattr(context, "user", None)
-
-        if len(tracer.records) == 0 or getattr(actor, "id", None) is None:
-            return
-
-        try:
-            records = []
-            exists = models.TracingRecord.access_by(context).filter(
-                meta__request_log_id__isnull=False,
-                meta__request_log_id=tracer.context.get("request_log_id")
-            ).exists()
-
-            if exists:
-                return
-
-            for record in tracer.records:
-                connection: Settings = record.metadata.get("connection")
-
-                records.append(
-                    models.TracingRecord(
-                        key=record.key,
-                        record=record.data,
-                        timestamp=record.timestamp,
-                        created_by_id=getattr(actor, "id", None),
-                        test_mode=getattr(connection, "test_mode", False),
-                        meta=DP.to_dict(
-                            {
-                                "tracer_id": tracer.id,
-                                "object_id": tracer.context.get("object_id"),
-                                "carrier_account_id": getattr(connection, "id", None),
-                                "carrier_id": getattr(connection, "carrier_id", None),
-                                "carrier_name": getattr(
-                                    connection, "carrier_name", None
-                                ),
-                                "request_log_id": tracer.context.get("request_log_id"),
-                            }
-                        ),
-                    )
+    entries = collect_records(context, tracer, schema=schema)
+
+    if any(entries):
+        TracingWriter.get().put(entries)
+
+
+def collect_records(
+    context, tracer: Tracer, schema: str = None
+) -> typing.List[TraceEntry]:
+    """Flush the tracer records and return the sampled ones as trace entries."""
+    actor = getattr(context, "user", None)
+
+    if len(tracer.records) == 0 or getattr(actor, "id", None) is None:
+        return []
+
+    org = getattr(context, "org", None) if settings.MULTI_ORGANIZATIONS else None
+    operation = tracer.context.get("operation") or getattr(
+        getattr(context, "resolver_match", None), "url_name", None
+    )
+    entries: typing.List[TraceEntry] = []
+
+    def collect(batch):
+        for record in batch:
+            connection = record.metadata.get("connection")
+
+            if not _sampled(tracer, connection, operation):
+                continue
+
+            entries.append(
+                TraceEntry(
+                    key=record.key,
+                    data=record.data,
+                    timestamp=record.timestamp,
+                    meta=_record_meta(tracer, connection, operation),
+                    test_mode=getattr(connection, "test_mode", False),
+                    created_by_id=actor.id,
+                    org_id=getattr(org, "id", None),
+                    schema=schema,
                 )
+            )
+
+    tracer.flush(collect, batch_size=(settings.SDK_TRACING_BATCH_SIZE or 100))
+
+    return entries
+
+
+@utils.tenant_aware
+def persist_records(entries: typing.List[TraceEntry], schema: str = None):
+    """Bulk create the tracing records and their organization links."""
+    records = models.TracingRecord.objects.bulk_create(
+        [
+            models.TracingRecord(
+                key=entry.key,
+                record=compact_record(entry.data),
+                timestamp=entry.timestamp,
+                created_by_id=entry.created_by_id,
+                test_mode=entry.test_mode,
+                meta=entry.meta,
+            )
+            for entry in entries
+        ]
+    )
+    links = [
+        (record, entry.org_id)
+        for record, entry in zip(records, entries)
+        if entry.org_id is not None
+    ]
 
-            saved_records = models.TracingRecord.objects.bulk_create(records)
-
-            if (settings.MULTI_ORGANIZATIONS) and (
-                getattr(context, "org", None) is not None
-            ):
-                _linked = []
-
-                for record in saved_records:
-                    record.link = (
-                        record.__class__.link.related.related_model.objects.create(
-                            org=context.org, item=record
-                        )
-                    )
+    if any(links):
+        Link = models.TracingRecord.link.related.related_model
+        Link.objects.bulk_create([Link(org_id=org_id, item=item) for item, org_id in links])
+
+
+def compact_record(data: typing.Any) -> typing.Any:
+    """Strip the base64 documents of a record data and compress it if enabled."""
+    max_size = settings.SDK_TRACING_MAX_DOCUMENT_SIZE or 0
+
+    if max_size > 0:
+        data = _strip_documents(data, _document_pattern(max_size))
+
+    if settings.SDK_TRACING_COMPRESS and isinstance(data, dict):
+        content = zlib.compress(json.dumps(data).encode("utf-8"))
+
+        return dict(
+            format=data.get("format"),
+            compression="zlib",
+            data=base64.b64encode(content).decode("utf-8"),
+        )
+
+    return data
+
+
+def load_record(record: typing.Any) -> typing.Any:
+    """Return the content of a (possibly compressed) tracing record."""
+    if isinstance(record, dict) and record.get("compression") == "zlib":
+        return json.loads(zlib.decompress(base64.b64decode(record["data"])))
+
+    return record
+
+
+class TracingWriter(BatchWriter):
+    """Background writer of the queued tracing records (SDK_TRACING_* settings)."""
+
+    name = "tracing"
+    settings_prefix = "SDK_TRACING"
+
+    def persist(self, entries: typing.List[TraceEntry], schema: str = None):
+        persist_records(entries, schema=schema)
+
+
+def _record_meta(
+    tracer: Tracer, connection: Settings = None, operation: str = None
+) -> dict:
+    return DP.to_dict(
+        {
+            "tracer_id": tracer.id,
+            "object_id": tracer.context.get("object_id"),
+            "operation": operation,
+            "carrier_account_id": getattr(connection, "id", None),
+            "carrier_id": getattr(connection, "carrier_id", None),
+            "carrier_name": getattr(connection, "carrier_name", None),
+            "request_log_id": tracer.context.get("request_log_id"),
+        }
+    )
+
+
+def _sampled(tracer: Tracer, connection: Settings = None, operation: str = None):
+    """Sample the records by request and connection (requests and responses
+    traces are kept together) using the carrier_id, carrier_name or operation
+    specific SDK_TRACING_SAMPLE_RATES.
+    """
+    rates = settings.SDK_TRACING_SAMPLE_RATES or {}
+    keys = [
+        getattr(connection, "carrier_id", None),
+        getattr(connection, "carrier_name", None),
+        operation,
+    ]
+    rate = next(
+        (rates[key] for key in keys if key in rates),
+        settings.SDK_TRACING_SAMPLE_RATE,
+    )
+
+    if rate is None or rate >= 1:
+        return True
+
+    seed = f"{tracer.id}:{getattr(connection, 'id', None)}".encode("utf-8")
+    digest = int(hashlib.md5(seed).hexdigest()[:8], 16)
+
+    return digest / 0xFFFFFFFF < rate
+
+
+@functools.lru_cache(maxsize=None)
+def _document_pattern(max_size: int) -> typing.Pattern:
+    return re.compile(r"[A-Za-z0-9+/]{%d,}={0,2}" % (max_size + 1))
+
+
+def _strip_documents(data: typing.Any, pattern: typing.Pattern) -> typing.Any:
+    if isinstance(data, str):
+        return pattern.sub(lambda m: f"[base64 document: {len(m.group())} chars]", data)
+    if isinstance(data, dict):
+        return {k: _strip_documents(v, pattern) for k, v in data.items()}
+    if isinstance(data, list):
+        return [_strip_documents(v, pattern) for v in data]
 
-                models.TracingRecord.objects.bulk_update(_linked, fields=["updated_at"])
+    return data
 
-            logger.info("successfully saved tracing records...")
-        except Exception as e:
-            logger.error(e, exc_info=False)
 
-    persist_records(schema=schema)
+def create_tracer() -> Tracer:
+    return Tracer(
+        max_records=settings.SDK_TRACING_MAX_RECORDS or None,
+        max_payload_size=settings.SDK_TRACING_MAX_PAYLOAD_SIZE or None,
+    )
 
 
 def set_tracing_context(**kwargs):
@@ -5,6 +5,7 @@ from django.conf import settings
 from django.contrib.auth import models as auth
 from rest_framework.authtoken import models as authtoken
 from django.utils.translation import ugettext_lazy as _
+from django.utils.functional import cached_property
 
 from karrio.server.core.models import (
     ControlledAccessModel,
@@ -88,7 +89,7 @@ class Token(authtoken.Token, ControlledAccessModel):
     def generate_key(cls):
         return f"key_{binascii.hexlify(os.urandom(16)).decode()}"
 
-    @property
+    @cached_property
     def organization(self):
         return self.org.first() if hasattr(self, "org") else None
 
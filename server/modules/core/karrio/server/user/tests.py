@@ -1,3 +1,35 @@
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import override_settings
+from rest_framework.exceptions import AuthenticationFailed
 
-# Create your tests here.
+from karrio.server.core.tests import APITestCase
+from karrio.server.core.authentication import TokenAuthentication
+
+
+class TestTokenAuthentication(APITestCase):
+    @override_settings(AUTH_CACHE_TTL=30)
+    def test_cached_token_authentication(self):
+        cache.clear()
+        authentication = TokenAuthentication()
+        authentication.authenticate_credentials(self.token.key)
+
+        with self.assertNumQueries(0):
+            user, token = authentication.authenticate_credentials(self.token.key)
+
+        self.assertEqual(user.id, self.user.id)
+        self.assertEqual(token.key, self.token.key)
+        self.assertEqual(token.user_id, self.user.id)
+        self.assertIn("password", user.get_deferred_fields())
+
+        self.user.is_active = False
+        self.user.save()
+
+        with self.assertRaises(AuthenticationFailed):
+            authentication.authenticate_credentials(self.token.key)
+
+    def test_token_authentication_is_not_cached_by_default(self):
+        authentication = TokenAuthentication()
+        authentication.authenticate_credentials(self.token.key)
+
+        with self.assertNumQueries(1):
+            authentication.authenticate_credentials(self.token.key)
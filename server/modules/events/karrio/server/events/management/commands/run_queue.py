@@ -0,0 +1,38 @@
+import logging
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.module_loading import autodiscover_modules
+from huey.consumer_options import ConsumerConfig
+
+from karrio.server.events import queues
+
+
+class Command(BaseCommand):
+    help = "Run the consumer of a named background queue (see WORKER_QUEUES)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("queue", type=str, help="The queue name")
+        parser.add_argument(
+            "-w",
+            "--workers",
+            type=int,
+            default=None,
+            help="The number of workers (defaults to the WORKER_QUEUES count)",
+        )
+
+    def handle(self, *args, queue: str, workers: int = None, **options):
+        worker_queues = getattr(settings, "WORKER_QUEUES", None) or {}
+
+        if queue not in worker_queues:
+            raise CommandError(f"'{queue}' is not listed in WORKER_QUEUES")
+
+        autodiscover_modules("tasks")
+
+        config = ConsumerConfig(workers=(workers or worker_queues[queue]))
+        config.validate()
+
+        logger = logging.getLogger("huey")
+        if not logger.handlers:
+            config.setup_logger(logger)
+
+        queues.get_huey(queue).create_consumer(**config.values).run()
@@ -0,0 +1,50 @@
+# Generated by Django 3.2.16 on 2026-10-18 18:42
+
+from django.db import migrations, models
+import django.db.models.deletion
+import functools
+import karrio.server.core.models.base
+import karrio.server.core.utils
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0005_event_event_object_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='webhook',
+            name='batch_size',
+            field=models.PositiveIntegerField(blank=True, help_text='Send up to this number of queued events per request (disabled by default)', null=True),
+        ),
+        migrations.CreateModel(
+            name='WebhookDelivery',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('id', models.CharField(default=functools.partial(karrio.server.core.models.base.uuid, *(), **{'prefix': 'whd_'}), editable=False, max_length=50, primary_key=True, serialize=False)),
+                ('payload', models.JSONField(default=functools.partial(karrio.server.core.utils.identity, *(), **{'value': {}}))),
+                ('event_at', models.DateTimeField(null=True)),
+                ('status', models.CharField(choices=[('pending', 'pending'), ('delivered', 'delivered'), ('failed', 'failed')], default='pending', max_length=25)),
+                ('attempts', models.IntegerField(default=0)),
+                ('next_attempt_at', models.DateTimeField(null=True)),
+                ('response_status', models.IntegerField(null=True)),
+                ('error', models.TextField(blank=True, null=True)),
+                ('delivered_at', models.DateTimeField(null=True)),
+                ('event', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='deliveries', to='events.event')),
+                ('webhook', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='deliveries', to='events.webhook')),
+            ],
+            options={
+                'verbose_name': 'Webhook Delivery',
+                'verbose_name_plural': 'Webhook Deliveries',
+                'db_table': 'webhook-delivery',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='webhookdelivery',
+            index=models.Index(fields=['status', 'next_attempt_at'], name='webhook_delivery_due_idx'),
+        ),
+    ]
@@ -5,7 +5,7 @@ from django.db.models.fields import json
 from django.contrib.postgres import fields
 
 from karrio.server.core.utils import identity
-from karrio.server.core.models import OwnedEntity, uuid, register_model
+from karrio.server.core.models import Entity, OwnedEntity, uuid, register_model
 
 
 @register_model
@@ -33,6 +33,12 @@ class Webhook(OwnedEntity):
     description = models.CharField(max_length=200, null=True, blank=True)
     last_event_at = models.DateTimeField(null=True)
 
+    batch_size = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        help_text="Send up to this number of queued events per request (disabled by default)",
+    )
+
     # System Reference fields
     failure_streak_count = models.IntegerField(default=0)
 
@@ -75,3 +81,52 @@ class Event(OwnedEntity):
     @property
     def object_type(self):
         return "event"
+
+
+DELIVERY_STATUS = [
+    ("pending", "pending"),
+    ("delivered", "delivered"),
+    ("failed", "failed"),
+]
+
+
+class WebhookDelivery(Entity):
+    class Meta:
+        db_table = "webhook-delivery"
+        verbose_name = "Webhook Delivery"
+        verbose_name_plural = "Webhook Deliveries"
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=["status", "next_attempt_at"],
+                name="webhook_delivery_due_idx",
+            ),
+        ]
+
+    id = models.CharField(
+        max_length=50,
+        primary_key=True,
+        default=partial(uuid, prefix="whd_"),
+        editable=False,
+    )
+
+    webhook = models.ForeignKey(
+        Webhook, on_delete=models.CASCADE, related_name="deliveries"
+    )
+    event = models.ForeignKey(
+        Event, on_delete=models.SET_NULL, null=True, related_name="deliveries"
+    )
+    payload = models.JSONField(default=partial(identity, value={}))
+    event_at = models.DateTimeField(null=True)
+    status = models.CharField(
+        max_length=25, choices=DELIVERY_STATUS, default=DELIVERY_STATUS[0][0]
+    )
+    attempts = models.IntegerField(default=0)
+    next_attempt_at = models.DateTimeField(null=True)
+    response_status = models.IntegerField(null=True)
+    error = models.TextField(null=True, blank=True)
+    delivered_at = models.DateTimeField(null=True)
+
+    @property
+    def object_type(self):
+        return "webhook_delivery"
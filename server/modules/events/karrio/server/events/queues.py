@@ -0,0 +1,37 @@
+import typing
+from django.conf import settings
+from huey import Huey
+from huey.contrib import djhuey
+
+
+def get_huey(queue: str = None) -> Huey:
+    """Return the huey instance of a named queue.
+
+    Queues that are not listed in WORKER_QUEUES are served by the default
+    instance (`settings.HUEY`).
+    """
+    queues: typing.Dict[str, Huey] = getattr(settings, "HUEY_QUEUES", None) or {}
+
+    return queues.get(queue) or djhuey.HUEY
+
+
+def db_task(*args, queue: str = None, **kwargs):
+    """`huey.contrib.djhuey.db_task` on a named queue."""
+
+    def decorator(fn):
+        ret = get_huey(queue).task(*args, **kwargs)(djhuey.close_db(fn))
+        ret.call_local = fn
+        return ret
+
+    return decorator
+
+
+def db_periodic_task(*args, queue: str = None, **kwargs):
+    """`huey.contrib.djhuey.db_periodic_task` on a named queue."""
+
+    def decorator(fn):
+        ret = get_huey(queue).periodic_task(*args, **kwargs)(djhuey.close_db(fn))
+        ret.call_local = fn
+        return ret
+
+    return decorator
@@ -1,17 +1,19 @@
 import logging
 from django.conf import settings
 from huey import crontab
-from huey.contrib.djhuey import db_task, db_periodic_task
 
 import karrio.server.core.utils as utils
+from karrio.server.events.queues import db_task, db_periodic_task
 
 logger = logging.getLogger(__name__)
-DEFAULT_TRACKERS_UPDATE_INTERVAL = int(
-    getattr(settings, "DEFAULT_TRACKERS_UPDATE_INTERVAL", 7200) / 60
+TRACKERS_SCHEDULER_INTERVAL = max(
+    int(getattr(settings, "TRACKERS_SCHEDULER_INTERVAL", 600) / 60), 1
 )
 
 
-@db_periodic_task(crontab(minute=f"*/{DEFAULT_TRACKERS_UPDATE_INTERVAL}"))
+@db_periodic_task(
+    crontab(minute=f"*/{TRACKERS_SCHEDULER_INTERVAL}"), queue="tracking"
+)
 def background_trackers_update():
     from karrio.server.events.task_definitions.base.tracking import update_trackers
 
@@ -25,7 +27,39 @@ def background_trackers_update():
     _run()
 
 
-@db_task()
+@db_periodic_task(crontab(minute="*"), queue="webhooks")
+def background_webhooks_delivery():
+    from karrio.server.events.task_definitions.base.webhook import (
+        deliver_pending_webhooks,
+    )
+
+    @utils.run_on_all_tenants
+    def _run(**kwargs):
+        try:
+            deliver_pending_webhooks()
+        except Exception as e:
+            logger.error(f"failed to deliver pending webhooks: {e}")
+
+    _run()
+
+
+@db_periodic_task(crontab(hour="3", minute="0"), queue="webhooks")
+def background_webhook_deliveries_cleanup():
+    from karrio.server.events.task_definitions.base.webhook import (
+        prune_webhook_deliveries,
+    )
+
+    @utils.run_on_all_tenants
+    def _run(**kwargs):
+        try:
+            prune_webhook_deliveries()
+        except Exception as e:
+            logger.error(f"failed to prune webhook deliveries: {e}")
+
+    _run()
+
+
+@db_task(queue="webhooks")
 @utils.tenant_aware
 def notify_webhooks(*args, **kwargs):
     from karrio.server.events.task_definitions.base.webhook import (
@@ -40,5 +74,7 @@ def notify_webhooks(*args, **kwargs):
 
 TASK_DEFINITIONS = [
     background_trackers_update,
+    background_webhooks_delivery,
+    background_webhook_deliveries_cleanup,
     notify_webhooks,
 ]
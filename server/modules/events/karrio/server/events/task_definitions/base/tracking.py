@@ -1,32 +1,59 @@
-import functools
 import time
 import logging
 import datetime
-from itertools import groupby
-from typing import List, Tuple
+import functools
+import itertools
+import threading
+import concurrent.futures as futures
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
 
 from django.conf import settings
+from django.db.models import Q, signals
 from django.utils import timezone
 
 import karrio
 from karrio.api.gateway import Gateway
 from karrio.api.interface import IRequestFrom
-from karrio.core.utils import exec_parrallel, DP
+from karrio.core.utils import DP
 from karrio.core.models import TrackingDetails, Message, TrackingEvent
 
 import karrio.server.core.utils as utils
 import karrio.server.manager.models as models
 import karrio.server.core.datatypes as datatypes
+import karrio.server.providers.models as providers
 import karrio.server.manager.serializers as serializers
 
 logger = logging.getLogger(__name__)
-Delay = int
-RequestBatches = Tuple[Gateway, IRequestFrom, Delay, List[models.Tracking]]
-BatchResponse = List[Tuple[TrackingDetails, List[Message]]]
+BatchResponse = Tuple[List[TrackingDetails], List[Message]]
 
 DEFAULT_TRACKERS_UPDATE_INTERVAL = getattr(
     settings, "DEFAULT_TRACKERS_UPDATE_INTERVAL", 7200
 )
+TRACKING_FIELDS = ["events", "options", "meta", "delivered", "status"]
+
+
+class RateLimiter:
+    """Space out the requests sent to a carrier connection."""
+
+    def __init__(self, rate: float):
+        self.interval = 1 / rate if rate > 0 else 0
+        self.next_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            wait = max(self.next_at - now, 0)
+            self.next_at = max(self.next_at, now) + self.interval
+
+        time.sleep(wait)
+
+
+class RequestBatch(NamedTuple):
+    gateway: Gateway
+    request: IRequestFrom
+    limiter: RateLimiter
+    trackers: List[models.Tracking]
 
 
 def update_trackers(
@@ -35,46 +62,100 @@ def update_trackers(
     ),
     tracker_ids: List[str] = [],
 ):
+    """Refresh the trackers due for an update.
+
+    Trackers are streamed from the database grouped by carrier connection,
+    sent in batches paced by each carrier rate limit with a bounded number of
+    concurrent requests, then saved in bulk with their next poll time.
+    """
     logger.info("> starting scheduled trackers update")
 
-    active_trackers = (
+    concurrency = max(getattr(settings, "TRACKERS_UPDATE_CONCURRENCY", 4), 1)
+    trackers = due_trackers(delta, tracker_ids)
+    carriers = load_carriers(trackers)
+    pending: set = set()
+    updated = 0
+
+    with futures.ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for batch in create_request_batches(
+            trackers.iterator(chunk_size=1000), carriers
+        ):
+            pending.add(executor.submit(fetch_tracking_info, batch))
+
+            if len(pending) >= concurrency * 2:
+                done, pending = futures.wait(
+                    pending, return_when=futures.FIRST_COMPLETED
+                )
+                updated += sum(save_updated_trackers(*f.result()) for f in done)
+
+        done, _ = futures.wait(pending)
+        updated += sum(save_updated_trackers(*f.result()) for f in done)
+
+    if updated == 0:
+        logger.info("no active trackers found needing update")
+
+    logger.info("> ending scheduled trackers update")
+
+
+def due_trackers(delta: datetime.timedelta, tracker_ids: List[str] = []):
+    now = timezone.now()
+    trackers = (
         models.Tracking.objects.filter(id__in=tracker_ids)
         if any(tracker_ids)
         else models.Tracking.objects.filter(
+            Q(next_poll_at__lte=now)
+            | Q(next_poll_at__isnull=True, updated_at__lt=now - delta),
             delivered=False,
-            updated_at__lt=timezone.now() - delta,
         )
     )
 
-    if any(active_trackers):
-        trackers_grouped_by_carrier = [
-            list(g) for _, g in groupby(active_trackers, key=lambda t: t.carrier_id)
-        ]
-        request_batches: List[RequestBatches] = sum(
-            [create_request_batches(group) for group in trackers_grouped_by_carrier], []
-        )
+    return (
+        trackers.prefetch_related(None)
+        .select_related("shipment", "created_by")
+        .order_by("tracking_carrier_id", "id")
+    )
 
-        responses = exec_parrallel(fetch_tracking_info, request_batches, 2)
-        save_updated_trackers(responses, active_trackers)
-    else:
-        logger.info("no active trackers found needing update")
 
-    logger.info("> ending scheduled trackers update")
+def load_carriers(trackers) -> Dict[str, providers.Carrier]:
+    """Load the trackers carrier connections with their settings prefetched."""
+    carriers = providers.Carrier.objects.filter(
+        pk__in=trackers.values("tracking_carrier_id")
+    )
+    providers.prefetch_settings(carriers)
 
+    return {carrier.pk: carrier for carrier in carriers}
 
-def create_request_batches(trackers: List[models.Tracking]) -> List[RequestBatches]:
-    start = 0
-    end = 10
-    batches = []
 
-    while any(trackers[start:end]):
+def create_request_batches(
+    trackers: Iterable[models.Tracking],
+    carriers: Dict[str, providers.Carrier],
+) -> Iterator[RequestBatch]:
+    for carrier_id, group in itertools.groupby(
+        trackers, key=lambda t: t.tracking_carrier_id
+    ):
+        first = next(group)
+        carrier = carriers.get(carrier_id) or first.tracking_carrier
+        group = itertools.chain([first], group)
+
         try:
-            # Add a request delay to avoid sending two request batches to a carrier at the same time
-            delay = int(((end / 10) * 10) - 10)
-            # Get the common tracking carrier
-            carrier = trackers[0].tracking_carrier
-            # Collect the 5 trackers between the start and end indexes
-            batch_trackers = trackers[start:end]
+            gateway: Gateway = carrier.gateway
+        except Exception as gateway_error:
+            logger.warning(f"failed to load the carrier connection {carrier.id}")
+            logger.error(gateway_error, exc_info=True)
+            continue
+
+        size = _carrier_setting(carrier, "TRACKERS_BATCH_SIZE", 10)
+        limiter = RateLimiter(_carrier_setting(carrier, "TRACKERS_RATE_LIMIT", 1.0))
+
+        while True:
+            batch_trackers = list(itertools.islice(group, max(int(size), 1)))
+
+            if not any(batch_trackers):
+                break
+
+            for tracker in batch_trackers:
+                tracker.tracking_carrier = carrier
+
             tracking_numbers = [t.tracking_number for t in batch_trackers]
             options: dict = functools.reduce(
                 lambda acc, t: {**acc, **(t.options or {})}, batch_trackers, {}
@@ -82,104 +163,174 @@ def create_request_batches(trackers: List[models.Tracking]) -> List[RequestBatch
 
             logger.debug(f"prepare tracking request for {tracking_numbers}")
 
-            # Prepare and send tracking request(s) using the karrio interface.
-            request: IRequestFrom = karrio.Tracking.fetch(
-                datatypes.TrackingRequest(
-                    tracking_numbers=tracking_numbers, options=options
+            try:
+                # Prepare the tracking request using the karrio interface.
+                request: IRequestFrom = karrio.Tracking.fetch(
+                    datatypes.TrackingRequest(
+                        tracking_numbers=tracking_numbers, options=options
+                    )
                 )
-            )
-            gateway: Gateway = carrier.gateway
-
-            batches.append((gateway, request, delay, batch_trackers))
+            except Exception as request_error:
+                logger.warning(f"failed to prepare tracking request {tracking_numbers}")
+                logger.error(request_error, exc_info=True)
+                continue
 
-        except Exception as request_error:
-            logger.warning(f"failed to prepare tracking batch ({start}, {end}) request")
-            logger.error(request_error, exc_info=True)
+            yield RequestBatch(gateway, request, limiter, batch_trackers)
 
-        end += 10
-        start += 10
 
-    return batches
-
-
-def fetch_tracking_info(request_batch: RequestBatches) -> BatchResponse:
-    gateway, request, delay, trackers = request_batch
-    logger.debug(f"fetching batch {[t.tracking_number for t in trackers]}")
-    time.sleep(delay)  # apply delay before request
+def fetch_tracking_info(
+    batch: RequestBatch,
+) -> Tuple[List[models.Tracking], Optional[BatchResponse]]:
+    logger.debug(f"fetching batch {[t.tracking_number for t in batch.trackers]}")
+    batch.limiter.wait()
 
     try:
-        return utils.identity(lambda: request.from_(gateway).parse())
+        response = utils.identity(lambda: batch.request.from_(batch.gateway).parse())
+        return batch.trackers, response
     except Exception as request_error:
         logger.warning("batch request failed")
         logger.error(request_error, exc_info=True)
 
-    return []
+    return batch.trackers, None
 
 
 def save_updated_trackers(
-    responses: List[BatchResponse], trackers: List[models.Tracking]
-):
+    trackers: List[models.Tracking], response: Optional[BatchResponse]
+) -> int:
+    """Apply a batch response to its trackers and save them in bulk.
+
+    Every tracker of the batch is rescheduled, and the changed ones are
+    notified as if saved individually (webhooks and shipment status).
+    """
     logger.info("> saving updated trackers")
 
-    for tracking_details, _ in responses:
-        for details in tracking_details:
-            try:
-                logger.debug(f"update tracking info for {details.tracking_number}")
-                related_trackers = [
-                    t for t in trackers if t.tracking_number == details.tracking_number
-                ]
-                for tracker in related_trackers:
-                    # update values only if changed; This is important for webhooks notification
-                    changes = []
-                    meta = details.meta or {}
-                    status = utils.compute_tracking_status(details).value
-                    events = process_events(
-                        response_events=details.events,
-                        current_events=tracker.events,
-                    )
-                    options = {
-                        **(tracker.options or {}),
-                        tracker.tracking_number: details.meta,
-                    }
-
-                    if events != tracker.events:
-                        tracker.events = events
-                        changes.append("events")
-
-                    if options != tracker.options:
-                        tracker.options = options
-                        changes.append("options")
-
-                    if details.meta != tracker.meta:
-                        tracker.meta = meta
-                        changes.append("meta")
-
-                    if details.delivered != tracker.delivered:
-                        tracker.delivered = details.delivered
-                        changes.append("delivered")
-
-                    if status != tracker.status:
-                        tracker.status = status
-                        changes.append("status")
-
-                    if details.estimated_delivery != tracker.estimated_delivery:
-                        tracker.estimated_delivery = details.estimated_delivery
-                        changes.append("estimated_delivery")
-
-                    if any(changes):
-                        tracker.save(update_fields=changes)
-                        serializers.update_shipment_tracker(tracker)
-                        logger.debug(
-                            f"tracking info {details.tracking_number} updated successfully"
-                        )
-                    else:
-                        logger.debug(f"no changes detect")
-
-            except Exception as update_error:
-                logger.warning(
-                    f"failed to update tracker with tracking number: {details.tracking_number}"
-                )
-                logger.error(update_error, exc_info=True)
+    now = timezone.now()
+    tracking_details, _ = response or ([], [])
+    details_by_number = {d.tracking_number: d for d in tracking_details or []}
+    changes: Dict[str, List[str]] = {}
+
+    for tracker in trackers:
+        details = details_by_number.get(tracker.tracking_number)
+
+        try:
+            if details is not None:
+                changes[tracker.id] = apply_tracking_details(tracker, details)
+        except Exception as update_error:
+            logger.warning(
+                f"failed to update tracker with tracking number: {tracker.tracking_number}"
+            )
+            logger.error(update_error, exc_info=True)
+
+        if any(changes.get(tracker.id) or []):
+            tracker.updated_at = now
+
+        tracker.next_poll_at = compute_next_poll(tracker, now)
+
+    # only the rescheduling is written for the whole batch, the changed
+    # trackers are saved by groups of identical changed fields so that the
+    # values of unchanged trackers are never written back.
+    models.Tracking.objects.bulk_update(trackers, ["next_poll_at"])
+
+    changed = [t for t in trackers if any(changes.get(t.id) or [])]
+    groups = itertools.groupby(
+        sorted(changed, key=lambda t: sorted(changes[t.id])),
+        key=lambda t: sorted(changes[t.id]),
+    )
+    for fields, group in groups:
+        models.Tracking.objects.bulk_update(list(group), [*fields, "updated_at"])
+
+    for tracker in changed:
+        signals.post_save.send(
+            sender=models.Tracking,
+            instance=tracker,
+            created=False,
+            raw=False,
+            using=tracker._state.db,
+            update_fields=changes[tracker.id],
+        )
+        serializers.update_shipment_tracker(tracker)
+        logger.debug(f"tracking info {tracker.tracking_number} updated successfully")
+
+    return len(trackers)
+
+
+def apply_tracking_details(
+    tracker: models.Tracking, details: TrackingDetails
+) -> List[str]:
+    """Update the tracker values that changed and return their names.
+
+    Only changed values are updated; This is important for webhooks notification.
+    """
+    logger.debug(f"update tracking info for {details.tracking_number}")
+    changes = []
+    meta = details.meta or {}
+    status = utils.compute_tracking_status(details).value
+    events = process_events(
+        response_events=details.events,
+        current_events=tracker.events,
+    )
+    options = {
+        **(tracker.options or {}),
+        tracker.tracking_number: details.meta,
+    }
+
+    if events != tracker.events:
+        tracker.events = events
+        changes.append("events")
+
+    if options != tracker.options:
+        tracker.options = options
+        changes.append("options")
+
+    if details.meta != tracker.meta:
+        tracker.meta = meta
+        changes.append("meta")
+
+    if details.delivered != tracker.delivered:
+        tracker.delivered = details.delivered
+        changes.append("delivered")
+
+    if status != tracker.status:
+        tracker.status = status
+        changes.append("status")
+
+    if details.estimated_delivery != tracker.estimated_delivery:
+        tracker.estimated_delivery = details.estimated_delivery
+        changes.append("estimated_delivery")
+
+    return changes
+
+
+def compute_next_poll(
+    tracker: models.Tracking, now: datetime.datetime
+) -> Optional[datetime.datetime]:
+    """Return the next refresh time of a tracker.
+
+    Recently updated trackers are polled every TRACKERS_MIN_POLL_INTERVAL and
+    the interval doubles for every day without changes (up to
+    TRACKERS_MAX_POLL_INTERVAL). Delivered trackers are no longer polled.
+    """
+    if tracker.delivered:
+        return None
+
+    min_interval = getattr(settings, "TRACKERS_MIN_POLL_INTERVAL", 1800)
+    max_interval = getattr(settings, "TRACKERS_MAX_POLL_INTERVAL", 86400)
+    idle_days = max((now - (tracker.updated_at or now)).days, 0)
+    interval = min(min_interval * 2 ** min(idle_days, 32), max_interval)
+
+    return now + datetime.timedelta(seconds=interval)
+
+
+def _carrier_setting(carrier, name: str, default):
+    """Return a carrier specific setting (by carrier_id or carrier_name)."""
+    carrier_settings = getattr(settings, f"{name}S", None) or {}
+
+    return carrier_settings.get(
+        carrier.carrier_id,
+        carrier_settings.get(
+            carrier.carrier_name, getattr(settings, name, default)
+        ),
+    )
 
 
 def process_events(
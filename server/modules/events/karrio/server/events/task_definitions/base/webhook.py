@@ -1,26 +1,33 @@
 import typing
-import requests
 import logging
-from datetime import datetime
+import datetime
+import threading
+import itertools
+import requests
+import concurrent.futures as futures
+from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
 from django.conf import settings
+from django.db import transaction
 from django.db.models import Q
+from django.utils import timezone
 from django.contrib.auth import get_user_model
 
-from karrio.core import utils
 from karrio.server.core.utils import identity
 from karrio.server.serializers import Context, SerializerDecorator
 from karrio.server.events import models
 from karrio.server.events import serializers
 
 logger = logging.getLogger(__name__)
-NotificationResponse = typing.Tuple[str, requests.Response]
+NotificationResponse = typing.Tuple[str, typing.Optional[requests.Response]]
 User = get_user_model()
+DELIVERY_CLAIM = datetime.timedelta(minutes=5)
 
 
 def notify_webhook_subscribers(
     event: str,
     data: dict,
-    event_at: datetime,
+    event_at: datetime.datetime,
     ctx: dict,
     **kwargs,
 ):
@@ -31,74 +38,236 @@ def notify_webhook_subscribers(
         (Q(disabled__isnull=True) | Q(disabled=False)),
     )
 
-    webhooks = models.Webhook.access_by(context).filter(*query)
-    SerializerDecorator[serializers.EventSerializer](
-        data=dict(
-            type=event,
-            data=data,
-            test_mode=context.test_mode,
-            pending_webhooks=webhooks.count(),
-        ),
-        context=context,
-    ).save()
+    webhooks = list(models.Webhook.access_by(context).filter(*query))
+    event_record = (
+        SerializerDecorator[serializers.EventSerializer](
+            data=dict(
+                type=event,
+                data=data,
+                test_mode=context.test_mode,
+                pending_webhooks=len(webhooks),
+            ),
+            context=context,
+        )
+        .save()
+        .instance
+    )
 
     if any(webhooks):
         payload = dict(event=event, data=data)
-        responses: typing.List[NotificationResponse] = notify_subscribers(
-            webhooks, payload
-        )
-        update_notified_webhooks(webhooks, responses, event_at)
+        deliveries = queue_deliveries(webhooks, payload, event_at, event_record)
+
+        # batched subscribers are notified by the periodic deliveries dispatch
+        deliver([d for d in deliveries if not d.webhook.batch_size])
     else:
         logger.info("no subscribers found")
 
     logger.info(f"> ending {event} subscribers notification")
 
 
-def notify_subscribers(webhooks: typing.List[models.Webhook], payload: dict):
-    def notify_subscriber(webhook: models.Webhook):
-        response = identity(
-            lambda: requests.post(
-                webhook.url,
-                json=payload,
-                headers={
-                    "Content-type": "application/json",
-                    "X-Event-Id": webhook.secret,
-                },
+def queue_deliveries(
+    webhooks: typing.List[models.Webhook],
+    payload: dict,
+    event_at: datetime.datetime,
+    event: models.Event = None,
+) -> typing.List[models.WebhookDelivery]:
+    """Record a pending delivery of the event for every subscriber.
+
+    Deliveries of non batched subscribers are sent right away, so they are
+    claimed until the attempt is recorded.
+    """
+    now = timezone.now()
+
+    return models.WebhookDelivery.objects.bulk_create(
+        [
+            models.WebhookDelivery(
+                webhook=webhook,
+                event=event,
+                payload=payload,
+                event_at=event_at,
+                next_attempt_at=(now if webhook.batch_size else now + DELIVERY_CLAIM),
             )
+            for webhook in webhooks
+        ]
+    )
+
+
+def deliver_pending_webhooks(limit: int = 1000):
+    """Send the queued deliveries that are due (retries and batched events).
+
+    Due deliveries are claimed (their next attempt is pushed back) so that
+    concurrent workers don't send them twice. The pending deliveries of
+    disabled webhooks are marked failed instead.
+    """
+    now = timezone.now()
+
+    models.WebhookDelivery.objects.filter(
+        status="pending", webhook__disabled=True
+    ).update(status="failed", next_attempt_at=None, error="the webhook is disabled")
+
+    with transaction.atomic():
+        deliveries = list(
+            models.WebhookDelivery.objects.select_for_update(skip_locked=True)
+            .filter(status="pending", next_attempt_at__lte=now)
+            .exclude(webhook__disabled=True)
+            .order_by("next_attempt_at")[:limit]
+        )
+        models.WebhookDelivery.objects.filter(id__in=[d.id for d in deliveries]).update(
+            next_attempt_at=now + DELIVERY_CLAIM
         )
 
-        return webhook.id, response
+    webhooks = models.Webhook.objects.in_bulk({d.webhook_id for d in deliveries})
+    for delivery in deliveries:
+        delivery.webhook = webhooks[delivery.webhook_id]
 
-    return utils.exec_async(notify_subscriber, webhooks)
+    deliver(deliveries)
 
 
-def update_notified_webhooks(
-    webhooks: typing.List[models.Webhook],
-    responses: typing.List[NotificationResponse],
-    event_at: datetime,
+def prune_webhook_deliveries():
+    """Delete the delivered and failed deliveries older than
+    WEBHOOK_DELIVERY_RETENTION days."""
+    retention = getattr(settings, "WEBHOOK_DELIVERY_RETENTION", 30)
+    pruned, _ = models.WebhookDelivery.objects.filter(
+        status__in=["delivered", "failed"],
+        created_at__lt=timezone.now() - datetime.timedelta(days=retention),
+    ).delete()
+
+    logger.info(f"> {pruned} webhook deliveries pruned")
+
+
+def deliver(deliveries: typing.List[models.WebhookDelivery]):
+    """Send deliveries grouped by subscriber with bounded concurrency.
+
+    Each request is made with the subscriber endpoint pooled session, the
+    WEBHOOK_(CONNECT_)TIMEOUT timeouts and at most
+    WEBHOOK_ENDPOINT_CONCURRENCY concurrent requests per endpoint. Failed
+    deliveries are retried with an exponential backoff.
+    """
+    if not any(deliveries):
+        return
+
+    logger.info(f"> delivering {len(deliveries)} webhook notification(s)")
+    requests_batches = [
+        batch
+        for _, group in itertools.groupby(
+            sorted(deliveries, key=lambda d: d.webhook_id), key=lambda d: d.webhook_id
+        )
+        for batch in _batches(list(group))
+    ]
+    concurrency = max(getattr(settings, "WEBHOOK_DELIVERY_CONCURRENCY", 8), 1)
+
+    with futures.ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(_send_batch, requests_batches))
+
+    for batch, response in results:
+        update_deliveries(batch, response)
+
+
+def notify_subscribers(
+    webhooks: typing.List[models.Webhook], payload: dict
+) -> typing.List[NotificationResponse]:
+    """Send a payload directly to the webhooks (without recording deliveries)."""
+    concurrency = max(getattr(settings, "WEBHOOK_DELIVERY_CONCURRENCY", 8), 1)
+
+    with futures.ThreadPoolExecutor(max_workers=concurrency) as executor:
+        return list(
+            executor.map(lambda webhook: (webhook.id, post(webhook, payload)), webhooks)
+        )
+
+
+def post(webhook: models.Webhook, payload: dict) -> typing.Optional[requests.Response]:
+    endpoint = Endpoint.get(webhook.url)
+    timeout = (
+        getattr(settings, "WEBHOOK_CONNECT_TIMEOUT", 3),
+        getattr(settings, "WEBHOOK_TIMEOUT", 10),
+    )
+
+    with endpoint.semaphore:
+        try:
+            return identity(
+                lambda: endpoint.session.post(
+                    webhook.url,
+                    json=payload,
+                    timeout=timeout,
+                    headers={
+                        "Content-type": "application/json",
+                        "X-Event-Id": webhook.secret,
+                    },
+                )
+            )
+        except requests.RequestException as error:
+            logger.warning(f"failed to notify webhook {webhook.id}: {error}")
+
+    return None
+
+
+def update_deliveries(
+    deliveries: typing.List[models.WebhookDelivery],
+    response: typing.Optional[requests.Response],
 ):
     logger.info("> saving updated webhooks")
 
-    for webhook_id, response in responses:
-        try:
-            logger.debug(f"update webhook {webhook_id}")
+    now = timezone.now()
+    webhook = deliveries[0].webhook
+    max_attempts = getattr(settings, "WEBHOOK_MAX_ATTEMPTS", 5)
+    retry_delay = getattr(settings, "WEBHOOK_RETRY_DELAY", 60)
+    delivered = response is not None and response.ok
+
+    for delivery in deliveries:
+        delivery.attempts += 1
+        delivery.response_status = getattr(response, "status_code", None)
 
-            webhook = next((w for w in webhooks if w.id == webhook_id))
-            if response.ok:
-                webhook.last_event_at = event_at
-                webhook.failure_streak_count = 0
-            else:
-                webhook.failure_streak_count += 1
-                # Disable the webhook if notification failed more than 5 times
-                webhook.disabled = webhook.failure_streak_count > 5
+        if delivered:
+            delivery.status = "delivered"
+            delivery.delivered_at = now
+            delivery.next_attempt_at = None
+            delivery.error = None
+        elif delivery.attempts >= max_attempts or webhook.disabled:
+            delivery.status = "failed"
+            delivery.next_attempt_at = None
+            delivery.error = _error(response)
+        else:
+            delivery.next_attempt_at = now + datetime.timedelta(
+                seconds=retry_delay * 2 ** (delivery.attempts - 1)
+            )
+            delivery.error = _error(response)
+
+    models.WebhookDelivery.objects.bulk_update(
+        deliveries,
+        [
+            "attempts",
+            "status",
+            "response_status",
+            "error",
+            "next_attempt_at",
+            "delivered_at",
+        ],
+    )
+
+    try:
+        logger.debug(f"update webhook {webhook.id}")
 
-            webhook.save()
+        if delivered:
+            webhook.last_event_at = max(
+                [d.event_at for d in deliveries if d.event_at is not None],
+                default=webhook.last_event_at,
+            )
+            webhook.failure_streak_count = 0
+        elif any(d.status == "failed" for d in deliveries):
+            # only deliveries failed after their last attempt count, retries don't
+            webhook.failure_streak_count += 1
+            # Disable the webhook if notification failed more than 5 times
+            webhook.disabled = webhook.failure_streak_count > 5
+
+        webhook.save(
+            update_fields=["last_event_at", "failure_streak_count", "disabled"]
+        )
 
-            logger.debug(f"webhook {webhook_id} updated successfully")
+        logger.debug(f"webhook {webhook.id} updated successfully")
 
-        except Exception as update_error:
-            logger.warning(f"failed to update webhook {webhook_id}")
-            logger.error(update_error, exc_info=True)
+    except Exception as update_error:
+        logger.warning(f"failed to update webhook {webhook.id}")
+        logger.error(update_error, exc_info=True)
 
 
 def retrieve_context(info: dict) -> Context:
@@ -114,3 +283,54 @@ def retrieve_context(info: dict) -> Context:
         user=User.objects.filter(id=info["user_id"]).first(),
         test_mode=info.get("test_mode"),
     )
+
+
+class Endpoint:
+    """A webhook endpoint (scheme and host) pooled session and concurrency limit."""
+
+    _endpoints: typing.Dict[str, "Endpoint"] = {}
+    _lock = threading.Lock()
+
+    def __init__(self, concurrency: int):
+        self.session = requests.Session()
+        self.session.mount("http://", HTTPAdapter(pool_maxsize=concurrency))
+        self.session.mount("https://", HTTPAdapter(pool_maxsize=concurrency))
+        self.semaphore = threading.BoundedSemaphore(concurrency)
+
+    @classmethod
+    def get(cls, url: str) -> "Endpoint":
+        parsed = urlparse(url)
+        key = f"{parsed.scheme}://{parsed.netloc}"
+
+        with cls._lock:
+            if key not in cls._endpoints:
+                concurrency = getattr(settings, "WEBHOOK_ENDPOINT_CONCURRENCY", 2)
+                cls._endpoints[key] = Endpoint(max(concurrency, 1))
+
+            return cls._endpoints[key]
+
+
+def _batches(
+    deliveries: typing.List[models.WebhookDelivery],
+) -> typing.List[typing.List[models.WebhookDelivery]]:
+    size = deliveries[0].webhook.batch_size or 1
+
+    return [deliveries[i : i + size] for i in range(0, len(deliveries), size)]
+
+
+def _send_batch(deliveries: typing.List[models.WebhookDelivery]):
+    webhook = deliveries[0].webhook
+    payload = (
+        dict(events=[d.payload for d in deliveries])
+        if webhook.batch_size
+        else deliveries[0].payload
+    )
+
+    return deliveries, post(webhook, payload)
+
+
+def _error(response: typing.Optional[requests.Response]) -> str:
+    if response is None:
+        return "the request failed or timed out"
+
+    return f"the endpoint responded with status {response.status_code}"
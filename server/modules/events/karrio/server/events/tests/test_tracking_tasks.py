@@ -76,6 +76,55 @@ class TestTrackersBackgroundUpdate(APITestCase):
             self.assertEqual(response.status_code, status.HTTP_200_OK)
             self.assertDictEqual(response_data, UPDATED_TRACKERS_LIST)
 
+    def test_updated_trackers_are_rescheduled(self):
+        with patch(
+            "karrio.server.events.task_definitions.base.tracking.utils.identity"
+        ) as mocks:
+            mocks.return_value = RETURNED_UPDATED_VALUE
+            sleep(0.1)
+            tracking.update_trackers(delta=datetime.timedelta(seconds=0.1))
+            tracking.update_trackers(delta=datetime.timedelta(seconds=0.1))
+
+            trackers = models.Tracking.objects.all()
+
+            self.assertEqual(mocks.call_count, 2)
+            self.assertTrue(all(t.next_poll_at is not None for t in trackers))
+            self.assertEqual(
+                tracking.due_trackers(datetime.timedelta(seconds=0.1)).count(), 0
+            )
+
+    def test_unchanged_trackers_values_are_not_written(self):
+        trackers = list(tracking.due_trackers(datetime.timedelta(seconds=0)))
+        models.Tracking.objects.filter(tracking_number="1Z12345E6205277936").update(
+            status="delivered"
+        )
+
+        tracking.save_updated_trackers(trackers, RETURNED_UPDATED_VALUE)
+        ups_tracker = models.Tracking.objects.get(tracking_number="1Z12345E6205277936")
+        dhl_tracker = models.Tracking.objects.get(
+            tracking_number="00340434292135100124"
+        )
+
+        self.assertEqual(ups_tracker.status, "delivered")
+        self.assertIsNotNone(ups_tracker.next_poll_at)
+        self.assertEqual(len(dhl_tracker.events), 2)
+
+    def test_tracker_carriers_are_loaded_with_their_settings(self):
+        tracker_ids = list(models.Tracking.objects.values_list("id", flat=True))
+        trackers = tracking.due_trackers(datetime.timedelta(seconds=0), tracker_ids)
+        carriers = tracking.load_carriers(trackers)
+
+        with self.assertNumQueries(0):
+            settings = {key: c.settings for key, c in carriers.items()}
+
+        self.assertDictEqual(
+            settings,
+            {
+                self.ups_carrier.pk: self.ups_carrier.settings,
+                self.dhl_carrier.pk: self.dhl_carrier.settings,
+            },
+        )
+
 
 RETURNED_VALUE = (
     [
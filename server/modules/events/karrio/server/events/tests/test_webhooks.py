@@ -1,4 +1,5 @@
 import json
+import datetime
 from unittest.mock import ANY, patch
 from requests import Response
 
@@ -7,9 +8,11 @@ from django.utils import timezone
 from rest_framework import status
 
 from karrio.server.core.tests import APITestCase
-from karrio.server.events.models import Webhook
+from karrio.server.events.models import Webhook, WebhookDelivery
 from karrio.server.events.task_definitions.base.webhook import (
     notify_webhook_subscribers,
+    deliver_pending_webhooks,
+    prune_webhook_deliveries,
 )
 
 NOTIFICATION_DATETIME = timezone.now()
@@ -82,6 +85,125 @@ class TestWebhookDetails(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertDictEqual(response_data, WEBHOOK_NOTIFIED_RESPONSE)
 
+    def test_failed_webhook_delivery_is_retried(self):
+        with patch(
+            "karrio.server.events.task_definitions.base.webhook.identity"
+        ) as mocks:
+            response = Response()
+            response.status_code = 500
+            mocks.return_value = response
+
+            notify_webhook_subscribers(
+                event="shipment.purchased",
+                data={"shipment": "content"},
+                event_at=NOTIFICATION_DATETIME,
+                ctx=dict(user_id=self.user.id, test_mode=True),
+            )
+            delivery = WebhookDelivery.objects.get(webhook=self.webhook)
+
+            self.assertEqual(delivery.status, "pending")
+            self.assertEqual(delivery.attempts, 1)
+            self.assertGreater(delivery.next_attempt_at, timezone.now())
+
+            response.status_code = 200
+            WebhookDelivery.objects.update(next_attempt_at=timezone.now())
+            deliver_pending_webhooks()
+            delivery.refresh_from_db()
+
+            self.assertEqual(delivery.status, "delivered")
+            self.assertEqual(delivery.attempts, 2)
+            self.assertEqual(mocks.call_count, 2)
+
+    def test_only_failed_deliveries_count_in_failure_streak(self):
+        with patch(
+            "karrio.server.events.task_definitions.base.webhook.identity"
+        ) as mocks, self.settings(WEBHOOK_MAX_ATTEMPTS=2):
+            response = Response()
+            response.status_code = 500
+            mocks.return_value = response
+
+            notify_webhook_subscribers(
+                event="shipment.purchased",
+                data={"shipment": "content"},
+                event_at=NOTIFICATION_DATETIME,
+                ctx=dict(user_id=self.user.id, test_mode=True),
+            )
+            self.webhook.refresh_from_db()
+
+            self.assertEqual(self.webhook.failure_streak_count, 0)
+
+            WebhookDelivery.objects.update(next_attempt_at=timezone.now())
+            deliver_pending_webhooks()
+            self.webhook.refresh_from_db()
+
+            self.assertEqual(self.webhook.failure_streak_count, 1)
+            self.assertFalse(self.webhook.disabled)
+            self.assertEqual(
+                WebhookDelivery.objects.get(webhook=self.webhook).status, "failed"
+            )
+
+    def test_batched_webhook_delivery(self):
+        Webhook.objects.filter(pk=self.webhook.pk).update(batch_size=10)
+
+        with patch(
+            "karrio.server.events.task_definitions.base.webhook.identity"
+        ) as mocks:
+            response = Response()
+            response.status_code = 200
+            mocks.return_value = response
+
+            for index in range(3):
+                notify_webhook_subscribers(
+                    event="shipment.purchased",
+                    data={"shipment": index},
+                    event_at=NOTIFICATION_DATETIME,
+                    ctx=dict(user_id=self.user.id, test_mode=True),
+                )
+
+            self.assertEqual(mocks.call_count, 0)
+
+            deliver_pending_webhooks()
+
+            self.assertEqual(mocks.call_count, 1)
+            self.assertEqual(
+                WebhookDelivery.objects.filter(status="delivered").count(), 3
+            )
+
+    def test_disabled_webhook_pending_deliveries_are_failed(self):
+        Webhook.objects.filter(pk=self.webhook.pk).update(batch_size=10)
+
+        with patch(
+            "karrio.server.events.task_definitions.base.webhook.identity"
+        ) as mocks:
+            notify_webhook_subscribers(
+                event="shipment.purchased",
+                data={"shipment": "content"},
+                event_at=NOTIFICATION_DATETIME,
+                ctx=dict(user_id=self.user.id, test_mode=True),
+            )
+            Webhook.objects.filter(pk=self.webhook.pk).update(disabled=True)
+            deliver_pending_webhooks()
+
+            self.assertEqual(mocks.call_count, 0)
+            self.assertEqual(
+                WebhookDelivery.objects.get(webhook=self.webhook).status, "failed"
+            )
+
+    def test_prune_webhook_deliveries(self):
+        for status_ in ["delivered", "failed", "pending"]:
+            WebhookDelivery.objects.create(webhook=self.webhook, status=status_)
+        WebhookDelivery.objects.update(
+            created_at=timezone.now() - datetime.timedelta(days=31)
+        )
+        WebhookDelivery.objects.create(webhook=self.webhook, status="delivered")
+
+        prune_webhook_deliveries()
+
+        self.assertListEqual(
+            sorted(WebhookDelivery.objects.values_list("status", flat=True)),
+            ["delivered", "pending"],
+        )
+
 
 WEBHOOK_DATA = {
     "url": "http://localhost:8080",
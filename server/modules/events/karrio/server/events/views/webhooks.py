@@ -1,6 +1,5 @@
 import logging
 
-from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.response import Response
 from rest_framework.request import Request
 from rest_framework import status, serializers
@@ -10,6 +9,7 @@ from django.urls import path
 from karrio.server.core.views.api import GenericAPIView, APIView
 from karrio.server.serializers import SerializerDecorator, PaginatedResult, PlainDictField
 from karrio.server.core.serializers import Operation, ErrorResponse
+from karrio.server.core.pagination import LimitOffsetPagination
 from karrio.server.events.serializers import WebhookData, Webhook, WebhookSerializer
 from karrio.server.events.task_definitions.base.webhook import notify_subscribers
 from karrio.server.events.router import router
@@ -45,8 +45,8 @@ class WebhookList(GenericAPIView):
         Retrieve all webhooks.
         """
         webhooks = models.Webhook.access_by(request)
-        response = self.paginate_queryset(Webhook(webhooks, many=True).data)
-        return self.get_paginated_response(response)
+        response = self.paginate_queryset(webhooks)
+        return self.get_paginated_response(Webhook(response, many=True).data)
 
     @swagger_auto_schema(
         tags=["Webhooks"],
@@ -150,7 +150,9 @@ class WebhookTest(APIView):
 
         notification, *_ = notify_subscribers([webhook], request.data)
         _, response = notification
-        serializer = Operation(dict(operation="Test Webhook", success=response.ok))
+        serializer = Operation(
+            dict(operation="Test Webhook", success=response is not None and response.ok)
+        )
         return Response(serializer.data)
 
 
@@ -45,7 +45,11 @@ class WebhookType(utils.BaseObjectType):
 
     class Meta:
         model = models.Webhook
-        exclude = (*models.Webhook.HIDDEN_PROPS, "failure_streak_count")
+        exclude = (
+            *models.Webhook.HIDDEN_PROPS,
+            "failure_streak_count",
+            "deliveries",
+        )
         interfaces = (utils.CustomNode,)
 
 
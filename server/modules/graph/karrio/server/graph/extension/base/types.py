@@ -8,6 +8,7 @@ from karrio.core.utils import DP
 import karrio.server.providers.models as providers
 import karrio.server.manager.models as manager
 import karrio.server.tracing.models as tracing
+import karrio.server.tracing.utils as tracing_utils
 import karrio.server.graph.models as graph
 import karrio.server.user.models as auth
 import karrio.server.core.models as core
@@ -80,10 +81,12 @@ class TracingRecordType(utils.BaseObjectType):
         interfaces = (utils.CustomNode,)
 
     def resolve_record(self, info):
+        record = tracing_utils.load_record(self.record)
+
         try:
-            return DP.to_dict(self.record)
+            return DP.to_dict(record)
         except:
-            return self.record
+            return record
 
     def resolve_meta(self, info):
         try:
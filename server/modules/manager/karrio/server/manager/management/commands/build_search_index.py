@@ -0,0 +1,67 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+import karrio.server.core.utils as utils
+import karrio.server.core.search as search
+
+
+class Command(BaseCommand):
+    help = "Build the shipments, trackers and orders keyword search documents"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="The number of records loaded per batch",
+        )
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Rebuild every search document, not only the missing ones",
+        )
+
+    def handle(self, *args, batch_size: int = 500, **options):
+        self.build_search_index(batch_size=batch_size, rebuild=options["all"])
+
+    @utils.run_on_all_tenants
+    def build_search_index(self, batch_size: int, rebuild: bool, schema: str = None):
+        for model in searchable_models():
+            last_id, indexed = "", 0
+            queryset = model.objects.all()
+
+            if not rebuild:
+                queryset = queryset.filter(search_document__isnull=True)
+
+            while True:
+                records = list(
+                    queryset.filter(id__gt=last_id).order_by("id")[:batch_size]
+                )
+
+                if len(records) == 0:
+                    break
+
+                for record in records:
+                    record.search_document = search.search_document(
+                        *record.search_values
+                    )
+
+                model.objects.bulk_update(records, ["search_document"])
+                last_id = records[-1].id
+                indexed += len(records)
+                self.stdout.write(
+                    f"{schema or 'default'}: {indexed} {model._meta.verbose_name_plural.lower()} indexed"
+                )
+
+        self.stdout.write(
+            self.style.SUCCESS(f"{schema or 'default'}: search index completed")
+        )
+
+
+def searchable_models() -> list:
+    return [
+        model
+        for model in apps.get_models()
+        if hasattr(model, "SEARCH_PROPS")
+        and any(field.name == "search_document" for field in model._meta.fields)
+    ]
@@ -0,0 +1,59 @@
+from django.db.models import Q
+from django.core.management.base import BaseCommand, CommandError
+
+import karrio.server.core.utils as utils
+import karrio.server.core.storage as storage
+import karrio.server.manager.models as models
+
+
+class Command(BaseCommand):
+    help = "Move the shipments base64 labels and invoices to the documents storage"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="The number of shipments loaded per batch",
+        )
+
+    def handle(self, *args, batch_size: int = 100, **options):
+        if not storage.documents_storage_enabled():
+            raise CommandError("DOCUMENTS_STORAGE must be set to a storage backend")
+
+        self.migrate_documents(batch_size=batch_size)
+
+    @utils.run_on_all_tenants
+    def migrate_documents(self, batch_size: int, schema: str = None):
+        pending = Q(label__isnull=False) | Q(invoice__isnull=False)
+        last_id, migrated = "", 0
+
+        while True:
+            shipments = list(
+                models.Shipment.objects.filter(pending, id__gt=last_id)
+                .prefetch_related(None)
+                .only(
+                    "id", "label", "invoice", "label_type", "label_file", "invoice_file"
+                )
+                .order_by("id")[:batch_size]
+            )
+
+            if len(shipments) == 0:
+                break
+
+            for shipment in shipments:
+                changes = shipment.attach_documents(
+                    label=shipment.label, invoice=shipment.invoice
+                )
+                # written without save() so no shipment update signals are replayed
+                models.Shipment.objects.filter(pk=shipment.pk).update(
+                    **{field: getattr(shipment, field) for field in changes}
+                )
+
+            last_id = shipments[-1].id
+            migrated += len(shipments)
+            self.stdout.write(f"{schema or 'default'}: {migrated} shipment(s) migrated")
+
+        self.stdout.write(
+            self.style.SUCCESS(f"{schema or 'default'}: documents migration completed")
+        )
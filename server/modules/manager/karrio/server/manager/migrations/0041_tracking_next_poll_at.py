@@ -0,0 +1,22 @@
+# Generated by Django 3.2.16 on 2026-10-18 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('manager', '0040_parcel_freight_class'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tracking',
+            name='next_poll_at',
+            field=models.DateTimeField(blank=True, help_text='The next time the tracker is due for a status refresh', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='tracking',
+            index=models.Index(fields=['delivered', 'next_poll_at'], name='tracker_next_poll_idx'),
+        ),
+    ]
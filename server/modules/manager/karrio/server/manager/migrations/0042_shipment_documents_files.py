@@ -0,0 +1,25 @@
+# Generated by Django 3.2.16 on 2026-10-18 18:59
+
+from django.db import migrations, models
+import karrio.server.core.storage
+import karrio.server.manager.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('manager', '0041_tracking_next_poll_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='shipment',
+            name='invoice_file',
+            field=models.FileField(blank=True, max_length=255, null=True, storage=karrio.server.core.storage.documents_storage, upload_to=karrio.server.manager.models.document_path),
+        ),
+        migrations.AddField(
+            model_name='shipment',
+            name='label_file',
+            field=models.FileField(blank=True, max_length=255, null=True, storage=karrio.server.core.storage.documents_storage, upload_to=karrio.server.manager.models.document_path),
+        ),
+    ]
@@ -0,0 +1,90 @@
+# Generated by Django 3.2.16 on 2026-10-18 12:00
+
+from django.db import migrations, models
+
+# pg_trgm GIN indexes serving the keyword `LIKE '%...%'` searches on Postgres.
+# Existing rows are indexed with `karrio build_search_index` (the keyword
+# searches fall back to the previous lookups until then). The indexes are
+# skipped (the searches still work, unindexed) when pg_trgm is not available.
+# The indexes are built concurrently (outside of a transaction) so that the
+# tables stay writable during the build.
+INDEXES = [
+    ("shipment_search_idx", "shipment"),
+    ("tracker_search_idx", "tracking-status"),
+]
+
+
+def create_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'"
+        )
+        if cursor.fetchone() is None:
+            return
+
+    # the extension is installed once in `public` (shared by the tenant schemas)
+    # and its operator class is qualified with the schema it was installed in.
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm SCHEMA public")
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT n.nspname FROM pg_extension e "
+            "JOIN pg_namespace n ON n.oid = e.extnamespace "
+            "WHERE e.extname = 'pg_trgm'"
+        )
+        (extension_schema,) = cursor.fetchone()
+
+    for name, table in INDEXES:
+        drop_invalid_index(schema_editor, name)
+        schema_editor.execute(
+            f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{name}" ON "{table}" '
+            f'USING gin ("search_document" "{extension_schema}".gin_trgm_ops)'
+        )
+
+
+def drop_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    for name, _ in INDEXES:
+        schema_editor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"')
+
+
+def drop_invalid_index(schema_editor, name: str):
+    """Drop the leftover of an interrupted concurrent build of the index."""
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+            "WHERE c.relname = %s AND NOT i.indisvalid "
+            "AND pg_table_is_visible(c.oid)",
+            [name],
+        )
+        invalid = cursor.fetchone() is not None
+
+    if invalid:
+        schema_editor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"')
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('manager', '0043_json_fields_gin_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='shipment',
+            name='search_document',
+            field=models.TextField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='tracking',
+            name='search_document',
+            field=models.TextField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.16 on 2026-10-18 19:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('manager', '0044_search_document'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='shipment',
+            name='purchase_claimed_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
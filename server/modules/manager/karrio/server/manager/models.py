@@ -1,11 +1,14 @@
+import base64
 import typing
 import functools
 from django.db import models
+from django.core.files.base import ContentFile
 from django.urls import reverse
 from django.conf import settings
 from django.db.models.fields import json
 
 from karrio.server.core.utils import identity
+from karrio.server.core.storage import documents_storage, documents_storage_enabled
 from karrio.server.providers.models import Carrier
 from karrio.server.core.models import OwnedEntity, uuid, register_model
 from karrio.server.core.serializers import (
@@ -21,6 +24,17 @@ from karrio.server.core.serializers import (
 
 @register_model
 class Address(OwnedEntity):
+    SEARCH_PROPS = [
+        "person_name",
+        "company_name",
+        "address_line1",
+        "address_line2",
+        "postal_code",
+        "city",
+        "country_code",
+        "email",
+        "phone_number",
+    ]
     HIDDEN_PROPS = (
         "shipper_shipment",
         "recipient_shipment",
@@ -69,6 +83,10 @@ class Address(OwnedEntity):
     def object_type(self):
         return "address"
 
+    @property
+    def search_values(self) -> list:
+        return [getattr(self, prop) for prop in self.SEARCH_PROPS]
+
     @property
     def shipment(self):
         if hasattr(self, "shipper_shipment"):
@@ -437,8 +455,10 @@ class TrackingManager(models.Manager):
 
 @register_model
 class Tracking(OwnedEntity):
+    SEARCH_PROPS = ["tracking_number", "metadata", "shipment"]
     HIDDEN_PROPS = (
         "tracking_carrier",
+        "search_document",
         *(("org",) if settings.MULTI_ORGANIZATIONS else tuple()),
     )
     objects = TrackingManager()
@@ -453,6 +473,10 @@ class Tracking(OwnedEntity):
                 fields=["tracking_number"],
                 name="tracker_tracking_number_idx",
             ),
+            models.Index(
+                fields=["delivered", "next_poll_at"],
+                name="tracker_next_poll_idx",
+            ),
         ]
 
     id = models.CharField(
@@ -482,6 +506,12 @@ class Tracking(OwnedEntity):
     metadata = models.JSONField(
         blank=True, null=True, default=functools.partial(identity, value={})
     )
+    next_poll_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="The next time the tracker is due for a status refresh",
+    )
+    search_document = models.TextField(null=True, blank=True, editable=False)
 
     # System Reference fields
 
@@ -510,6 +540,24 @@ class Tracking(OwnedEntity):
     def object_type(self):
         return "tracker"
 
+    @property
+    def search_values(self) -> list:
+        shipment = self.shipment
+
+        return [
+            self.tracking_number,
+            self.metadata,
+            *(
+                [shipment.reference, *shipment.recipient.search_values]
+                if shipment is not None
+                else []
+            ),
+        ]
+
+
+def document_path(instance, filename: str) -> str:
+    return f"shipments/{instance.pk}/{filename}"
+
 
 class ShipmentManager(models.Manager):
     def get_queryset(self):
@@ -551,13 +599,18 @@ class Shipment(OwnedEntity):
         "reference",
     ]
     RELATIONAL_PROPS = ["shipper", "recipient", "parcels", "customs", "selected_rate"]
+    SEARCH_PROPS = ["tracking_number", "reference", "metadata", "recipient"]
     HIDDEN_PROPS = (
         "carriers",
         "label",
         "invoice",
+        "label_file",
+        "invoice_file",
         "shipment_pickup",
         "shipment_tracker",
         "selected_rate_carrier",
+        "search_document",
+        "purchase_claimed_at",
         *(("org",) if settings.MULTI_ORGANIZATIONS else tuple()),
     )
     objects = ShipmentManager()
@@ -614,6 +667,20 @@ class Shipment(OwnedEntity):
 
     label = models.TextField(max_length=None, null=True, blank=True)
     invoice = models.TextField(max_length=None, null=True, blank=True)
+    label_file = models.FileField(
+        max_length=255,
+        null=True,
+        blank=True,
+        storage=documents_storage,
+        upload_to=document_path,
+    )
+    invoice_file = models.FileField(
+        max_length=255,
+        null=True,
+        blank=True,
+        storage=documents_storage,
+        upload_to=document_path,
+    )
 
     selected_rate = models.JSONField(blank=True, null=True)
     payment = models.JSONField(
@@ -632,6 +699,8 @@ class Shipment(OwnedEntity):
     metadata = models.JSONField(
         blank=True, null=True, default=functools.partial(identity, value={})
     )
+    search_document = models.TextField(null=True, blank=True, editable=False)
+    purchase_claimed_at = models.DateTimeField(null=True, blank=True, editable=False)
 
     # System Reference fields
 
@@ -651,12 +720,61 @@ class Shipment(OwnedEntity):
     def delete(self, *args, **kwargs):
         self.parcels.all().delete()
         self.customs and self.customs.delete()
+        self.label_file and self.label_file.delete(save=False)
+        self.invoice_file and self.invoice_file.delete(save=False)
         return super().delete(*args, **kwargs)
 
+    def attach_documents(
+        self,
+        label: str = None,
+        invoice: str = None,
+        label_type: str = None,
+        **kwargs,
+    ) -> typing.List[str]:
+        """Set the shipment (base64 encoded) documents.
+
+        With a documents storage configured, the raw documents are uploaded
+        and only their storage reference is kept on the shipment.
+
+        :return: the updated fields.
+        """
+        changes: typing.List[str] = []
+        documents = [
+            ("label", label, (label_type or self.label_type or "PDF").lower()),
+            ("invoice", invoice, "pdf"),
+        ]
+
+        for doc, content, format in documents:
+            if not content:
+                continue
+
+            if documents_storage_enabled():
+                getattr(self, f"{doc}_file").save(
+                    f"{doc}.{format}",
+                    ContentFile(base64.b64decode(content)),
+                    save=False,
+                )
+                setattr(self, doc, None)
+                changes += [doc, f"{doc}_file"]
+            else:
+                setattr(self, doc, content)
+                changes.append(doc)
+
+        return changes
+
     @property
     def object_type(self):
         return "shipment"
 
+    @property
+    def search_values(self) -> list:
+        return [
+            self.tracking_number,
+            self.reference,
+            self.metadata,
+            *self.recipient.search_values,
+        ]
+
     # Computed properties
 
     @property
@@ -700,7 +818,7 @@ class Shipment(OwnedEntity):
 
     @property
     def label_url(self) -> str:
-        if self.label is None:
+        if not self.label_file and self.label is None:
             return None
 
         return reverse(
@@ -712,7 +830,7 @@ class Shipment(OwnedEntity):
 
     @property
     def invoice_url(self) -> str:
-        if self.invoice is None:
+        if not self.invoice_file and self.invoice is None:
             return None
 
         return reverse(
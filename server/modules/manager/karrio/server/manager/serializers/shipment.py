@@ -1,7 +1,11 @@
 import typing
 import logging
+import datetime
+import contextlib
 import rest_framework.status as status
 import django.db.transaction as transaction
+from django.db.models import Q
+from django.utils import timezone
 from rest_framework.reverse import reverse
 from rest_framework.serializers import Serializer, CharField, ChoiceField, BooleanField
 
@@ -44,6 +48,7 @@ import karrio.server.manager.models as models
 
 logger = logging.getLogger(__name__)
 DEFAULT_CARRIER_FILTER: typing.Any = dict(active=True, capability="shipping")
+PURCHASE_CLAIM_TIMEOUT = 300
 
 
 @owned_model_serializer
@@ -61,6 +66,9 @@ class ShipmentSerializer(ShipmentData):
     meta = PlainDictField(required=False, allow_null=True)
     messages = Message(many=True, required=False, default=[])
 
+    # carrier requests are sent outside of database transactions
+    atomic_create = False
+
     def __init__(self, instance: models.Shipment = None, **kwargs):
         data = kwargs.get("data") or {}
 
@@ -77,7 +85,6 @@ class ShipmentSerializer(ShipmentData):
 
         super().__init__(instance, **kwargs)
 
-    @transaction.atomic
     def create(
         self, validated_data: dict, context: Context, **kwargs
     ) -> models.Shipment:
@@ -107,6 +114,30 @@ class ShipmentSerializer(ShipmentData):
             .instance
         )
 
+        shipment = self._create_draft(
+            validated_data, context, carriers, payment, rate_response
+        )
+
+        # Buy label if preferred service is already selected.
+        if service:
+            try:
+                return buy_shipment_label(shipment, context, service=service)
+            except Exception:
+                discard_shipment_draft(shipment)
+                raise
+
+        return shipment
+
+    @transaction.atomic
+    def _create_draft(
+        self,
+        validated_data: dict,
+        context: Context,
+        carriers: typing.List[providers.Carrier],
+        payment: dict,
+        rate_response: datatypes.RateResponse,
+    ) -> models.Shipment:
+        carrier_ids = validated_data.get("carrier_ids") or []
         shipment_data = {
             **{
                 key: value
@@ -143,10 +174,7 @@ class ShipmentSerializer(ShipmentData):
             payload=validated_data,
             context=context,
         )
-
-        # Buy label if preferred service is already selected.
-        if service:
-            return buy_shipment_label(shipment, context, service=service)
+        link_org(shipment, context)
 
         return shipment
 
@@ -198,10 +226,10 @@ class ShipmentSerializer(ShipmentData):
             )
 
         if "docs" in validated_data:
-            changes.append("label")
-            changes.append("invoice")
-            instance.label = validated_data["docs"].get("label") or instance.label
-            instance.invoice = validated_data["docs"].get("invoice") or instance.invoice
+            changes += instance.attach_documents(**validated_data["docs"])
+
+        # documents attached (uploaded) before the update is saved
+        changes += validated_data.get("attached_documents") or []
 
         if "selected_rate" in validated_data:
             selected_rate = validated_data.get("selected_rate", {})
@@ -335,6 +363,8 @@ class ShipmentPurchaseSerializer(Shipment):
     payment = Payment(required=True)
     reference = CharField(required=False, allow_blank=True, allow_null=True)
 
+    atomic_create = False
+
     def create(self, validated_data: dict, **kwargs) -> datatypes.Shipment:
         return gateway.Shipments.create(
             Shipment(validated_data).data,
@@ -381,41 +411,105 @@ def buy_shipment_label(
     )
     payload = {**data, "selected_rate_id": selected_rate_id}
 
-    # Submit shipment to carriers
-    response: Shipment = (
-        SerializerDecorator[ShipmentPurchaseSerializer](
-            context=context,
-            data={**Shipment(shipment).data, **payload},
+    with purchase_claim(shipment):
+        # Submit shipment to carriers
+        response: Shipment = (
+            SerializerDecorator[ShipmentPurchaseSerializer](
+                context=context,
+                data={**Shipment(shipment).data, **payload},
+            )
+            .save()
+            .instance
         )
-        .save()
-        .instance
-    )
 
-    parcels = [
-        {"id": parcel.id, "reference_number": parcel.reference_number}
-        for parcel in response.parcels
-    ]
+        parcels = [
+            {"id": parcel.id, "reference_number": parcel.reference_number}
+            for parcel in response.parcels
+        ]
+        details = ShipmentDetails(response).data
 
-    # Update shipment state
-    purchased_shipment = (
-        SerializerDecorator[ShipmentSerializer](
-            shipment,
-            context=context,
-            data={
-                **payload,
-                **ShipmentDetails(response).data,
-                "parcels": parcels,
-            },
+        # Upload the documents before committing the purchase
+        documents = shipment.attach_documents(
+            **(details.pop("docs", None) or {}),
+            label_type=(payload.get("label_type") or shipment.label_type),
         )
-        .save()
-        .instance
-    )
+
+        # Update shipment state
+        with transaction.atomic():
+            models.Shipment.objects.select_for_update().filter(pk=shipment.pk).exists()
+            shipment.refresh_from_db(fields=["status"])
+            can_mutate_shipment(shipment, purchase=True)
+
+            purchased_shipment = (
+                SerializerDecorator[ShipmentSerializer](
+                    shipment,
+                    context=context,
+                    data={**payload, **details, "parcels": parcels},
+                )
+                .save(attached_documents=documents)
+                .instance
+            )
 
     create_shipment_tracker(purchased_shipment, context=context)
 
     return purchased_shipment
 
 
+def discard_shipment_draft(shipment: models.Shipment):
+    """Delete the draft (and its related records) of a failed shipment creation.
+
+    The draft was never returned to the client so no shipment event is sent.
+    """
+    parcels = list(shipment.parcels.all())
+    addresses = [shipment.shipper, shipment.recipient]
+
+    with utils.muted_signals(), transaction.atomic():
+        for parcel in parcels:
+            parcel.delete()
+
+        shipment.delete()
+
+        for address in addresses:
+            address.delete()
+
+
+@contextlib.contextmanager
+def purchase_claim(shipment: models.Shipment):
+    """Claim a shipment purchase while its label is bought from the carrier.
+
+    The claim is a conditional update of the shipment row so concurrent
+    purchases of the same shipment (from any process) are rejected instead
+    of buying the label twice. Claims older than PURCHASE_CLAIM_TIMEOUT
+    seconds (e.g. left by a killed worker) are taken over.
+    """
+    claimed_at = timezone.now()
+    claimed = (
+        models.Shipment.objects.filter(pk=shipment.pk)
+        .filter(
+            Q(purchase_claimed_at__isnull=True)
+            | Q(
+                purchase_claimed_at__lt=claimed_at
+                - datetime.timedelta(seconds=PURCHASE_CLAIM_TIMEOUT)
+            )
+        )
+        .update(purchase_claimed_at=claimed_at)
+    )
+
+    if not claimed:
+        raise exceptions.APIException(
+            "The shipment purchase is already in progress",
+            code="state_error",
+            status_code=status.HTTP_409_CONFLICT,
+        )
+
+    try:
+        yield
+    finally:
+        models.Shipment.objects.filter(
+            pk=shipment.pk, purchase_claimed_at=claimed_at
+        ).update(purchase_claimed_at=None)
+
+
 def reset_related_shipment_rates(shipment: typing.Optional[models.Shipment]):
     if shipment is not None:
         shipment.selected_rate = None
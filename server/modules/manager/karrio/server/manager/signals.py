@@ -1,7 +1,7 @@
 import logging
 from django.db.models import signals
 
-from karrio.server.core import utils
+from karrio.server.core import utils, search
 import karrio.server.manager.models as models
 import karrio.server.manager.serializers as serializers
 
@@ -30,6 +30,8 @@ def register_signals():
     signals.post_save.connect(address_updated, sender=models.Address)
     signals.post_save.connect(parcel_updated, sender=models.Parcel)
     signals.post_delete.connect(parcel_deleted, sender=models.Parcel)
+    signals.post_save.connect(search_document_updated, sender=models.Shipment)
+    signals.post_save.connect(search_document_updated, sender=models.Tracking)
 
     logger.info("karrio.manager signals registered...")
 
@@ -44,6 +46,13 @@ def address_updated(
     if any([change in RATE_RELATED_CHANGES for change in changes]):
         serializers.reset_related_shipment_rates(instance.shipment)
 
+    if not any(changes) or any([change in instance.SEARCH_PROPS for change in changes]):
+        shipment = instance.shipment
+
+        search.update_search_document(shipment)
+        search.update_search_document(getattr(shipment, "shipment_tracker", None))
+        search.update_search_document(instance.order)
+
 
 @utils.disable_for_loaddata
 def parcel_updated(
@@ -68,3 +77,23 @@ def parcel_updated(
 def parcel_deleted(sender, instance, *args, **kwargs):
     """ """
     serializers.reset_related_shipment_rates(instance.shipment)
+
+
+@utils.disable_for_loaddata
+def search_document_updated(
+    sender, instance, created, raw, using, update_fields, *args, **kwargs
+):
+    """Refresh the shipment or tracker search document on searchable changes.
+
+    A tracker document includes its shipment reference and recipient, so it is
+    refreshed with the shipment document.
+    """
+    changes = update_fields or []
+
+    if any(changes) and not any([change in sender.SEARCH_PROPS for change in changes]):
+        return
+
+    updated = search.update_search_document(instance)
+
+    if updated and isinstance(instance, models.Shipment):
+        search.update_search_document(instance.tracker)
@@ -51,6 +51,50 @@ class TestAddressDetails(APITestCase):
         self.assertDictEqual(response_data, ADDRESS_UPDATE_RESPONSE)
 
 
+class TestAddressList(APITestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.addresses = [
+            Address.objects.create(
+                **{
+                    **ADDRESS_DATA,
+                    "postal_code": f"H8Z2Z{index}",
+                    "created_by": self.user,
+                }
+            )
+            for index in range(3)
+        ]
+
+    def test_list_addresses(self):
+        url = reverse("karrio.server.manager:address-list")
+
+        response = self.client.get(f"{url}?limit=2&offset=2")
+        response_data = json.loads(response.content)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response_data["count"], 3)
+        self.assertEqual(len(response_data["results"]), 1)
+
+    def test_list_addresses_with_cursor(self):
+        url = reverse("karrio.server.manager:address-list")
+
+        response = self.client.get(f"{url}?limit=2&cursor=")
+        first_page = json.loads(response.content)
+        response = self.client.get(first_page["next"])
+        last_page = json.loads(response.content)
+        addresses = sorted(
+            self.addresses, key=lambda a: (a.created_at, a.id), reverse=True
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNone(last_page["next"])
+        self.assertIsNone(first_page["count"])
+        self.assertListEqual(
+            [a["id"] for a in first_page["results"] + last_page["results"]],
+            [a.id for a in addresses],
+        )
+
+
 ADDRESS_DATA = {
     "address_line1": "5205 rue riviera",
     "person_name": "Old town Daniel",
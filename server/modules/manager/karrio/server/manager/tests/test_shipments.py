@@ -1,11 +1,13 @@
 import json
 from unittest.mock import ANY, patch
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
 from karrio.core.models import (
     RateDetails,
     ChargeDetails,
     ShipmentDetails,
+    Message,
     ConfirmationDetails,
 )
 from karrio.server.core.tests import APITestCase
@@ -89,6 +91,22 @@ class TestShipments(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertDictEqual(response_data, SHIPMENT_RESPONSE)
 
+    def test_discard_draft_of_failed_shipment_creation(self):
+        url = reverse("karrio.server.manager:shipment-list")
+        data = {**SHIPMENT_DATA, "service": "canadapost_priority"}
+
+        with patch("karrio.server.core.gateway.utils.identity") as mock, patch(
+            "karrio.server.events.signals.tasks.notify_webhooks"
+        ) as notify:
+            mock.side_effect = [RETURNED_RATES_VALUE, FAILED_SHIPMENT_RESPONSE]
+            response = self.client.post(url, data)
+
+        self.assertEqual(response.status_code, status.HTTP_424_FAILED_DEPENDENCY)
+        self.assertFalse(models.Shipment.objects.exists())
+        self.assertFalse(models.Address.objects.exists())
+        self.assertFalse(models.Parcel.objects.exists())
+        notify.assert_not_called()
+
 
 class TestShipmentDetails(TestShipmentFixture):
     def test_update_shipment_options(self):
@@ -119,6 +137,55 @@ class TestShipmentDetails(TestShipmentFixture):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertDictEqual(dict(rates=response_data["rates"]), SHIPMENT_RATES)
 
+    def test_search_shipments_not_indexed_yet(self):
+        url = reverse("karrio.server.manager:shipment-list")
+        models.Shipment.objects.filter(pk=self.shipment.pk).update(
+            search_document=None
+        )
+
+        response = self.client.get(f"{url}?keyword=Jane")
+        response_data = json.loads(response.content)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertListEqual(
+            [shipment["id"] for shipment in response_data["results"]],
+            [self.shipment.pk],
+        )
+
+    def test_address_filter_only_searches_the_recipient(self):
+        url = reverse("karrio.server.manager:shipment-list")
+        self.shipment.reference = "REF-4242"
+        self.shipment.save(update_fields=["reference"])
+
+        results = {}
+        for query in ["address=Jane", "address=REF-4242", "keyword=REF-4242"]:
+            response_data = json.loads(self.client.get(f"{url}?{query}").content)
+            results[query] = [s["id"] for s in response_data["results"]]
+
+        self.assertDictEqual(
+            results,
+            {
+                "address=Jane": [self.shipment.pk],
+                "address=REF-4242": [],
+                "keyword=REF-4242": [self.shipment.pk],
+            },
+        )
+
+    def test_shipment_reference_change_refreshes_tracker_document(self):
+        tracker = models.Tracking.objects.create(
+            tracking_number="123456789012",
+            tracking_carrier=self.carrier,
+            shipment=self.shipment,
+            test_mode=True,
+            created_by=self.user,
+        )
+        self.shipment.reference = "REF-4242"
+        self.shipment.save(update_fields=["reference"])
+
+        self.assertIn(
+            "ref-4242", models.Tracking.objects.get(pk=tracker.pk).search_document
+        )
+
 
 class TestShipmentPurchase(TestShipmentFixture):
     def setUp(self) -> None:
@@ -157,13 +224,21 @@ class TestShipmentPurchase(TestShipmentFixture):
         )
         data = SHIPMENT_PURCHASE_DATA
 
-        with patch("karrio.server.core.gateway.utils.identity") as mock:
+        with patch("karrio.server.core.gateway.utils.identity") as mock, patch(
+            "karrio.server.events.signals.tasks.notify_webhooks"
+        ) as notify:
             mock.return_value = CREATED_SHIPMENT_RESPONSE
             response = self.client.post(url, data)
             response_data = json.loads(response.content)
 
             self.assertEqual(response.status_code, status.HTTP_200_OK)
             self.assertDictEqual(response_data, PURCHASED_SHIPMENT)
+            self.assertEqual(
+                [call.args[0] for call in notify.call_args_list].count(
+                    "shipment_purchased"
+                ),
+                1,
+            )
 
         # Assert a tracker is created for the newly purchased shipment
         self.assertTrue(
@@ -172,6 +247,50 @@ class TestShipmentPurchase(TestShipmentFixture):
             ).exists()
         )
 
+    def test_purchase_shipment_with_documents_storage(self):
+        url = reverse(
+            "karrio.server.manager:shipment-purchase",
+            kwargs=dict(pk=self.shipment.pk),
+        )
+
+        with self.settings(DOCUMENTS_STORAGE="filesystem"), patch(
+            "karrio.server.core.gateway.utils.identity"
+        ) as mock:
+            mock.return_value = STORED_SHIPMENT_RESPONSE
+            response = self.client.post(url, SHIPMENT_PURCHASE_DATA)
+            label_url = json.loads(response.content)["label_url"]
+
+        shipment = models.Shipment.objects.get(pk=self.shipment.pk)
+        partial = self.client.get(label_url, HTTP_RANGE="bytes=0-3")
+        cached = self.client.get(label_url, HTTP_IF_NONE_MATCH=partial["ETag"])
+
+        self.assertIsNone(shipment.label)
+        self.assertTrue(shipment.label_file.name.endswith("label.pdf"))
+        self.assertEqual(partial.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        self.assertEqual(partial["Content-Range"], "bytes 0-3/14")
+        self.assertEqual(b"".join(partial.streaming_content), b"%PDF")
+        self.assertEqual(cached.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        shipment.label_file.delete(save=False)
+
+    def test_purchase_shipment_in_progress(self):
+        url = reverse(
+            "karrio.server.manager:shipment-purchase",
+            kwargs=dict(pk=self.shipment.pk),
+        )
+        models.Shipment.objects.filter(pk=self.shipment.pk).update(
+            purchase_claimed_at=timezone.now()
+        )
+
+        with patch("karrio.server.core.gateway.utils.identity") as mock:
+            response = self.client.post(url, SHIPMENT_PURCHASE_DATA)
+
+            mock.assert_not_called()
+            self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+
+        self.shipment.refresh_from_db()
+        self.assertEqual(self.shipment.status, "draft")
+
     def test_cancel_shipment(self):
         url = reverse(
             "karrio.server.manager:shipment-details",
@@ -423,6 +542,29 @@ CREATED_SHIPMENT_RESPONSE = (
     [],
 )
 
+STORED_SHIPMENT_RESPONSE = (
+    ShipmentDetails(
+        carrier_id="canadapost",
+        carrier_name="canadapost",
+        tracking_number="123456789012",
+        shipment_identifier="123456789012",
+        docs=dict(label="JVBERi0xLjQgbGFiZWw="),
+    ),
+    [],
+)
+
+FAILED_SHIPMENT_RESPONSE = (
+    None,
+    [
+        Message(
+            carrier_id="canadapost",
+            carrier_name="canadapost",
+            code="shipment_error",
+            message="The service is not available",
+        )
+    ],
+)
+
 RETURNED_CANCEL_VALUE = (
     ConfirmationDetails(
         carrier_name="canadapost",
@@ -5,6 +5,7 @@ from django.urls import reverse
 from rest_framework import status
 from karrio.core.models import TrackingDetails, TrackingEvent
 from karrio.server.core.tests import APITestCase
+import karrio.server.manager.models as models
 
 
 class TestTrackers(APITestCase):
@@ -39,6 +40,52 @@ class TestTrackers(APITestCase):
         self.assertDictEqual(response_data, TRACKING_RESPONSE)
         self.assertEqual(len(self.user.tracking_set.all()), 1)
 
+    def test_filter_trackers_by_metadata_value(self):
+        url = reverse("karrio.server.manager:trackers-list")
+
+        for tracking_number, order_id in [("1Z001", "ord_001"), ("1Z002", "ord_002")]:
+            models.Tracking.objects.create(
+                tracking_number=tracking_number,
+                tracking_carrier=self.ups_carrier,
+                test_mode=True,
+                metadata=dict(order_id=order_id, count=1),
+                created_by=self.user,
+            )
+
+        response = self.client.get(f"{url}?metadata_value=ord_002")
+        response_data = json.loads(response.content)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertListEqual(
+            [tracker["tracking_number"] for tracker in response_data["results"]],
+            ["1Z002"],
+        )
+
+
+    def test_search_trackers_by_keyword(self):
+        url = reverse("karrio.server.manager:trackers-list")
+        tracker = models.Tracking.objects.create(
+            tracking_number="1Z001",
+            tracking_carrier=self.ups_carrier,
+            test_mode=True,
+            created_by=self.user,
+        )
+        tracker.metadata = dict(order_id="ORD-7781")
+        tracker.save(update_fields=["metadata"])
+
+        response = self.client.get(f"{url}?keyword=ord-77")
+        response_data = json.loads(response.content)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            models.Tracking.objects.get(pk=tracker.pk).search_document,
+            "1z001 ord-7781",
+        )
+        self.assertListEqual(
+            [tracker["tracking_number"] for tracker in response_data["results"]],
+            ["1Z001"],
+        )
+
 
 RETURNED_VALUE = (
     [
@@ -1,6 +1,5 @@
 import logging
 
-from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.response import Response
 from rest_framework.request import Request
 from rest_framework import status
@@ -8,6 +7,7 @@ from drf_yasg.utils import swagger_auto_schema
 from django.urls import path
 
 from karrio.server.core.views.api import GenericAPIView, APIView
+from karrio.server.core.pagination import LimitOffsetPagination
 from karrio.server.manager.serializers import (
     SerializerDecorator,
     PaginatedResult,
@@ -64,8 +64,8 @@ class AddressList(GenericAPIView):
                 if prop != "org"
             }
         )
-        response = self.paginate_queryset(Address(addresses, many=True).data)
-        return self.get_paginated_response(response)
+        response = self.paginate_queryset(addresses)
+        return self.get_paginated_response(Address(response, many=True).data)
 
     @swagger_auto_schema(
         tags=["Addresses"],
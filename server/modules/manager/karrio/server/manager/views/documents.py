@@ -2,7 +2,6 @@ import logging
 import rest_framework.status as status
 from rest_framework.request import Request
 from rest_framework.response import Response
-from rest_framework.pagination import LimitOffsetPagination
 
 from django.urls import path
 from drf_yasg.utils import swagger_auto_schema
@@ -10,6 +9,7 @@ from django_filters import rest_framework as filters
 
 from karrio.server.core.views.api import GenericAPIView, APIView
 from karrio.server.core.filters import UploadRecordFilter
+from karrio.server.core.pagination import LimitOffsetPagination
 from karrio.server.manager.router import router
 from karrio.server.manager.serializers import (
     ErrorResponse,
@@ -52,9 +52,11 @@ class DocumentList(GenericAPIView):
         Retrieve all shipping document upload records.
         """
         upload_records = self.filter_queryset(self.get_queryset())
-        response = self.paginate_queryset(DocumentUploadRecord(upload_records, many=True).data)
+        response = self.paginate_queryset(upload_records)
 
-        return self.get_paginated_response(response)
+        return self.get_paginated_response(
+            DocumentUploadRecord(response, many=True).data
+        )
 
     @swagger_auto_schema(
         tags=["Documents"],
@@ -1,6 +1,5 @@
 import logging
 
-from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.response import Response
 from rest_framework.request import Request
 from rest_framework import status
@@ -8,6 +7,7 @@ from drf_yasg.utils import swagger_auto_schema
 from django.urls import path
 
 from karrio.server.core.views.api import GenericAPIView, APIView
+from karrio.server.core.pagination import LimitOffsetPagination
 from karrio.server.manager.serializers import (
     SerializerDecorator,
     PaginatedResult,
@@ -63,10 +63,9 @@ class ParcelList(GenericAPIView):
                 if prop != "org"
             }
         )
-        serializer = Parcel(parcels, many=True)
-        response = self.paginate_queryset(serializer.data)
+        response = self.paginate_queryset(parcels)
 
-        return self.get_paginated_response(response)
+        return self.get_paginated_response(Parcel(response, many=True).data)
 
     @swagger_auto_schema(
         tags=["Parcels"],
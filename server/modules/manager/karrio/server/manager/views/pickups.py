@@ -1,7 +1,6 @@
 import logging
 
 from rest_framework import status
-from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.response import Response
 from rest_framework.request import Request
 
@@ -11,6 +10,7 @@ from django_filters import rest_framework as filters
 
 from karrio.server.core.views.api import GenericAPIView, APIView
 from karrio.server.core.filters import PickupFilters
+from karrio.server.core.pagination import LimitOffsetPagination
 from karrio.server.manager.router import router
 from karrio.server.manager.serializers import (
     SerializerDecorator,
@@ -64,8 +64,8 @@ class PickupList(GenericAPIView):
         Retrieve all scheduled pickups.
         """
         pickups = self.filter_queryset(self.get_queryset())
-        response = self.paginate_queryset(Pickup(pickups, many=True).data)
-        return self.get_paginated_response(response)
+        response = self.paginate_queryset(pickups)
+        return self.get_paginated_response(Pickup(response, many=True).data)
 
 
 class PickupRequest(APIView):
@@ -1,13 +1,16 @@
 import io
 import base64
+import hashlib
 import logging
 
-from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.response import Response
 from rest_framework.request import Request
 from rest_framework import status
 
+from django.db.models import Q
 from django.urls import path, re_path
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
 from drf_yasg.utils import swagger_auto_schema
 from django_filters import rest_framework as filters
 from django.core.files.base import ContentFile
@@ -17,6 +20,7 @@ from karrio.core.utils import DP
 from karrio.server.core.gateway import Carriers
 from karrio.server.core.views.api import GenericAPIView, APIView
 from karrio.server.core.filters import ShipmentFilters
+from karrio.server.core.pagination import LimitOffsetPagination
 from karrio.server.manager.router import router
 from karrio.server.manager.serializers import (
     process_dictionaries_mutations,
@@ -38,6 +42,7 @@ from karrio.server.manager.serializers import (
     RateSerializer,
 )
 import karrio.server.manager.models as models
+import karrio.server.core.storage as storage
 
 logger = logging.getLogger(__name__)
 ENDPOINT_ID = "$$$$$"  # This endpoint id is used to make operation ids unique make sure not to duplicate
@@ -68,9 +73,9 @@ class ShipmentList(GenericAPIView):
         Retrieve all shipments.
         """
         shipments = self.filter_queryset(self.get_queryset())
-        response = self.paginate_queryset(Shipment(shipments, many=True).data)
+        response = self.paginate_queryset(shipments)
 
-        return self.get_paginated_response(response)
+        return self.get_paginated_response(Shipment(response, many=True).data)
 
     @swagger_auto_schema(
         tags=["Shipments"],
@@ -289,24 +294,59 @@ class ShipmentDocs(VirtualDownloadView):
         """
         Retrieve a shipment label.
         """
-        shipment = models.Shipment.objects.get(pk=pk, label__isnull=False)
+        shipment = models.Shipment.objects.get(
+            Q(label__isnull=False) | Q(label_file__gt=""), pk=pk
+        )
         query_params = request.GET.dict()
 
-        self.document = getattr(shipment, doc, None)
+        self.shipment = shipment
+        self.doc = doc
         self.name = f"{doc}_{shipment.tracking_number}.{format}"
+        self.basename = self.name
         self.attachment = query_params.get("download", False)
 
-        response = super(ShipmentDocs, self).get(request, pk, doc, format, **kwargs)
+        etag = quote_etag(
+            hashlib.md5(f"{shipment.pk}:{doc}:{shipment.updated_at}".encode()).hexdigest()
+        )
+        response = get_conditional_response(request, etag=etag) or super(
+            ShipmentDocs, self
+        ).get(request, pk, doc, format, **kwargs)
+        response["ETag"] = etag
+        response["Cache-Control"] = "private, no-cache"
         response["X-Frame-Options"] = "ALLOWALL"
         return response
 
     def get_file(self):
-        content = base64.b64decode(self.document or "")
+        stored = getattr(self.shipment, f"{self.doc}_file", None)
+
+        # stream the document from the documents storage
+        if stored:
+            return stored
+
+        content = base64.b64decode(getattr(self.shipment, self.doc, None) or "")
         buffer = io.BytesIO()
         buffer.write(content)
 
         return ContentFile(buffer.getvalue(), name=self.name)
 
+    def download_response(self, *args, **kwargs):
+        size = self.file_instance.size
+        bounds = storage.byte_range(self.request.META.get("HTTP_RANGE"), size)
+
+        if bounds is None:
+            response = super().download_response(*args, **kwargs)
+        else:
+            response = super().download_response(
+                *args,
+                status=status.HTTP_206_PARTIAL_CONTENT,
+                file_instance=storage.FileRange(self.file_instance, *bounds),
+                **kwargs,
+            )
+            response["Content-Range"] = f"bytes {bounds[0]}-{bounds[1]}/{size}"
+
+        response["Accept-Ranges"] = "bytes"
+        return response
+
 
 router.urls.append(path("shipments", ShipmentList.as_view(), name="shipment-list"))
 router.urls.append(
@@ -1,7 +1,6 @@
 import logging
 
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
-from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.response import Response
 from rest_framework.request import Request
 
@@ -20,6 +19,7 @@ from karrio.server.core.serializers import (
     ErrorMessages,
 )
 from karrio.server.core.filters import TrackerFilters
+from karrio.server.core.pagination import LimitOffsetPagination
 from karrio.server.manager.router import router
 from karrio.server.manager.serializers import TrackingSerializer
 import karrio.server.manager.models as models
@@ -80,8 +80,8 @@ class TrackerList(GenericAPIView):
         Retrieve all shipment trackers.
         """
         trackers = self.filter_queryset(self.get_queryset())
-        response = self.paginate_queryset(TrackingStatus(trackers, many=True).data)
-        return self.get_paginated_response(response)
+        response = self.paginate_queryset(trackers)
+        return self.get_paginated_response(TrackingStatus(response, many=True).data)
 
 
 class TrackersCreate(APIView):
@@ -1,6 +1,17 @@
+import attr
 import logging
-from typing import cast
 from functools import partial
+from typing import (
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    cast,
+)
 from psycopg2.extras import NumericRange
 
 from django.db import models
@@ -8,7 +19,7 @@ from django.core.validators import MinValueValidator
 from django.contrib.postgres.fields import DecimalRangeField
 
 from karrio.core.models import ChargeDetails
-from karrio.core.utils import DP, NF
+from karrio.core.utils import NF
 from karrio.server.core.fields import MultiChoiceField
 from karrio.server.core.models import Entity, uuid, register_model
 from karrio.server.core.dataunits import REFERENCE_MODELS
@@ -120,51 +131,133 @@ class Surcharge(Entity):
         return f"{self.id} ({self.amount} {type_})"
 
     def apply_charge(self, response: RateResponse) -> RateResponse:
-        def apply(rate: Rate) -> Rate:
-            applicable = []
-            carrier_ids = [c.carrier_id for c in self.carrier_accounts.all()]
+        return SurchargeIndex([self.compile()]).apply(response)
+
+    def compile(self, carrier_ids: List[str] = None) -> "SurchargeRule":
+        """Return the surcharge as an in-memory rule.
+
+        `carrier_ids` can be provided when the carrier accounts were prefetched.
+        """
+        return SurchargeRule(
+            name=cast(str, self.name),
+            amount=cast(float, self.amount),
+            surcharge_type=self.surcharge_type,
+            carriers=frozenset(self.carriers or []),
+            carrier_ids=frozenset(
+                carrier_ids
+                if carrier_ids is not None
+                else [c.carrier_id for c in self.carrier_accounts.all()]
+            ),
+            services=frozenset(self.services or []),
+            discount_range=cast(NumericRange, self.discount_range),
+            freight_range=cast(NumericRange, self.freight_range),
+        )
+
+
+class SurchargeRule(NamedTuple):
+    name: str
+    amount: float
+    surcharge_type: str
+    carriers: FrozenSet[str]
+    carrier_ids: FrozenSet[str]
+    services: FrozenSet[str]
+    discount_range: Optional[NumericRange] = None
+    freight_range: Optional[NumericRange] = None
+
+    @property
+    def is_conditional(self) -> bool:
+        """A surcharge only applies when at least one condition is set."""
+        return any(
+            [
+                self.carriers,
+                self.carrier_ids,
+                self.services,
+                self.discount_range is not None,
+                self.freight_range is not None,
+            ]
+        )
+
+    def applies_to(self, rate: Rate) -> bool:
+        if self.discount_range is not None:
             charges = getattr(rate, "extra_charges", None) or []
+            discount = next((c for c in charges if "Discount" in c.name), None)
+
+            if discount is None or discount.amount not in self.discount_range:
+                return False
+
+        if self.freight_range is not None:
+            return rate.total_charge in self.freight_range
+
+        return True
 
-            if any(self.carriers or []):
-                applicable.append(rate.carrier_name in self.carriers)
-
-            if any(carrier_ids):
-                applicable.append(rate.carrier_id in carrier_ids)
-
-            if any(self.services or []):
-                applicable.append(rate.service in self.services)
-
-            if self.discount_range is not None:
-                discount = next((c for c in charges if "Discount" in c.name), None)
-                applicable.append(discount in cast(NumericRange, self.discount_range))
-
-            if self.freight_range is not None:
-                applicable.append(
-                    rate.total_charge in cast(NumericRange, self.freight_range)
-                )
-
-            if any(applicable) and all(applicable):
-                logger.debug("applying broker surcharge to rate")
-
-                amount = NF.decimal(
-                    self.amount
-                    if self.surcharge_type == "AMOUNT"
-                    else (rate.total_charge * (cast(float, self.amount) / 100))
-                )
-                total_charge = NF.decimal(rate.total_charge + amount)
-                extra_charges = rate.extra_charges + [
-                    ChargeDetails(
-                        name=cast(str, self.name), amount=amount, currency=rate.currency
-                    )
-                ]
-
-                return Rate(
-                    **{
-                        **DP.to_dict(rate),
-                        "total_charge": total_charge,
-                        "extra_charges": extra_charges,
-                    }
-                )
+    def apply(self, rate: Rate) -> Rate:
+        logger.debug("applying broker surcharge to rate")
+
+        amount = NF.decimal(
+            self.amount
+            if self.surcharge_type == "AMOUNT"
+            else (rate.total_charge * (self.amount / 100))
+        )
+
+        return attr.evolve(
+            rate,
+            total_charge=NF.decimal(rate.total_charge + amount),
+            extra_charges=[
+                *(rate.extra_charges or []),
+                ChargeDetails(name=self.name, amount=amount, currency=rate.currency),
+            ],
+        )
+
+
+class SurchargeIndex:
+    """In-memory index of surcharge rules by carrier name, account and service.
+
+    Rules are applied in order in a single pass over the rates, each rule
+    seeing the rate total updated by the previous ones.
+    """
+
+    def __init__(self, rules: List[SurchargeRule]):
+        self.empty = len(rules) == 0
+        self.rules = [rule for rule in rules if rule.is_conditional]
+        self.carriers = _index(self.rules, lambda rule: rule.carriers)
+        self.carrier_ids = _index(self.rules, lambda rule: rule.carrier_ids)
+        self.services = _index(self.rules, lambda rule: rule.services)
+
+    @staticmethod
+    def compile(surcharges: Iterable[Surcharge]) -> "SurchargeIndex":
+        """Compile the surcharges (carrier accounts ids are fetched in one query)."""
+        surcharges = list(surcharges)
+        accounts = Surcharge.carrier_accounts.through.objects.filter(
+            surcharge__in=[surcharge.pk for surcharge in surcharges]
+        ).values_list("surcharge_id", "carrier__carrier_id")
+        carrier_ids: Dict[str, List[str]] = {}
+        for surcharge_id, carrier_id in accounts:
+            carrier_ids.setdefault(surcharge_id, []).append(carrier_id)
+
+        return SurchargeIndex(
+            [
+                surcharge.compile(carrier_ids.get(surcharge.pk, []))
+                for surcharge in surcharges
+            ]
+        )
+
+    def match(self, rate: Rate) -> List[SurchargeRule]:
+        positions = (
+            self.carriers.get(rate.carrier_name, self.carriers[None])
+            & self.carrier_ids.get(rate.carrier_id, self.carrier_ids[None])
+            & self.services.get(rate.service, self.services[None])
+        )
+
+        return [self.rules[position] for position in sorted(positions)]
+
+    def apply(self, response: RateResponse) -> RateResponse:
+        if self.empty:
+            return response
+
+        def apply(rate: Rate) -> Rate:
+            for rule in self.match(rate):
+                if rule.applies_to(rate):
+                    rate = rule.apply(rate)
 
             return rate
 
@@ -175,3 +268,17 @@ class Surcharge(Entity):
                 key=lambda rate: rate.total_charge,
             ),
         )
+
+
+def _index(
+    rules: List[SurchargeRule], values: Callable[[SurchargeRule], FrozenSet[str]]
+) -> Dict[Optional[str], Set[int]]:
+    """Map each value to the rules positions matching it (`None` for any value)."""
+    wildcard = {index for index, rule in enumerate(rules) if not any(values(rule))}
+    index: Dict[Optional[str], Set[int]] = {None: wildcard}
+
+    for position, rule in enumerate(rules):
+        for value in values(rule):
+            index.setdefault(value, set(wildcard)).add(position)
+
+    return index
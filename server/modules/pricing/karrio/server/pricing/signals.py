@@ -1,35 +1,110 @@
+import time
 import logging
-import functools
+import threading
 import importlib
-from django.db.models import Q
+from django.utils import timezone
+from django.db.models import Q, Count, Max, signals
 
 from karrio.server.serializers import Context
 from karrio.server.core.gateway import Rates
 import karrio.server.pricing.models as models
+import karrio.server.providers.models as providers
 
 logger = logging.getLogger(__name__)
+SURCHARGES_INDEXES: dict = {}
+SURCHARGES_INDEXES_LOCK = threading.Lock()
 
 
 def register_rate_post_processing(*args, **kwargs):
     Rates.post_process_functions += [apply_custom_surcharges]
+
+    signals.post_save.connect(surcharges_updated, sender=models.Surcharge)
+    signals.post_delete.connect(surcharges_updated, sender=models.Surcharge)
+
+    # the compiled rules hold the carrier accounts and orgs links
+    for field in models.Surcharge._meta.get_fields():
+        if field.many_to_many:
+            through = field.remote_field.through if field.concrete else field.through
+            signals.m2m_changed.connect(surcharges_updated, sender=through)
+
+    for Model in [providers.Carrier, *providers.MODELS.values()]:
+        signals.post_save.connect(surcharges_updated, sender=Model)
+
     logger.info("karrio.pricing signals registered...")
 
 
 def apply_custom_surcharges(context: Context, result):
-    _filters = tuple()
+    return surcharge_index(context).apply(result)
 
-    if importlib.util.find_spec("karrio.server.orgs") is not None:
-        _filters += (
-            Q(active=True, org__id=getattr(context.org, "id", None))
-            | Q(active=True, org=None),
-        )
+
+def surcharge_index(context: Context) -> models.SurchargeIndex:
+    """Return the compiled active surcharges of the context org.
+
+    Compiled indexes are kept in memory. Their version (computed from the
+    surcharges and carriers update times) is checked against the database
+    at most every SURCHARGES_CACHE_TTL seconds so that changes made in other
+    processes are picked up.
+    """
+    from karrio.server.conf import settings as conf
+
+    org_id = getattr(getattr(context, "org", None), "id", None)
+    key = (conf.schema, org_id)
+    entry = SURCHARGES_INDEXES.get(key)
+    now = time.monotonic()
+
+    if entry is not None and now < entry[0]:
+        return entry[2]
+
+    ttl = conf.SURCHARGES_CACHE_TTL or 0
+    version = surcharges_version()
+
+    if entry is not None and entry[1] == version:
+        index = entry[2]
     else:
-        _filters += (Q(active=True),)
+        _filters = tuple()
+
+        if importlib.util.find_spec("karrio.server.orgs") is not None:
+            _filters += (Q(active=True, org__id=org_id) | Q(active=True, org=None),)
+        else:
+            _filters += (Q(active=True),)
 
-    charges = models.Surcharge.objects.filter(*_filters)
+        index = models.SurchargeIndex.compile(
+            models.Surcharge.objects.filter(*_filters)
+        )
+
+    with SURCHARGES_INDEXES_LOCK:
+        SURCHARGES_INDEXES[key] = (now + ttl, version, index)
+
+    return index
 
-    return functools.reduce(
-        lambda cummulated_result, charge: charge.apply_charge(cummulated_result),
-        charges,
-        result,
+
+def surcharges_version() -> tuple:
+    surcharges = models.Surcharge.objects.aggregate(
+        count=Count("id"), updated_at=Max("updated_at")
+    )
+    carriers = providers.Carrier.objects.aggregate(
+        count=Count("id"), updated_at=Max("updated_at")
     )
+
+    return (*surcharges.values(), *carriers.values())
+
+
+def surcharges_updated(sender, instance=None, **kwargs):
+    """Expire the compiled surcharges indexes.
+
+    The process indexes are dropped right away, the other processes see the
+    new surcharges version on their next check. Relations changes don't
+    update the surcharges so they are touched to bump the version.
+    """
+    if kwargs.get("action") in ["post_add", "post_remove", "post_clear"]:
+        surcharges = models.Surcharge.objects.all()
+
+        if isinstance(instance, models.Surcharge):
+            surcharges = surcharges.filter(pk=instance.pk)
+        elif kwargs.get("pk_set"):
+            surcharges = surcharges.filter(pk__in=kwargs["pk_set"])
+
+        surcharges.update(updated_at=timezone.now())
+
+    with SURCHARGES_INDEXES_LOCK:
+        SURCHARGES_INDEXES.clear()
@@ -2,10 +2,13 @@ import json
 import logging
 from unittest.mock import patch, ANY
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
 from karrio.core.models import RateDetails, ChargeDetails
 from karrio.server.core.tests import APITestCase
+from karrio.server.core.datatypes import Rate
 import karrio.server.pricing.models as models
+import karrio.server.pricing.signals as signals
 
 logging.disable(logging.CRITICAL)
 
@@ -51,6 +54,33 @@ class TestPricing(APITestCase):
             self.assertEqual(response.status_code, status.HTTP_200_OK)
             self.assertDictEqual(response_data, RATING_WITH_PERCENTAGE_RESPONSE)
 
+    def test_surcharge_index_is_cached_until_updated(self):
+        index = signals.surcharge_index(None)
+
+        with self.assertNumQueries(0):
+            self.assertIs(signals.surcharge_index(None), index)
+
+        self.charge.carrier_accounts.add(self.carrier)
+        index = signals.surcharge_index(None)
+
+        self.assertSetEqual(index.rules[0].carrier_ids, {"canadapost"})
+        self.assertListEqual(
+            index.match(Rate(carrier_name="ups", carrier_id="canadapost")), []
+        )
+
+    def test_surcharge_index_picks_up_changes_from_other_processes(self):
+        with self.settings(SURCHARGES_CACHE_TTL=0):
+            index = signals.surcharge_index(None)
+
+            # updated without signals as done by another worker process
+            models.Surcharge.objects.filter(pk=self.charge.pk).update(
+                amount=5.0, updated_at=timezone.now()
+            )
+            updated = signals.surcharge_index(None)
+
+        self.assertIsNot(updated, index)
+        self.assertEqual(updated.rules[0].amount, 5.0)
+
 
 RATING_DATA = {
     "shipper": {
@@ -1,7 +1,10 @@
 import json
 from unittest.mock import patch, ANY
 from django.urls import reverse
+from django.core.cache import cache
+from django.test import override_settings
 from rest_framework import status
+from karrio.api.interface import IDeserialize
 from karrio.core.models import RateDetails, ChargeDetails
 from karrio.server.core.tests import APITestCase
 
@@ -19,6 +22,73 @@ class TestRating(APITestCase):
             self.assertEqual(response.status_code, status.HTTP_200_OK)
             self.assertDictEqual(response_data, RATING_RESPONSE)
 
+    def test_stream_shipment_rates(self):
+        url = reverse("karrio.server.proxy:shipment-rates-stream")
+        data = RATING_DATA
+
+        with patch("karrio.server.core.gateway.Rates.rating_request") as mock:
+            mock.return_value.stream.return_value = [
+                IDeserialize(lambda: RETURNED_VALUE)
+            ]
+            response = self.client.post(f"{url}", data)
+            events = b"".join(response.streaming_content).decode().split("\n\n")
+
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response["Content-Type"], "text/event-stream")
+            self.assertTrue(events[0].startswith("event: rates\ndata: "))
+            self.assertDictEqual(
+                json.loads(events[0].split("data: ")[1]), RATING_RESPONSE
+            )
+            self.assertEqual(events[1], "event: done\ndata: {}")
+
+    @override_settings(RATES_CACHE_ENABLED=True)
+    def test_fetch_cached_shipment_rates(self):
+        url = reverse("karrio.server.proxy:shipment-rates")
+        self.token.__class__.objects.filter(pk=self.token.pk).update(test_mode=False)
+        self.carrier.__class__.objects.filter(pk=self.carrier.pk).update(
+            test_mode=False
+        )
+        cache.clear()
+
+        with patch("karrio.server.core.gateway.utils.identity") as mock:
+            mock.return_value = RETURNED_VALUE
+            self.client.post(f"{url}", RATING_DATA)
+            response = self.client.post(f"{url}", RATING_DATA)
+            response_data = json.loads(response.content)
+
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(mock.call_count, 1)
+            self.assertTrue(response_data["rates"][0]["meta"]["rate_cache_hit"])
+
+            self.client.post(f"{url}", RATING_DATA, HTTP_CACHE_CONTROL="no-cache")
+            self.assertEqual(mock.call_count, 2)
+
+    @override_settings(RATES_CACHE_ENABLED=True)
+    def test_connections_sharing_a_carrier_id_are_not_cached(self):
+        url = reverse("karrio.server.proxy:shipment-rates")
+        self.token.__class__.objects.filter(pk=self.token.pk).update(test_mode=False)
+        self.carrier.__class__.objects.filter(pk=self.carrier.pk).update(
+            test_mode=False
+        )
+        self.carrier.__class__.objects.create(
+            carrier_id="canadapost",
+            test_mode=False,
+            username="6e93d53968881714",
+            customer_number="2004382",
+            contract_id="42708518",
+            password="0bfa9fcb9853d1f51ee57a",
+            created_by=self.user,
+        )
+        cache.clear()
+
+        with patch("karrio.server.core.gateway.utils.identity") as mock:
+            mock.return_value = RETURNED_VALUE
+            self.client.post(f"{url}", RATING_DATA)
+            response = self.client.post(f"{url}", RATING_DATA)
+
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(mock.call_count, 2)
+
 
 RATING_DATA = {
     "shipper": {
@@ -1,11 +1,15 @@
 import logging
+import karrio.lib as lib
+from django.http import StreamingHttpResponse
 from rest_framework import status
 from rest_framework.request import Request
 from rest_framework.response import Response
 from drf_yasg.utils import swagger_auto_schema
 from django.urls import path
 
+from karrio.server.conf import settings
 from karrio.server.serializers import SerializerDecorator
+from karrio.server.tracing.utils import save_tracing_records
 from karrio.server.core.views.api import APIView
 from karrio.server.core.serializers import (
     RateRequest,
@@ -42,7 +46,7 @@ class RateViewAPI(APIView):
     def post(self, request: Request):
         payload = SerializerDecorator[RateRequest](data=request.data).data
 
-        response = Rates.fetch(payload, context=request)
+        response = Rates.fetch(payload, use_cache=use_cache(request), context=request)
 
         return Response(
             RateResponse(response).data,
@@ -52,4 +56,56 @@ class RateViewAPI(APIView):
         )
 
 
+class RateStreamAPI(APIView):
+    @swagger_auto_schema(
+        tags=["Proxy"],
+        operation_id=f"{ENDPOINT_ID}stream_rates",
+        operation_summary="Stream shipment rates",
+        operation_description=(
+            DESCRIPTIONS
+            + """
+Server-sent events variant of the rates fetching.
+A `rates` event (RateResponse) is sent for each carrier as soon as it responds
+followed by a final `done` event.
+"""
+        ),
+        responses={
+            200: RateResponse(),
+            400: ErrorResponse(),
+            500: ErrorResponse(),
+        },
+        request_body=RateRequest(),
+    )
+    def post(self, request: Request):
+        payload = SerializerDecorator[RateRequest](data=request.data).data
+        responses = Rates.stream(
+            payload, use_cache=use_cache(request), context=request
+        )
+
+        def events():
+            try:
+                for response in responses:
+                    data = lib.to_json(RateResponse(response).data)
+                    yield f"event: rates\ndata: {data}\n\n"
+
+                yield "event: done\ndata: {}\n\n"
+            finally:
+                # the streamed traces are recorded after the middleware saved the request ones
+                save_tracing_records(request, schema=settings.schema)
+
+        response = StreamingHttpResponse(events(), content_type="text/event-stream")
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"
+
+        return response
+
+
+def use_cache(request: Request) -> bool:
+    """Allow clients to bypass the rates cache with a `Cache-Control: no-cache` header."""
+    return "no-cache" not in request.headers.get("Cache-Control", "")
+
+
 router.urls.append(path("proxy/rates", RateViewAPI.as_view(), name="shipment-rates"))
+router.urls.append(
+    path("proxy/rates/stream", RateStreamAPI.as_view(), name="shipment-rates-stream")
+)